@@ -1,69 +1,287 @@
 from fastapi import APIRouter, HTTPException
-from app.core.models import ProjectDetails, READMEResponse, ReadmeVariant
-from app.utils.code_analyzer import get_file_structure, detect_tech_stack
-from app.utils.text_generator import text_generator
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from app.core.models import FileDetail, ProjectDetails, READMEResponse, ReadmeVariant, ReadmeUpdateRequest, READMEUpdateResponse, BatchRequest
+from app.utils.code_analyzer import get_file_structure, iter_file_structure
+from app.utils.content_sampler import ContentBudget, sample_text
+from app.utils.project_watcher import live_analyses
+from app.utils.prompt_builder import build_project_summary, build_readme_prompt, count_tokens
+from app.utils.readme_parser import OptionSplitter, README_STYLES, parse_variants
+from app.utils.response_cache import response_cache
+from app.utils.single_flight import SingleFlight
+from app.utils.tech_stack import TechStackDetector
+from app.utils.metrics import registry, span, usage_scope
+from app.utils.text_generator import get_text_generator, ProviderNotConfigured
+from app.utils.rate_limiter import RateLimitExceeded, priority_scope, PRIORITY_BATCH
+from app.utils.job_queue import job_manager, Job, JobQueueFull
+from app.utils.analysis_store import analysis_store, StoredAnalysis
+from app.utils.readme_updater import diff_structures, split_sections, affected_sections, build_update_prompt, parse_revisions, apply_revisions
 from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Tuple
 import os
+import json
+import math
+import time
 import asyncio
 
 router = APIRouter()
 
+# Identical in-flight generations share one upstream call
+single_flight = SingleFlight()
+
+# Model calls per README variant in per-variant generation mode while responses come back empty
+VARIANT_ATTEMPTS = int(os.getenv("README_VARIANT_ATTEMPTS", "3"))
+
+# README generations in flight across all batch requests, and analyses per batch
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+BATCH_ANALYSIS_CONCURRENCY = int(os.getenv("BATCH_ANALYSIS_CONCURRENCY", "2"))
+BATCH_MAX_PROJECTS = int(os.getenv("BATCH_MAX_PROJECTS", "1000"))
+
+# Shared by every batch so concurrent batches stay within one budget; created on first use
+_batch_llm_slots: Optional[asyncio.Semaphore] = None
+
+# Background analyses may walk for much longer than a request would wait
+JOB_ANALYSIS_TIME_BUDGET = float(os.getenv("JOB_ANALYSIS_TIME_BUDGET", "3600"))
+# Report analysis job progress every this many entries
+JOB_PROGRESS_ENTRIES = int(os.getenv("JOB_PROGRESS_ENTRIES", "500"))
+
 class ProjectPath(BaseModel):
     project_path: str
+    max_depth: Optional[int] = None  # Defaults to ANALYZER_MAX_DEPTH
+    max_entries: Optional[int] = None  # Defaults to ANALYZER_MAX_ENTRIES
+    content_bytes: Optional[int] = None  # File content sampled across the project; defaults to CONTENT_SAMPLE_REQUEST_BYTES (0, none)
+
+def require_text_generator():
+    """Return the text generator, or fail with 503 if no LLM provider is configured."""
+    try:
+        return get_text_generator()
+    except ProviderNotConfigured as e:
+        raise HTTPException(status_code=503, detail=f"LLM provider is not configured: {str(e)}")
+
+def rate_limit_error(e: RateLimitExceeded) -> HTTPException:
+    """Map a shed LLM call to 429 with a Retry-After hint, rather than a 500."""
+    return HTTPException(
+        status_code=429,
+        detail=f"Text generation is rate limited: {str(e)}",
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+    )
+
+async def load_analysis(analysis_id: Optional[str], project_path: Optional[str]) -> Tuple[Optional[StoredAnalysis], str]:
+    """
+    Find the server-side analysis a request refers to.
+
+    An `analysis_id` reuses a stored /analyze-project result as is; without one (or
+    once it has expired) `project_path` is analyzed here, or read from its live model
+    when ANALYZER_WATCH is on. Returns the analysis, or None if the request refers to
+    neither, and where it came from.
+    """
+    analysis = analysis_store.get(analysis_id) if analysis_id else None
+    if analysis is not None:
+        return analysis, "analysis_id"
+    if not project_path:
+        if analysis_id:
+            raise HTTPException(status_code=404, detail="Analysis not found or expired; send project_path to analyze again")
+        return None, "request"
+    if not os.path.exists(project_path):
+        raise HTTPException(status_code=404, detail="Project path not found")
+    live = await live_analyses.get(project_path)
+    if live is not None:
+        file_structure, detector, _ = await live.snapshot()
+        return analysis_store.put(project_path, file_structure, detector.result()), "live"
+    detector = TechStackDetector()
+    with span("server_analysis"):
+        file_structure = await get_file_structure(project_path, tech_stack=detector)
+    return analysis_store.put(project_path, file_structure, detector.result()), "project_path"
+
+def bound_client_content(files: Optional[List[FileDetail]]) -> Optional[List[FileDetail]]:
+    """Sample file content sent by a client like the analyzer's, to CONTENT_SAMPLE_FILE_BYTES per file."""
+    for detail in files or []:
+        if detail.content:
+            detail.content = sample_text(detail.content)
+    return files
+
+async def resolve_project(project: ProjectDetails) -> Tuple[ProjectDetails, Dict[str, Any]]:
+    """
+    Fill in the project's file structure and tech stack from a server-side analysis.
+
+    The analysis (see `load_analysis`) replaces the file structure in the request, and
+    fills the tech stack if the request has none. Returns the project and metadata on
+    where its structure came from.
+    """
+    analysis, source = await load_analysis(project.analysis_id, project.project_path)
+    if analysis is None:
+        bound_client_content(project.file_structure)
+        return project, {"analysis_source": source}
+
+    # The stored models are already validated, so copy them in without validating again
+    project = project.model_copy(update={
+        "file_structure": analysis.file_structure,
+        "tech_stack": project.tech_stack or analysis.tech_stack
+    })
+    return project, {"analysis_id": analysis.analysis_id, "analysis_source": source}
+
+async def generate_cached(payload: dict, bypass_cache: bool = False) -> tuple:
+    """
+    Run a chat completion payload through the response cache and single-flight group.
+
+    Returns the text and where it came from: "cache", "shared" (coalesced with an
+    identical in-flight request) or "model". With `bypass_cache` the lookup is skipped
+    but the fresh result still replaces the cached entry.
+    """
+    cache_key = response_cache.make_key(payload)
+    if not bypass_cache:
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return cached, "cache"
+
+    async def complete_and_store():
+        text = await get_text_generator().complete(payload)
+        await response_cache.set(cache_key, text)
+        return text
+
+    text, shared = await single_flight.do(cache_key, complete_and_store)
+    return text, "shared" if shared else "model"
+
+async def generate_readme_text(prompt: str, bypass_cache: bool = False) -> tuple:
+    """Generate all README variants in one completion, through the response cache."""
+    return await generate_cached(get_text_generator().build_payload(prompt), bypass_cache)
+
+async def generate_variant_text(prompt: str, style: str, bypass_cache: bool = False) -> tuple:
+    """
+    Generate a single README variant, independently of the others.
+
+    An empty response is retried (up to VARIANT_ATTEMPTS calls) without the cache.
+    Errors are raised at once: LLMClient already retries transport errors, 429s and
+    5xx responses, and retrying them here again would multiply the upstream calls.
+    Returns the text and its source, as for `generate_cached`.
+    """
+    payload = get_text_generator().build_variant_payload(prompt, style)
+    for attempt in range(VARIANT_ATTEMPTS):
+        text, source = await generate_cached(payload, bypass_cache)
+        if text.strip():
+            return text.strip(), source
+        print(f"Empty {style} variant from model (attempt {attempt + 1} of {VARIANT_ATTEMPTS})")
+        # A cached empty result must not be served again
+        bypass_cache = True
+    raise Exception("Empty response from model")
+
+async def generate_variants_parallel(prompt: str, bypass_cache: bool = False) -> tuple:
+    """
+    Generate every README style with its own concurrent model call.
+
+    Returns the variants (empty content for styles that failed after retries), the
+    source of each successful variant by style and the styles that failed.
+    """
+    results = await asyncio.gather(
+        *[generate_variant_text(prompt, style, bypass_cache) for style in README_STYLES],
+        return_exceptions=True
+    )
+    variants, sources, failed = [], {}, []
+    for style, result in zip(README_STYLES, results):
+        if isinstance(result, Exception):
+            print(f"{style} variant failed: {str(result)}")
+            failed.append(style)
+            variants.append(ReadmeVariant(content="", style=style))
+        else:
+            variants.append(ReadmeVariant(content=result[0], style=style))
+            sources[style] = result[1]
+    if len(failed) == len(README_STYLES):
+        rate_limited = [result for result in results if isinstance(result, RateLimitExceeded)]
+        if rate_limited:
+            raise rate_limited[0]
+        raise Exception(f"All README variants failed: {results[0]}")
+    return variants, sources, failed
+
+def format_sse(event: str, data: dict) -> str:
+    """Format a server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def format_ndjson(event: str, data) -> str:
+    """Format a newline-delimited JSON record."""
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+async def generate_readme_per_variant(project: ProjectDetails, analysis: Dict[str, Any]) -> READMEResponse:
+    """Generate each README style with an independent, concurrent model call."""
+    try:
+        with span("prompt_build") as prompt_timer:
+            summary, prompt_tokens = build_project_summary(project, project.prompt_token_budget)
+        with span("generation") as generation_timer:
+            readme_variants, sources, failed = await generate_variants_parallel(summary, project.bypass_cache)
+    except RateLimitExceeded as e:
+        raise rate_limit_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Text generation error: {str(e)}")
+
+    return READMEResponse(
+        readme_variants=readme_variants,
+        metadata={
+            "project_name": project.project_name,
+            "tech_stack": project.tech_stack,
+            "num_functions": len(project.functions),
+            "num_files": len(project.file_structure),
+            "generation_mode": "per_variant",
+            **analysis,
+            "prompt_tokens": prompt_tokens,
+            "timings_ms": {
+                "prompt_build": round(prompt_timer.elapsed * 1000, 1),
+                "generation": round(generation_timer.elapsed * 1000, 1)
+            },
+            "failed_variants": failed,
+            "variant_sources": sources,
+            "coalesced": any(source == "shared" for source in sources.values()),
+            "cache": {
+                "hit": not failed and all(source == "cache" for source in sources.values()),
+                "variant_hits": sum(source == "cache" for source in sources.values()),
+                **response_cache.stats()
+            }
+        }
+    )
 
 @router.post("/generate-readme", response_model=READMEResponse)
 async def generate_readme_endpoint(project: ProjectDetails):
     """
     Generate README files based on project details.
     """
+    require_text_generator()
+    project, analysis = await resolve_project(project)
     try:
-        # Build the prompt
-        prompt = f"""Generate 3 different README.md files for a project with the following details:
-
-Project Name: {project.project_name}
-Description: {project.description}
-Tech Stack: {', '.join(project.tech_stack)}
-Deployment URL: {project.deployment_url if project.deployment_url else 'Not provided'}
-File Structure:
-{chr(10).join(['- ' + file.path for file in project.file_structure])}
-Author: {project.author_name if project.author_name else 'Not provided'}
-
-Contact details: Include the author email ({project.author_email if project.author_email else 'Not provided'}) and GitHub username ({project.github_username if project.github_username else 'Not provided'}) if provided in a 'Contact' or 'Author' section.
-
-Generate 3 different versions:
-1. Professional and formal
-2. Modern and developer-friendly
-3. Minimal and clean
+        if project.generation_mode == "per_variant":
+            return await generate_readme_per_variant(project, analysis)
 
-Each version should be complete and use proper markdown formatting. Return them clearly separated as 'Option 1:', 'Option 2:', and 'Option 3:'.
-"""
+        with span("prompt_build") as prompt_timer:
+            prompt, prompt_tokens = build_readme_prompt(project, project.prompt_token_budget)
 
-        # Generate README using local model
+        # Generate README, reusing a cached response for an identical request
         try:
-            readme_text = text_generator.generate_readme(prompt)
+            with span("generation") as generation_timer:
+                readme_text, source = await generate_readme_text(prompt, project.bypass_cache)
+        except RateLimitExceeded as e:
+            raise rate_limit_error(e)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Text generation error: {str(e)}")
 
         # Split the response into different options
-        options = readme_text.split("Option ")
-        readme_variants = []
-        styles = ["Professional", "Modern", "Minimal"]
-        for i, option in enumerate(options[1:]):  # Skip the first empty split
-            clean_option = option[2:].strip() if len(option) > 2 else option.strip()
-            style = styles[i] if i < len(styles) else f"Style {i+1}"
-            readme_variants.append(ReadmeVariant(content=clean_option, style=style))
-        # Ensure we always return 3 variants
-        while len(readme_variants) < 3:
-            readme_variants.append(ReadmeVariant(content="", style=styles[len(readme_variants)] if len(readme_variants) < len(styles) else f"Style {len(readme_variants)+1}"))
+        with span("response_split") as split_timer:
+            readme_variants = parse_variants(readme_text)
         return READMEResponse(
             readme_variants=readme_variants,
             metadata={
                 "project_name": project.project_name,
                 "tech_stack": project.tech_stack,
                 "num_functions": len(project.functions),
-                "num_files": len(project.file_structure)
+                "num_files": len(project.file_structure),
+                **analysis,
+                "prompt_tokens": prompt_tokens,
+                "timings_ms": {
+                    "prompt_build": round(prompt_timer.elapsed * 1000, 1),
+                    "generation": round(generation_timer.elapsed * 1000, 1),
+                    "response_split": round(split_timer.elapsed * 1000, 1)
+                },
+                "coalesced": source == "shared",
+                "cache": {"hit": source == "cache", **response_cache.stats()}
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in generate_readme_endpoint: {str(e)}")
         print(f"Error type: {type(e)}")
@@ -71,6 +289,255 @@ Each version should be complete and use proper markdown formatting. Return them
         print(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def batch_llm_slots() -> asyncio.Semaphore:
+    global _batch_llm_slots
+    if _batch_llm_slots is None:
+        _batch_llm_slots = asyncio.Semaphore(BATCH_LLM_CONCURRENCY)
+    return _batch_llm_slots
+
+async def generate_batch_project(index: int, project: ProjectDetails, analysis_slots: asyncio.Semaphore, batch_slots: asyncio.Semaphore) -> Dict[str, Any]:
+    """Analyze (if needed) and generate one project of a batch, returning its result record."""
+    start = time.perf_counter()
+    try:
+        async with analysis_slots:
+            project, analysis = await resolve_project(project)
+        # Already resolved, so the generation does not look the analysis up again
+        project = project.model_copy(update={"analysis_id": None, "project_path": None})
+        async with batch_slots, batch_llm_slots():
+            response = await generate_readme_endpoint(project)
+        return {
+            "index": index,
+            "project_name": project.project_name,
+            "status": "succeeded",
+            "readme_variants": [variant.model_dump() for variant in response.readme_variants],
+            "metadata": {**response.metadata, **analysis},
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+    except Exception as e:
+        return {
+            "index": index,
+            "project_name": project.project_name,
+            "status": "failed",
+            "error": str(getattr(e, "detail", None) or e),
+            "status_code": getattr(e, "status_code", 500),
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+@router.post("/generate-readme/batch")
+async def generate_readme_batch_endpoint(batch: BatchRequest):
+    """
+    Generate READMEs for many projects, streamed as newline-delimited JSON.
+
+    Projects given by path are analyzed on the server, BATCH_ANALYSIS_CONCURRENCY at a
+    time, and move on to generation as soon as their analysis is done. Generations
+    share a process-wide budget of BATCH_LLM_CONCURRENCY (so concurrent batches cannot
+    crowd out each other) and are admitted after interactive requests. Emits a
+    `result` record per project as it completes, in completion order with its
+    `index`, then a `summary` record with aggregate throughput and token usage.
+    """
+    projects = list(batch.projects) + [
+        ProjectDetails(project_name=os.path.basename(os.path.normpath(path)), description="", project_path=path)
+        for path in batch.project_paths
+    ]
+    if not projects:
+        raise HTTPException(status_code=422, detail="projects or project_paths is required")
+    if len(projects) > BATCH_MAX_PROJECTS:
+        raise HTTPException(status_code=413, detail=f"A batch can contain at most {BATCH_MAX_PROJECTS} projects")
+    require_text_generator()
+
+    async def record_stream():
+        analysis_slots = asyncio.Semaphore(BATCH_ANALYSIS_CONCURRENCY)
+        batch_slots = asyncio.Semaphore(min(batch.max_concurrency or BATCH_LLM_CONCURRENCY, BATCH_LLM_CONCURRENCY))
+        start = time.perf_counter()
+        succeeded = failed = cache_hits = 0
+        with usage_scope() as usage, priority_scope(PRIORITY_BATCH):
+            tasks = [
+                asyncio.create_task(generate_batch_project(index, project, analysis_slots, batch_slots))
+                for index, project in enumerate(projects)
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    result = await next_done
+                    if result["status"] == "succeeded":
+                        succeeded += 1
+                        cache_hits += result["metadata"]["cache"]["hit"]
+                    else:
+                        failed += 1
+                    yield format_ndjson("result", result)
+            finally:
+                # The client went away: stop the projects still queued or running
+                for task in tasks:
+                    task.cancel()
+        elapsed = time.perf_counter() - start
+        yield format_ndjson("summary", {
+            "projects": len(projects),
+            "succeeded": succeeded,
+            "failed": failed,
+            "cache_hits": cache_hits,
+            "seconds": round(elapsed, 3),
+            "projects_per_minute": round(succeeded / elapsed * 60, 2) if elapsed else None,
+            "tokens": {"prompt": usage.get("prompt", 0), "completion": usage.get("completion", 0)},
+            "tokens_per_second": round(sum(usage.values()) / elapsed, 1) if elapsed else None
+        })
+
+    return StreamingResponse(record_stream(), media_type="application/x-ndjson")
+
+@router.post("/generate-readme/update", response_model=READMEUpdateResponse)
+async def update_readme_endpoint(request: ReadmeUpdateRequest):
+    """
+    Revise an existing README for the changes between two analyses of the project.
+
+    Only the sections the change affects (by heading topic, or by mentioning a removed
+    or changed file or function) are sent to the model and rewritten; the rest of the
+    README is kept verbatim. Without any change the README is returned as is, without
+    a model call.
+    """
+    if request.previous_analysis_id:
+        previous = analysis_store.get(request.previous_analysis_id)
+        if previous is None and request.previous_file_structure is None:
+            raise HTTPException(status_code=404, detail="Previous analysis not found or expired; send previous_file_structure")
+    else:
+        previous = None
+        if request.previous_file_structure is None:
+            raise HTTPException(status_code=422, detail="previous_analysis_id or previous_file_structure is required")
+    previous_files = previous.file_structure if previous else bound_client_content(request.previous_file_structure)
+    previous_stack = request.previous_tech_stack or (previous.tech_stack if previous else [])
+
+    current, source = await load_analysis(request.analysis_id, request.project_path)
+    current_files = current.file_structure if current else bound_client_content(request.file_structure)
+    current_stack = request.tech_stack or (current.tech_stack if current else [])
+    analysis = {"analysis_id": current.analysis_id, "analysis_source": source} if current else {"analysis_source": source}
+
+    with span("readme_diff") as diff_timer:
+        diff = diff_structures(previous_files, current_files, previous_stack, current_stack)
+        sections = split_sections(request.previous_readme)
+        affected = affected_sections(sections, diff)
+    metadata = {
+        "project_name": request.project_name,
+        **analysis,
+        "changes": diff.summary(),
+        "num_sections": len(sections),
+        "affected_sections": [section.title for section in affected],
+        "timings_ms": {"diff": round(diff_timer.elapsed * 1000, 1)}
+    }
+    if diff.empty:
+        return READMEUpdateResponse(readme=request.previous_readme, revised_sections=[], metadata={**metadata, "unchanged": True})
+
+    text_generator = require_text_generator()
+    prompt, max_tokens = build_update_prompt(request.project_name, sections, affected, diff)
+    try:
+        with span("generation") as generation_timer:
+            text, source = await generate_cached(text_generator.build_update_payload(prompt, max_tokens), request.bypass_cache)
+    except RateLimitExceeded as e:
+        raise rate_limit_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Text generation error: {str(e)}")
+
+    revised, added = parse_revisions(text)
+    affected_indexes = {section.index for section in affected}
+    revised_titles = [section.title for section in affected if section.index in revised]
+    revised_titles += [content.splitlines()[0].lstrip("# ").strip() for content in added]
+    return READMEUpdateResponse(
+        readme=apply_revisions(sections, affected, revised, added),
+        revised_sections=revised_titles,
+        metadata={
+            **metadata,
+            "unchanged": False,
+            "ignored_revisions": sorted(index for index in revised if index not in affected_indexes),
+            "prompt_tokens": count_tokens(prompt),
+            "max_output_tokens": max_tokens,
+            "timings_ms": {**metadata["timings_ms"], "generation": round(generation_timer.elapsed * 1000, 1)},
+            "coalesced": source == "shared",
+            "cache": {"hit": source == "cache", **response_cache.stats()}
+        }
+    )
+
+@router.post("/generate-readme/stream")
+async def generate_readme_stream_endpoint(project: ProjectDetails):
+    """
+    Stream README generation as server-sent events.
+
+    Emits a `token` event per text delta from the model, a `variant` event as soon as
+    each "Option N:" section is complete, and a final `done` (or `error`) event.
+    """
+    text_generator = require_text_generator()
+    project, analysis = await resolve_project(project)
+    with span("prompt_build"):
+        prompt, prompt_tokens = build_readme_prompt(project, project.prompt_token_budget)
+
+    async def event_stream():
+        splitter = OptionSplitter()
+        variants = 0
+        try:
+            async for token in text_generator.stream_readme(prompt):
+                yield format_sse("token", {"text": token})
+                for variant in splitter.feed(token):
+                    variants += 1
+                    yield format_sse("variant", variant.model_dump())
+            for variant in splitter.close():
+                variants += 1
+                yield format_sse("variant", variant.model_dump())
+            yield format_sse("done", {
+                "project_name": project.project_name,
+                "num_variants": variants,
+                "prompt_tokens": prompt_tokens,
+                **analysis
+            })
+        except RateLimitExceeded as e:
+            yield format_sse("error", {"detail": str(e), "status": 429, "retry_after": e.retry_after})
+        except Exception as e:
+            print(f"Error in generate_readme_stream_endpoint: {str(e)}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def analysis_response(file_structure: List[Any], detector: TechStackDetector, stats: Dict[str, Any], analysis_id: str) -> Dict[str, Any]:
+    """Assemble the /analyze-project response from a completed walk."""
+    return {
+        "analysis_id": analysis_id,
+        "file_structure": file_structure,
+        "tech_stack": detector.result(),
+        "languages": detector.language_shares(),
+        "partial": stats["partial"],
+        "partial_reason": stats["partial_reason"],
+        "index": {
+            "files_reused": stats["files_reused"],
+            "files_parsed": stats["files_parsed"]
+        },
+        "content": {
+            "bytes": stats["content_bytes"],
+            "files_sampled": stats["files_sampled"],
+            "files_binary": stats["files_binary"]
+        },
+        "timings_ms": {"walk": stats["walk_ms"], "parse": stats["parse_ms"]}
+    }
+
+async def live_analysis_response(project: ProjectPath) -> Optional[Dict[str, Any]]:
+    """
+    Answer an analysis from the project's live model (see `live_analyses`), or return
+    None when watching is disabled, does not apply to the project or the request sets
+    its own walk budgets.
+    """
+    if project.max_depth is not None or project.max_entries is not None:
+        return None
+    live = await live_analyses.get(project.project_path)
+    if live is None:
+        return None
+    file_structure, detector, stats = await live.snapshot(ContentBudget(project.content_bytes))
+    stored = analysis_store.put(project.project_path, file_structure, detector.result())
+    response = analysis_response(file_structure, detector, stats, stored.analysis_id)
+    response["live"] = live.status()
+    return response
+
+def record_walk(project: ProjectPath, stats: Dict[str, Any]):
+    """Let `live_analyses` watch the project again after a complete walk with the default budgets."""
+    if project.max_depth is None and project.max_entries is None:
+        live_analyses.rescanned(project.project_path, stats["partial"])
+
 @router.post("/analyze-project")
 async def analyze_project(project: ProjectPath):
     """
@@ -79,17 +546,205 @@ async def analyze_project(project: ProjectPath):
     try:
         if not os.path.exists(project.project_path):
             raise HTTPException(status_code=404, detail="Project path not found")
+
+        live_response = await live_analysis_response(project)
+        if live_response is not None:
+            return live_response
         
-        # Get file structure and tech stack concurrently
-        file_structure, tech_stack = await asyncio.gather(
-            get_file_structure(project.project_path),
-            detect_tech_stack(project.project_path)
+        # Get file structure and tech stack in a single walk
+        stats = {}
+        detector = TechStackDetector()
+        file_structure = await get_file_structure(
+            project.project_path,
+            max_depth=project.max_depth,
+            stats=stats,
+            max_entries=project.max_entries,
+            tech_stack=detector,
+            content_budget=ContentBudget(project.content_bytes)
         )
+        record_walk(project, stats)
         
-        return {
-            "file_structure": file_structure,
-            "tech_stack": tech_stack
-        }
+        # Kept so /generate-readme can take the analysis_id instead of the structure
+        stored = analysis_store.put(project.project_path, file_structure, detector.result())
+        return analysis_response(file_structure, detector, stats, stored.analysis_id)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in analyze_project endpoint: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/analyze-project/stream")
+async def analyze_project_stream(project: ProjectPath):
+    """
+    Stream a project analysis as newline-delimited JSON.
+
+    Emits one `entry` record per file or directory as the walk discovers it, a
+    `tech_stack` record (detected during the same walk) once it is complete, and a
+    final `summary` (or `error`) record with the partial-result marker and index
+    counters.
+    """
+    if not os.path.exists(project.project_path):
+        raise HTTPException(status_code=404, detail="Project path not found")
+
+    async def record_stream():
+        stats = {}
+        detector = TechStackDetector()
+        try:
+            async for detail in iter_file_structure(
+                project.project_path,
+                max_depth=project.max_depth,
+                stats=stats,
+                max_entries=project.max_entries,
+                tech_stack=detector,
+                content_budget=ContentBudget(project.content_bytes)
+            ):
+                yield format_ndjson("entry", detail.model_dump())
+            record_walk(project, stats)
+            yield format_ndjson("tech_stack", detector.result())
+            yield format_ndjson("summary", {
+                "num_entries": stats["entries"],
+                "languages": detector.language_shares(),
+                "partial": stats["partial"],
+                "partial_reason": stats["partial_reason"],
+                "index": {
+                    "files_reused": stats["files_reused"],
+                    "files_parsed": stats["files_parsed"]
+                },
+                "content": {
+                    "bytes": stats["content_bytes"],
+                    "files_sampled": stats["files_sampled"],
+                    "files_binary": stats["files_binary"]
+                },
+                "timings_ms": {"walk": stats["walk_ms"], "parse": stats["parse_ms"]}
+            })
+        except Exception as e:
+            print(f"Error in analyze_project_stream endpoint: {str(e)}")
+            yield format_ndjson("error", {"detail": str(e)})
+
+    return StreamingResponse(record_stream(), media_type="application/x-ndjson")
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Expose stage latencies, request durations and token usage in the Prometheus text format.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+async def run_analysis_job(params: Dict[str, Any], job: Job) -> Dict[str, Any]:
+    """Analyze a project in the background, reporting the entries walked so far."""
+    project = ProjectPath(**params)
+    if not os.path.exists(project.project_path):
+        raise FileNotFoundError("Project path not found")
+
+    live_response = await live_analysis_response(project)
+    if live_response is not None:
+        live_response["file_structure"] = [detail.model_dump() for detail in live_response["file_structure"]]
+        job.report(stage="complete", entries=len(live_response["file_structure"]), files_parsed=live_response["index"]["files_parsed"])
+        return live_response
+
+    stats = {}
+    detector = TechStackDetector()
+    file_structure = []
+    job.report(stage="analyzing", entries=0)
+    async for detail in iter_file_structure(
+        project.project_path,
+        max_depth=project.max_depth,
+        stats=stats,
+        max_entries=project.max_entries,
+        tech_stack=detector,
+        time_budget=JOB_ANALYSIS_TIME_BUDGET,
+        content_budget=ContentBudget(project.content_bytes)
+    ):
+        file_structure.append(detail)
+        if len(file_structure) % JOB_PROGRESS_ENTRIES == 0:
+            job.report(entries=len(file_structure), files_parsed=stats["files_parsed"], files_reused=stats["files_reused"])
+    job.report(stage="complete", entries=len(file_structure), files_parsed=stats["files_parsed"], files_reused=stats["files_reused"])
+    record_walk(project, stats)
+    stored = analysis_store.put(project.project_path, file_structure, detector.result())
+    return analysis_response([detail.model_dump() for detail in file_structure], detector, stats, stored.analysis_id)
+
+async def run_generation_job(params: Dict[str, Any], job: Job) -> Dict[str, Any]:
+    """Generate READMEs in the background; the result is the /generate-readme response."""
+    job.report(stage="generating")
+    response = await generate_readme_endpoint(ProjectDetails(**params))
+    job.report(stage="complete")
+    return response.model_dump()
+
+job_manager.register("analyze", run_analysis_job)
+job_manager.register("generate", run_generation_job)
+
+async def submit_job(kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        job = await job_manager.submit(kind, params)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Job queue is full: {str(e)}", headers={"Retry-After": "30"})
+    return job.to_dict(include_result=False)
+
+@router.post("/jobs/analyze", status_code=202)
+async def submit_analysis_job(project: ProjectPath):
+    """
+    Queue a project analysis and return its job id immediately.
+
+    Poll `GET /jobs/{job_id}` or stream `GET /jobs/{job_id}/events` for progress; the
+    result is the /analyze-project response.
+    """
+    if not os.path.exists(project.project_path):
+        raise HTTPException(status_code=404, detail="Project path not found")
+    return await submit_job("analyze", project.model_dump())
+
+@router.post("/jobs/generate", status_code=202)
+async def submit_generation_job(project: ProjectDetails):
+    """
+    Queue README generation and return its job id immediately.
+
+    The job's LLM calls are admitted after interactive requests; the result is the
+    /generate-readme response.
+    """
+    require_text_generator()
+    bound_client_content(project.file_structure)
+    return await submit_job("generate", project.model_dump())
+
+async def require_job(job_id: str) -> Job:
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, result_fields: Optional[str] = None):
+    """
+    Return a job's status and progress, and its result or error once it has finished.
+
+    `result_fields` (comma-separated, e.g. "analysis_id,tech_stack") trims the result
+    to those keys, so pollers need not download a whole file structure.
+    """
+    data = (await require_job(job_id)).to_dict()
+    if result_fields is not None and isinstance(data["result"], dict):
+        fields = {field.strip() for field in result_fields.split(",")}
+        data["result"] = {key: value for key, value in data["result"].items() if key in fields}
+    return data
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream a job as newline-delimited JSON.
+
+    Emits a `status` record with the job's current state, a `progress` record per
+    update, and a final `done` record with the finished job and its result.
+    """
+    await require_job(job_id)
+
+    async def record_stream():
+        async for event, data in job_manager.events(job_id):
+            yield format_ndjson(event, data)
+
+    return StreamingResponse(record_stream(), media_type="application/x-ndjson")
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job. Finished jobs are returned unchanged.
+    """
+    await require_job(job_id)
+    job = await job_manager.cancel(job_id)
+    return job.to_dict(include_result=False)
@@ -0,0 +1,22 @@
+from pathlib import Path
+from dotenv import load_dotenv
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+ROOT_DIR = BACKEND_DIR.parent
+
+_loaded = False
+
+def load_environment():
+    """
+    Load settings from the repository and backend .env files, once per process.
+
+    Both files are optional: deployments can pass settings as real environment
+    variables. Values already in the environment take precedence, and the root .env
+    wins over backend/.env.
+    """
+    global _loaded
+    if _loaded:
+        return
+    load_dotenv(ROOT_DIR / '.env')
+    load_dotenv(BACKEND_DIR / '.env')
+    _loaded = True
@@ -1,28 +1,62 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Literal
 
 class FunctionDetail(BaseModel):
     name: str
     description: str
     parameters: Optional[List[str]] = []
     return_type: Optional[str] = None
+    kind: Optional[str] = None  # "function", "async_function", "method", "async_method" or "class"
+    calls: Optional[List[str]] = None  # Names called from the function body
 
 class FileDetail(BaseModel):
     path: str
     type: str  # 'file' or 'directory'
     content: Optional[str] = None
-    functions: Optional[List[FunctionDetail]] = []
+    functions: Optional[List[FunctionDetail]] = []  # Functions and methods
+    classes: Optional[List[FunctionDetail]] = None  # Classes, with their base classes as parameters
+    docstring: Optional[str] = None  # Module docstring
+    imports: Optional[List[str]] = None
 
 class ProjectDetails(BaseModel):
     project_name: str
     description: str
-    tech_stack: List[str]
+    tech_stack: List[str] = []
     deployment_url: Optional[str] = None
-    file_structure: List[FileDetail]
-    functions: List[FunctionDetail]
+    file_structure: List[FileDetail] = []
+    functions: List[FunctionDetail] = []
     author_name: Optional[str] = None
     author_email: Optional[str] = None
     github_username: Optional[str] = None
+    bypass_cache: bool = False  # Skip the response cache lookup and regenerate
+    # "combined" asks for all three variants in one completion; "per_variant" makes one call per style
+    generation_mode: Literal["combined", "per_variant"] = "combined"
+    prompt_token_budget: Optional[int] = None  # Defaults to PROMPT_TOKEN_BUDGET
+    # Read the file structure on the server instead of from the request: a previous
+    # /analyze-project result, or a project directory to analyze (also the fallback
+    # when the analysis has expired)
+    analysis_id: Optional[str] = None
+    project_path: Optional[str] = None
+
+class BatchRequest(BaseModel):
+    projects: List[ProjectDetails] = []
+    # Directories to analyze and generate with defaults (named after the directory)
+    project_paths: List[str] = []
+    max_concurrency: Optional[int] = None  # LLM generations in flight for this batch; capped by BATCH_LLM_CONCURRENCY
+
+class ReadmeUpdateRequest(BaseModel):
+    project_name: str
+    previous_readme: str
+    # The analysis the previous README was generated from: a stored analysis, or its structure
+    previous_analysis_id: Optional[str] = None
+    previous_file_structure: Optional[List[FileDetail]] = None
+    previous_tech_stack: Optional[List[str]] = None
+    # The current state, as for ProjectDetails
+    analysis_id: Optional[str] = None
+    project_path: Optional[str] = None
+    file_structure: List[FileDetail] = []
+    tech_stack: List[str] = []
+    bypass_cache: bool = False
 
 class ReadmeVariant(BaseModel):
     content: str
@@ -30,4 +64,9 @@ class ReadmeVariant(BaseModel):
 
 class READMEResponse(BaseModel):
     readme_variants: List[ReadmeVariant]
-    metadata: Optional[dict] = Field(default_factory=dict) 
\ No newline at end of file
+    metadata: Optional[dict] = Field(default_factory=dict) 
+
+class READMEUpdateResponse(BaseModel):
+    readme: str
+    revised_sections: List[str]  # Titles of the sections the model rewrote, added or removed
+    metadata: Optional[dict] = Field(default_factory=dict)
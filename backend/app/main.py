@@ -1,12 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-import os
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.config import load_environment
+
+# Settings must be in the environment before modules that read them are imported
+load_environment()
+
 from app.api.routes import router as api_router
-from dotenv import load_dotenv
+from app.utils.text_generator import close_text_generator
+from app.utils.code_analyzer import shutdown_executors
+from app.utils.metrics import RequestMetricsMiddleware
+from app.utils.job_queue import job_manager
+from app.utils.project_watcher import live_analyses
 
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env'))
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing is initialized eagerly: the LLM provider and the parser process pool are
+    # created on first use, so workers start fast and a missing API key only affects
+    # the generation endpoints. Job workers start with the first job request.
+    yield
+    await job_manager.shutdown()
+    live_analyses.shutdown()
+    await close_text_generator()
+    shutdown_executors()
 
-app = FastAPI(title="AI README Generator API")
+app = FastAPI(title="AI README Generator API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -17,9 +35,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request durations for /api/metrics
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,108 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path(__file__).parent.parent.parent / ".cache" / "analysis_index.sqlite3"
+
+# Bump when the shape of the stored extraction results changes to invalidate old rows
+INDEX_SCHEMA_VERSION = 2
+
+class AnalysisIndex:
+    """
+    Persistent per-file index of extracted symbols.
+
+    Each row stores the `ModuleSymbols.to_dict()` result for a file (docstring, imports
+    and functions) in the `functions` column.
+
+    Rows are keyed by absolute path and remember the file's mtime, size and content
+    hash. A matching mtime/size pair reuses the stored result without touching the
+    file; otherwise a matching content hash still avoids re-parsing it.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, enabled: bool = True):
+        self.db_path = str(db_path or DEFAULT_INDEX_PATH)
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "AnalysisIndex":
+        """Create an index configured from ANALYSIS_INDEX_* environment variables."""
+        return cls(
+            db_path=os.getenv("ANALYSIS_INDEX_PATH"),
+            enabled=os.getenv("ANALYSIS_INDEX_ENABLED", "true").lower() == "true"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS file_index ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+                "content_hash TEXT NOT NULL, schema_version INTEGER NOT NULL, functions TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get_many(self, paths: List[str]) -> Dict[str, Tuple[int, int, str, Dict[str, Any]]]:
+        """Return (mtime_ns, size, content_hash, symbols) for every indexed path."""
+        if not self.enabled or not paths:
+            return {}
+        entries = {}
+        try:
+            with self._lock:
+                conn = self._connect()
+                # Stay well below SQLite's bound-parameter limit
+                for start in range(0, len(paths), 500):
+                    chunk = paths[start:start + 500]
+                    rows = conn.execute(
+                        f"SELECT path, mtime_ns, size, content_hash, functions FROM file_index "
+                        f"WHERE schema_version = ? AND path IN ({','.join('?' * len(chunk))})",
+                        (INDEX_SCHEMA_VERSION, *chunk)
+                    )
+                    for path, mtime_ns, size, content_hash, functions in rows:
+                        entries[path] = (mtime_ns, size, content_hash, json.loads(functions))
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis index read failed: {e}")
+            return {}
+        return entries
+
+    def put_many(self, rows: Iterable[Tuple[str, int, int, str, Dict[str, Any]]]):
+        """Store (path, mtime_ns, size, content_hash, symbols) rows in one transaction."""
+        if not self.enabled:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO file_index "
+                    "(path, mtime_ns, size, content_hash, schema_version, functions) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(path, mtime_ns, size, content_hash, INDEX_SCHEMA_VERSION, json.dumps(functions))
+                     for path, mtime_ns, size, content_hash, functions in rows]
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis index write failed: {e}")
+
+    def clear(self):
+        """Remove every stored row, e.g. to force a full re-parse."""
+        if not self.enabled:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM file_index")
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis index write failed: {e}")
+
+# Create a singleton instance
+analysis_index = AnalysisIndex.from_env()
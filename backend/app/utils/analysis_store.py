@@ -0,0 +1,61 @@
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+from app.core.models import FileDetail
+
+class StoredAnalysis:
+    """A completed project analysis, kept as validated models for reuse by generation."""
+
+    __slots__ = ('analysis_id', 'project_path', 'file_structure', 'tech_stack', 'created_at')
+
+    def __init__(self, analysis_id: str, project_path: str, file_structure: List[FileDetail], tech_stack: List[str]):
+        self.analysis_id = analysis_id
+        self.project_path = project_path
+        self.file_structure = file_structure
+        self.tech_stack = tech_stack
+        self.created_at = time.time()
+
+class AnalysisStore:
+    """
+    In-memory LRU of recent analyses, keyed by the `analysis_id` returned to clients.
+
+    /generate-readme can then reference an analysis instead of the client sending the
+    whole file structure back, which would be encoded, uploaded and validated a second
+    time. Entries expire after `ttl_seconds`; a client holding an expired id can send
+    the project path instead.
+    """
+
+    def __init__(self, max_entries: int = 16, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, StoredAnalysis]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "AnalysisStore":
+        """Create a store configured from ANALYSIS_STORE_* environment variables."""
+        return cls(
+            max_entries=int(os.getenv("ANALYSIS_STORE_ENTRIES", "16")),
+            ttl_seconds=float(os.getenv("ANALYSIS_STORE_TTL", "3600"))
+        )
+
+    def put(self, project_path: str, file_structure: List[FileDetail], tech_stack: List[str]) -> StoredAnalysis:
+        analysis = StoredAnalysis(uuid.uuid4().hex, project_path, file_structure, tech_stack)
+        self._entries[analysis.analysis_id] = analysis
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return analysis
+
+    def get(self, analysis_id: str) -> Optional[StoredAnalysis]:
+        analysis = self._entries.get(analysis_id)
+        if analysis is None:
+            return None
+        if time.time() - analysis.created_at > self.ttl_seconds:
+            del self._entries[analysis_id]
+            return None
+        self._entries.move_to_end(analysis_id)
+        return analysis
+
+# Create a singleton instance
+analysis_store = AnalysisStore.from_env()
@@ -1,146 +1,312 @@
-import ast
 import os
+import time
 import asyncio
-from typing import List, Dict, Any
+import hashlib
+import multiprocessing
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from app.core.models import FunctionDetail, FileDetail
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from app.utils.analysis_index import analysis_index
+from app.utils.extractors import extract_module, extract_python_functions, get_extractor, ModuleSymbols, MAX_EXTRACT_BYTES
+from app.utils.fs_walker import ProjectWalker, WalkEntry
+from app.utils.content_sampler import ContentBudget, sample_file, CONTENT_SAMPLE_FILE_BYTES
+from app.utils.prompt_builder import ENTRY_POINT_NAMES
+from app.utils.tech_stack import TechStackDetector
+from app.utils.metrics import span, record_stage
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
-# Create a thread pool for CPU-bound operations
+# Process pool size and files per IPC round trip for parallel parsing
+ANALYZER_WORKERS = int(os.getenv("ANALYZER_WORKERS", "0")) or os.cpu_count() or 1
+ANALYZER_BATCH_SIZE = int(os.getenv("ANALYZER_BATCH_SIZE", "64"))
+# Below this many files to parse, the thread pool beats process start-up and IPC
+INLINE_PARSE_LIMIT = int(os.getenv("ANALYZER_INLINE_PARSE_LIMIT", "16"))
+# Walk entries analyzed and yielded together by iter_file_structure
+STREAM_CHUNK_SIZE = int(os.getenv("ANALYZER_STREAM_CHUNK_SIZE", "512"))
+
+# Create a thread pool for light blocking work; parsing fans out to a lazily created process pool
 executor = ThreadPoolExecutor(max_workers=2)  # Reduced workers
+process_pool: Optional[ProcessPoolExecutor] = None
 
 def analyze_python_file(file_path: str) -> List[FunctionDetail]:
     """Analyze a Python file and extract function information."""
     try:
+        if os.path.getsize(file_path) > MAX_EXTRACT_BYTES:
+            return []
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
-        
-        tree = ast.parse(content)
-        functions = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Get function docstring
-                docstring = ast.get_docstring(node) or ""
-                
-                # Get parameters
-                params = [arg.arg for arg in node.args.args]
-                
-                # Get return type annotation if available
-                return_type = None
-                if node.returns:
-                    return_type = ast.unparse(node.returns)
-                
-                functions.append(FunctionDetail(
-                    name=node.name,
-                    description=docstring,
-                    parameters=params,
-                    return_type=return_type
-                ))
-        
-        return functions
+        return extract_python_functions(content)
     except Exception as e:
         print(f"Error analyzing file {file_path}: {str(e)}")
         return []
 
-async def get_file_structure(root_path: str, max_depth: int = 2) -> List[FileDetail]:  # Reduced max_depth
-    """Get the structure of the project directory with a maximum depth."""
-    file_structure = []
-    
-    async def process_directory(current_path: str, current_depth: int):
-        if current_depth > max_depth:
-            return
-            
+def parse_source_files(batch: List[Tuple[str, Optional[str]]]) -> List[Tuple[str, Optional[str], Optional[Dict[str, Any]]]]:
+    """
+    Parse a batch of source files in a worker process.
+
+    Each item is an absolute path and the content hash already in the index (if any).
+    The extractor is picked by file extension. Returns (path, content_hash, symbols)
+    per file, with symbols set to None when the content hash is unchanged so the caller
+    can reuse the indexed result. Symbols are returned as the plain `ModuleSymbols`
+    dict to keep the IPC payload small. Files over MAX_EXTRACT_BYTES are not read; they
+    are recorded with no symbols under a size marker instead of a content hash.
+    """
+    results = []
+    for path, known_hash in batch:
         try:
-            entries = os.listdir(current_path)
-            for entry in entries:
-                if entry.startswith('.') or entry in ['venv', 'env', '__pycache__', 'node_modules']:  # Skip more directories
-                    continue
-                    
-                full_path = os.path.join(current_path, entry)
-                rel_path = os.path.relpath(full_path, root_path)
-                
-                if os.path.isdir(full_path):
-                    file_structure.append(FileDetail(
-                        path=rel_path,
-                        type='directory'
-                    ))
-                    await process_directory(full_path, current_depth + 1)
-                else:
-                    functions = []
-                    if entry.endswith('.py'):
-                        # Run Python file analysis in thread pool
-                        loop = asyncio.get_event_loop()
-                        functions = await loop.run_in_executor(
-                            executor,
-                            analyze_python_file,
-                            full_path
-                        )
-                    
-                    file_structure.append(FileDetail(
-                        path=rel_path,
-                        type='file',
-                        functions=functions
-                    ))
-        except Exception as e:
-            print(f"Error processing directory {current_path}: {str(e)}")
-    
-    try:
-        await asyncio.wait_for(process_directory(root_path, 0), timeout=15.0)  # Reduced timeout
-    except asyncio.TimeoutError:
-        print(f"Directory analysis timed out for {root_path}")
-    except Exception as e:
-        print(f"Error in get_file_structure: {str(e)}")
-    
-    return file_structure
-
-async def detect_tech_stack(root_path: str) -> List[str]:
-    """Detect the technology stack used in the project."""
-    tech_stack = set()
-    
-    # Check for common configuration files
-    config_files = {
-        'requirements.txt': 'Python',
-        'package.json': 'Node.js',
-        'pom.xml': 'Java',
-        'build.gradle': 'Java',
-        'Cargo.toml': 'Rust',
-        'go.mod': 'Go',
-        'Gemfile': 'Ruby',
-        'composer.json': 'PHP',
-        'Dockerfile': 'Docker',
-        'docker-compose.yml': 'Docker',
-        '.env': 'Environment Variables'
-    }
-    
-    try:
-        # Check root directory for config files
-        for file_name, tech in config_files.items():
-            if os.path.exists(os.path.join(root_path, file_name)):
-                tech_stack.add(tech)
-        
-        # Check file extensions in first level only
-        for entry in os.listdir(root_path):
-            if entry.startswith('.'):
+            size = os.path.getsize(path)
+            if size > MAX_EXTRACT_BYTES:
+                results.append((path, f"oversize:{size}", ModuleSymbols().to_dict()))
                 continue
-                
-            full_path = os.path.join(root_path, entry)
-            if os.path.isfile(full_path):
-                ext = os.path.splitext(entry)[1].lower()
-                if ext in ['.py']:
-                    tech_stack.add('Python')
-                elif ext in ['.js', '.jsx', '.ts', '.tsx']:
-                    tech_stack.add('JavaScript/TypeScript')
-                elif ext in ['.java']:
-                    tech_stack.add('Java')
-                elif ext in ['.go']:
-                    tech_stack.add('Go')
-                elif ext in ['.rs']:
-                    tech_stack.add('Rust')
-                elif ext in ['.rb']:
-                    tech_stack.add('Ruby')
-                elif ext in ['.php']:
-                    tech_stack.add('PHP')
-    except Exception as e:
-        print(f"Error in detect_tech_stack: {str(e)}")
-    
-    return list(tech_stack) 
\ No newline at end of file
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error analyzing file {path}: {str(e)}")
+            results.append((path, None, ModuleSymbols().to_dict()))
+            continue
+        content_hash = hashlib.sha256(data).hexdigest()
+        if content_hash == known_hash:
+            results.append((path, content_hash, None))
+            continue
+        symbols = extract_module(path, data.decode('utf-8', errors='replace'))
+        results.append((path, content_hash, symbols.to_dict()))
+    return results
+
+def sample_contents(
+    entries: List[WalkEntry],
+    budget: ContentBudget,
+    cache: Optional[Dict[str, Tuple[int, Optional[str], bool]]] = None
+) -> Dict[str, str]:
+    """
+    Sample the content of the source files and entry points among walk entries.
+
+    Each file gets up to CONTENT_SAMPLE_FILE_BYTES (see `sample_file`) while the
+    analysis-wide `budget` lasts; binary files are skipped. Returns content by path.
+    Samples are reused from, and stored in, `cache` by path (with the byte allowance
+    they were taken with); the caller drops the entries of files that changed.
+    """
+    contents = {}
+    for entry in entries:
+        if budget.remaining <= 0:
+            break
+        if entry.is_dir or not entry.size:
+            continue
+        if not (get_extractor(entry.path) or os.path.basename(entry.path) in ENTRY_POINT_NAMES):
+            continue
+        granted = budget.take(CONTENT_SAMPLE_FILE_BYTES)
+        cached = cache.get(entry.path) if cache is not None else None
+        if cached is not None and cached[0] == granted:
+            content, binary = cached[1], cached[2]
+        else:
+            content, binary = sample_file(entry.path, granted)
+            if cache is not None:
+                cache[entry.path] = (granted, content, binary)
+        if binary:
+            budget.files_binary += 1
+        used = len(content.encode('utf-8')) if content else 0
+        budget.give_back(max(granted - used, 0))
+        if content:
+            contents[entry.path] = content
+            budget.bytes_sampled += used
+            budget.files_sampled += 1
+    return contents
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared parser process pool, creating it on first use."""
+    global process_pool
+    if process_pool is None:
+        # Forking a threaded server can copy a lock another thread holds into the
+        # child and deadlock it; forkserver children start from a clean process
+        process_pool = ProcessPoolExecutor(max_workers=ANALYZER_WORKERS, mp_context=_pool_context())
+    return process_pool
+
+def shutdown_executors():
+    """Shut down the analyzer's thread and process pools."""
+    global process_pool
+    if process_pool is not None:
+        process_pool.shutdown(wait=False, cancel_futures=True)
+        process_pool = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def _plan_source_files(paths: List[str]) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Tuple[str, int, int, Optional[str]]], Dict[str, Any]]:
+    """Split files into those reusable from the index by mtime/size and those to hash or parse."""
+    indexed = analysis_index.get_many(paths)
+    reused = {}
+    pending = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entry = indexed.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            reused[path] = entry[3]
+        else:
+            pending.append((path, stat.st_mtime_ns, stat.st_size, entry[2] if entry else None))
+    return reused, pending, indexed
+
+async def analyze_source_files(paths: List[str], stats: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract symbols from many source files, in parallel where it pays off.
+
+    Files unchanged since the last analysis are served from the analysis index. The rest
+    are parsed in batches on the process pool so the extractors run on every core; small
+    workloads stay on the thread pool to avoid the IPC round trip. Every path must have
+    an extractor registered in `app.utils.extractors`. Returns the `ModuleSymbols` dict
+    of each file by path.
+    """
+    reused, pending, indexed = await asyncio.to_thread(_plan_source_files, paths)
+    results = dict(reused)
+    stats["files_reused"] += len(reused)
+
+    if pending:
+        loop = asyncio.get_running_loop()
+        items = [(path, known_hash) for path, _, _, known_hash in pending]
+        if len(items) <= INLINE_PARSE_LIMIT:
+            pool, batch_size = executor, len(items)
+        else:
+            # Enough batches to keep every worker busy, but no more than the IPC sweet spot
+            pool = get_process_pool()
+            batch_size = max(1, min(ANALYZER_BATCH_SIZE, -(-len(items) // ANALYZER_WORKERS)))
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        with span("ast_parse") as timer:
+            parsed = await asyncio.gather(*[
+                loop.run_in_executor(pool, parse_source_files, batch) for batch in batches
+            ])
+        stats["parse_ms"] = stats.get("parse_ms", 0) + round(timer.elapsed * 1000, 1)
+
+        stat_by_path = {path: (mtime_ns, size) for path, mtime_ns, size, _ in pending}
+        rows = []
+        for path, content_hash, symbols in (item for batch in parsed for item in batch):
+            if symbols is None:
+                symbols = indexed[path][3]
+                stats["files_reused"] += 1
+            else:
+                stats["files_parsed"] += 1
+            results[path] = symbols
+            if content_hash is not None:
+                rows.append((path, *stat_by_path[path], content_hash, symbols))
+        await asyncio.to_thread(analysis_index.put_many, rows)
+
+    return results
+
+def file_detail(entry: WalkEntry, symbols: Optional[Dict[str, Any]] = None, content: Optional[str] = None) -> FileDetail:
+    """
+    Build the FileDetail of a walk entry from its `ModuleSymbols` dict, if it was parsed.
+
+    Functions and methods go to `functions`, as `ModuleSymbols.functions` returns them,
+    and classes to `classes`.
+    """
+    if entry.is_dir:
+        return FileDetail(path=entry.rel_path, type='directory')
+    if symbols is None:
+        return FileDetail(path=entry.rel_path, type='file', content=content)
+    return FileDetail(
+        path=entry.rel_path,
+        type='file',
+        content=content,
+        functions=[FunctionDetail(**f) for f in symbols["functions"] if f["kind"] != 'class'],
+        classes=[FunctionDetail(**f) for f in symbols["functions"] if f["kind"] == 'class'] or None,
+        docstring=symbols["docstring"] or None,
+        imports=symbols["imports"] or None
+    )
+
+async def iter_file_structure(
+    root_path: str,
+    max_depth: Optional[int] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    max_entries: Optional[int] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    tech_stack: Optional[TechStackDetector] = None,
+    time_budget: Optional[float] = None,
+    content_budget: Optional[ContentBudget] = None
+) -> AsyncIterator[FileDetail]:
+    """
+    Yield the project structure one FileDetail at a time as the walk progresses.
+
+    The tree is walked with `ProjectWalker` (ignore-file aware, bounded by depth, entry
+    and time budgets) in chunks of `chunk_size` entries; the source files of each chunk
+    in a supported language are analyzed together by `analyze_source_files` before the
+    chunk is yielded, so memory stays bounded by the chunk size rather than the size of
+    the repository.
+
+    If `stats` is given it is filled with the number of source files reused from the
+    analysis index (`files_reused`) and re-parsed (`files_parsed`), the time spent
+    walking (`walk_ms`) and parsing (`parse_ms`), plus the number of `entries` and
+    `partial`/`partial_reason` once the walk is complete. If `tech_stack`
+    is given, every walked file is fed to it so the stack is detected in the same pass.
+    `time_budget` overrides ANALYZER_TIME_BUDGET (background jobs use a longer one).
+    If `content_budget` is given, `content` is filled with a bounded sample of source
+    files and entry points (see `sample_contents`) until the budget is spent, and
+    `stats` gets `content_bytes`, `files_sampled` and `files_binary`.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault("files_reused", 0)
+    stats.setdefault("files_parsed", 0)
+    stats.setdefault("parse_ms", 0)
+    stats["entries"] = 0
+
+    walker = ProjectWalker(root_path, max_depth=max_depth, max_entries=max_entries, time_budget=time_budget)
+    walk = iter(walker)
+
+    walk_seconds = 0.0
+
+    def next_chunk() -> List[WalkEntry]:
+        nonlocal walk_seconds
+        start = time.perf_counter()
+        entries = list(islice(walk, chunk_size))
+        if tech_stack is not None:
+            tech_stack.observe_entries(entries)
+        walk_seconds += time.perf_counter() - start
+        return entries
+
+    if tech_stack is not None:
+        await asyncio.to_thread(tech_stack.observe_root, root_path)
+    while True:
+        entries = await asyncio.to_thread(next_chunk)
+        if not entries:
+            break
+        source_files = [entry.path for entry in entries if not entry.is_dir and get_extractor(entry.path)]
+        symbols_by_path = await analyze_source_files(source_files, stats)
+        contents = {}
+        if content_budget is not None and content_budget.remaining > 0:
+            contents = await asyncio.to_thread(sample_contents, entries, content_budget)
+
+        for entry in entries:
+            yield file_detail(entry, symbols_by_path.get(entry.path), contents.get(entry.path))
+        stats["entries"] += len(entries)
+
+    # Walk time alone, excluding parsing and the consumer's time between chunks
+    record_stage("directory_walk", walk_seconds)
+    stats["walk_ms"] = round(walk_seconds * 1000, 1)
+    stats["partial"] = walker.partial
+    stats["partial_reason"] = walker.partial_reason
+    if content_budget is not None:
+        stats["content_bytes"] = content_budget.bytes_sampled
+        stats["files_sampled"] = content_budget.files_sampled
+        stats["files_binary"] = content_budget.files_binary
+    if walker.partial:
+        print(f"Directory analysis of {root_path} is partial: {walker.partial_reason}")
+
+async def get_file_structure(
+    root_path: str,
+    max_depth: Optional[int] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    max_entries: Optional[int] = None,
+    tech_stack: Optional[TechStackDetector] = None,
+    content_budget: Optional[ContentBudget] = None
+) -> List[FileDetail]:
+    """
+    Get the structure of the project directory.
+
+    See `iter_file_structure` for the walk budgets, the keys filled into `stats`,
+    `tech_stack` detection and content sampling.
+    """
+    return [
+        detail async for detail in
+        iter_file_structure(root_path, max_depth, stats, max_entries, tech_stack=tech_stack, content_budget=content_budget)
+    ]
@@ -0,0 +1,181 @@
+import os
+import re
+import mmap
+from typing import List, Optional, Tuple
+
+# Bytes of content kept per file, and per analysis across all files. Prompts do not use
+# file content, so analyses only sample it when a budget is set
+CONTENT_SAMPLE_FILE_BYTES = int(os.getenv("CONTENT_SAMPLE_FILE_BYTES", "4096"))
+CONTENT_SAMPLE_REQUEST_BYTES = int(os.getenv("CONTENT_SAMPLE_REQUEST_BYTES", "0"))
+# How far into a large file key lines are looked for
+CONTENT_SAMPLE_SCAN_BYTES = int(os.getenv("CONTENT_SAMPLE_SCAN_BYTES", str(4 * 1024 * 1024)))
+
+# Shares of a file's budget for its first and last lines; key lines get the rest
+HEAD_SHARE = 0.5
+TAIL_SHARE = 0.2
+# Key lines longer than this are cut
+MAX_KEY_LINE_BYTES = 160
+
+# Bytes read to decide whether a file is binary
+SNIFF_BYTES = 8192
+# Share of control bytes above which a file without a known signature is binary
+BINARY_CONTROL_SHARE = 0.1
+
+BINARY_SIGNATURES = (
+    b'\x89PNG', b'GIF87a', b'GIF89a', b'\xff\xd8\xff', b'%PDF', b'PK\x03\x04', b'\x1f\x8b',
+    b'BZh', b'\xfd7zXZ', b'7z\xbc\xaf', b'Rar!', b'\x7fELF', b'MZ', b'\xca\xfe\xba\xbe',
+    b'\xcf\xfa\xed\xfe', b'\x00asm', b'SQLite format 3', b'RIFF', b'OggS', b'fLaC', b'ID3',
+    b'wOFF', b'wOF2', b'\x00\x00\x01\x00'
+)
+# Control bytes other than tab, newline, form feed and carriage return
+CONTROL_BYTES = bytes(set(range(32)) - {9, 10, 12, 13}) + b'\x7f'
+
+# Lines that say what a file does: definitions, exports, routes and entry points
+KEY_LINE = re.compile(
+    rb"^[ \t]*(?:(?:export\s+)?(?:default\s+)?(?:async\s+)?(?:def|class|function|interface|struct|enum|trait|impl)\b"
+    rb"|(?:pub(?:\([\w:]+\))?\s+)?(?:async\s+)?fn\b|func\b|module\.exports|export\b|public\b"
+    rb"|@(?:app|router|api|bp|blueprint)\.|if\s+__name__\s*==|app\.(?:get|post|put|delete|use|listen)\s*\()[^\r\n]*",
+    re.MULTILINE
+)
+
+class ContentBudget:
+    """The bytes of file content one analysis may still keep."""
+
+    __slots__ = ('remaining', 'bytes_sampled', 'files_sampled', 'files_binary')
+
+    def __init__(self, total: Optional[int] = None):
+        self.remaining = CONTENT_SAMPLE_REQUEST_BYTES if total is None else max(total, 0)
+        self.bytes_sampled = 0
+        self.files_sampled = 0
+        self.files_binary = 0
+
+    def take(self, wanted: int) -> int:
+        """Reserve up to `wanted` bytes, returning how many were granted."""
+        granted = min(wanted, self.remaining)
+        self.remaining -= granted
+        return granted
+
+    def give_back(self, unused: int):
+        self.remaining += unused
+
+def is_binary(head: bytes) -> bool:
+    """Sniff the first bytes of a file: known binary signatures, NUL bytes or mostly control bytes."""
+    if head.startswith(BINARY_SIGNATURES) or b'\x00' in head:
+        return True
+    if not head:
+        return False
+    control = len(head) - len(head.translate(None, CONTROL_BYTES))
+    return control / len(head) > BINARY_CONTROL_SHARE
+
+def _head(data: bytes) -> bytes:
+    """Cut after the last whole line, unless that would drop most of it."""
+    end = data.rfind(b'\n')
+    return data[:end + 1] if end >= len(data) // 2 else data
+
+def _tail(data: bytes) -> bytes:
+    """Cut before the first whole line, unless that would drop most of it."""
+    start = data.find(b'\n')
+    return data[start + 1:] if 0 <= start < len(data) // 2 else data
+
+def _key_lines(buffer, start: int, end: int, budget: int) -> List[bytes]:
+    """Key lines in buffer[start:end] until `budget` bytes are used, without copying the span."""
+    lines, used = [], 0
+    for match in KEY_LINE.finditer(buffer, start, end):
+        line = match.group().strip()[:MAX_KEY_LINE_BYTES]
+        if used + len(line) + 1 > budget:
+            break
+        lines.append(line)
+        used += len(line) + 1
+    return lines
+
+def _marker(omitted: int, key: bool) -> str:
+    return f"[... key lines from {omitted} omitted bytes ...]" if key else f"[... {omitted} bytes omitted ...]"
+
+KEY_END_MARKER = "[...]"
+
+def _excerpt_bytes(size: int, max_bytes: int) -> int:
+    """Bytes of the file an excerpt within `max_bytes` can hold, after markers and line breaks."""
+    # head \n marker (\n key)* \n [...] \n tail, with the omitted count at most `size`
+    return max_bytes - len(_marker(size, True)) - len(KEY_END_MARKER) - 3
+
+def _decode(data: bytes) -> str:
+    # Dropping bytes cut mid-character keeps the text within the bytes it came from
+    return data.decode('utf-8', errors='ignore')
+
+def _join(head: bytes, key: List[bytes], tail: bytes, omitted: int) -> str:
+    parts = [_decode(head).rstrip('\n'), _marker(omitted, bool(key))]
+    if key:
+        parts.extend(_decode(line) for line in key)
+        parts.append(KEY_END_MARKER)
+    parts.append(_decode(tail).lstrip('\n'))
+    return "\n".join(parts)
+
+def _excerpt(buffer, size: int, max_bytes: int) -> str:
+    """
+    Head, key lines and tail of a buffer (bytes or mmap) larger than `max_bytes`,
+    markers included within `max_bytes`. Empty when the budget cannot fit the markers.
+    """
+    available = _excerpt_bytes(size, max_bytes)
+    if available <= 0:
+        return ""
+    head = _head(buffer[:int(available * HEAD_SHARE)])
+    tail = _tail(buffer[size - int(available * TAIL_SHARE):size])
+    key_budget = available - len(head) - len(tail)
+    scan_end = min(size - len(tail), len(head) + CONTENT_SAMPLE_SCAN_BYTES)
+    key = _key_lines(buffer, len(head), scan_end, key_budget)
+    return _join(head, key, tail, size - len(head) - len(tail))
+
+def sample_file(path: str, max_bytes: int = CONTENT_SAMPLE_FILE_BYTES) -> Tuple[Optional[str], bool]:
+    """
+    Return up to `max_bytes` of a text file's content, and whether it is binary.
+
+    Files that fit are read whole. Larger files are memory-mapped (read in bounded
+    chunks where mapping fails) and reduced to their first lines, key lines (see
+    KEY_LINE) from the first CONTENT_SAMPLE_SCAN_BYTES and last lines, so memory use
+    follows `max_bytes` rather than the file size. Binary files, by signature or
+    content, and unreadable files give no content.
+    """
+    if max_bytes <= 0:
+        return None, False
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= max_bytes:
+                data = f.read(max_bytes)
+                if is_binary(data[:SNIFF_BYTES]):
+                    return None, True
+                return sample_text(data.decode('utf-8', errors='replace'), max_bytes), False
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if is_binary(mapped[:SNIFF_BYTES]):
+                        return None, True
+                    return _excerpt(mapped, size, max_bytes), False
+            except (ValueError, OSError):
+                # Some filesystems cannot be mapped: read only the head and tail
+                available = _excerpt_bytes(size, max_bytes)
+                head = f.read(max(int(available * HEAD_SHARE), SNIFF_BYTES))
+                if is_binary(head[:SNIFF_BYTES]):
+                    return None, True
+                if available <= 0:
+                    return "", False
+                head = _head(head[:int(available * HEAD_SHARE)])
+                tail_bytes = int(available * TAIL_SHARE)
+                f.seek(size - tail_bytes)
+                tail = _tail(f.read(tail_bytes))
+                return _join(head, [], tail, size - len(head) - len(tail)), False
+    except OSError as e:
+        print(f"Error sampling file {path}: {str(e)}")
+        return None, False
+
+def sample_text(text: str, max_bytes: int = CONTENT_SAMPLE_FILE_BYTES) -> str:
+    """
+    Reduce content already in memory (e.g. sent by a client) the way `sample_file`
+    would. Text within `max_bytes`, such as a sample, is returned unchanged.
+    """
+    # A character is at most four UTF-8 bytes, so short text needs no encoding
+    if len(text) * 4 <= max_bytes:
+        return text
+    data = text.encode('utf-8')
+    if len(data) <= max_bytes:
+        return text
+    return _excerpt(data, len(data), max_bytes)
@@ -0,0 +1,294 @@
+import ast
+import bisect
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional
+from app.core.models import FunctionDetail
+
+# Files larger than this are listed but not parsed for symbols
+MAX_EXTRACT_BYTES = int(os.getenv("ANALYZER_MAX_FILE_BYTES", str(1024 * 1024)))
+
+class Symbol:
+    """A function, method or class found in a source file."""
+
+    __slots__ = ('name', 'kind', 'parameters', 'return_type', 'docstring', 'calls')
+
+    def __init__(self, name: str, kind: str, parameters: List[str], return_type: Optional[str] = None, docstring: str = ""):
+        self.name = name  # Qualified with the enclosing class or function, e.g. "Client.send"
+        self.kind = kind  # "function", "async_function", "method", "async_method" or "class"
+        self.parameters = parameters  # Base classes for a class
+        self.return_type = return_type
+        self.docstring = docstring
+        self.calls: List[str] = []  # Names called from the body, in order of first call
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the symbol in FunctionDetail's shape."""
+        return {
+            "name": self.name,
+            "description": self.docstring,
+            "parameters": self.parameters,
+            "return_type": self.return_type,
+            "kind": self.kind,
+            "calls": self.calls
+        }
+
+class ModuleSymbols:
+    """Everything extracted from one source file."""
+
+    __slots__ = ('docstring', 'imports', 'symbols')
+
+    def __init__(self, docstring: str = "", imports: Optional[List[str]] = None, symbols: Optional[List[Symbol]] = None):
+        self.docstring = docstring
+        self.imports = imports if imports is not None else []
+        self.symbols = symbols if symbols is not None else []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return plain data for IPC and the analysis index."""
+        return {
+            "docstring": self.docstring,
+            "imports": self.imports,
+            "functions": [symbol.to_dict() for symbol in self.symbols]
+        }
+
+    def functions(self) -> List[FunctionDetail]:
+        """Return the functions and methods (not classes) as FunctionDetail objects."""
+        return [FunctionDetail(**symbol.to_dict()) for symbol in self.symbols if symbol.kind != 'class']
+
+Extractor = Callable[[str], ModuleSymbols]
+
+EXTRACTORS: Dict[str, Extractor] = {}
+
+def register_extractor(*extensions: str):
+    """Register a symbol extractor for the given file extensions (e.g. '.py')."""
+    def decorator(func: Extractor) -> Extractor:
+        for extension in extensions:
+            EXTRACTORS[extension] = func
+        return func
+    return decorator
+
+def get_extractor(path: str) -> Optional[Extractor]:
+    """Return the extractor for a file path, or None if its language is not supported."""
+    return EXTRACTORS.get(os.path.splitext(path)[1].lower())
+
+def extract_module(path: str, content: str) -> ModuleSymbols:
+    """Extract symbols from source code, dispatching on the file extension."""
+    extractor = get_extractor(path)
+    if extractor is None:
+        return ModuleSymbols()
+    try:
+        return extractor(content)
+    except Exception as e:
+        print(f"Error extracting symbols from {path}: {str(e)}")
+        return ModuleSymbols()
+
+# Calls recorded per symbol; enough to rank entry points without bloating the index
+MAX_CALLS_PER_SYMBOL = 32
+
+class PythonSymbolVisitor(ast.NodeVisitor):
+    """
+    Collect classes, functions, methods, imports and calls in a single traversal.
+
+    Each call is attributed to the innermost enclosing function, which gives a
+    lightweight call graph keyed by callee name.
+    """
+
+    def __init__(self):
+        self.imports: List[str] = []
+        self.symbols: List[Symbol] = []
+        self._scope: List[Symbol] = []
+
+    def _qualify(self, name: str) -> str:
+        return f"{self._scope[-1].name}.{name}" if self._scope else name
+
+    def _visit_function(self, node, is_async: bool):
+        args = node.args
+        params = [arg.arg for arg in args.posonlyargs + args.args]
+        if args.vararg:
+            params.append('*' + args.vararg.arg)
+        params.extend(arg.arg for arg in args.kwonlyargs)
+        if args.kwarg:
+            params.append('**' + args.kwarg.arg)
+
+        in_class = bool(self._scope) and self._scope[-1].kind == 'class'
+        kind = ('async_' if is_async else '') + ('method' if in_class else 'function')
+        symbol = Symbol(
+            name=self._qualify(node.name),
+            kind=kind,
+            parameters=params,
+            return_type=ast.unparse(node.returns) if node.returns else None,
+            docstring=ast.get_docstring(node) or ""
+        )
+        self.symbols.append(symbol)
+        self._scope.append(symbol)
+        self.generic_visit(node)
+        self._scope.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self._visit_function(node, is_async=False)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self._visit_function(node, is_async=True)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        symbol = Symbol(
+            name=self._qualify(node.name),
+            kind='class',
+            parameters=[ast.unparse(base) for base in node.bases],
+            docstring=ast.get_docstring(node) or ""
+        )
+        self.symbols.append(symbol)
+        self._scope.append(symbol)
+        self.generic_visit(node)
+        self._scope.pop()
+
+    def visit_Import(self, node: ast.Import):
+        self.imports.extend(alias.name for alias in node.names)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        self.imports.append('.' * node.level + (node.module or ''))
+
+    def visit_Call(self, node: ast.Call):
+        if self._scope:
+            func = node.func
+            name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+            calls = self._scope[-1].calls
+            if name and name not in calls and len(calls) < MAX_CALLS_PER_SYMBOL:
+                calls.append(name)
+        self.generic_visit(node)
+
+@register_extractor('.py', '.pyw')
+def extract_python_module(content: str) -> ModuleSymbols:
+    """Extract classes, functions, methods, imports and calls from Python source code."""
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError) as e:
+        print(f"Error parsing Python source: {str(e)}")
+        return ModuleSymbols()
+    visitor = PythonSymbolVisitor()
+    visitor.visit(tree)
+    return ModuleSymbols(ast.get_docstring(tree) or "", list(dict.fromkeys(visitor.imports)), visitor.symbols)
+
+def extract_python_functions(content: str) -> List[FunctionDetail]:
+    """Extract function information from Python source code."""
+    return extract_python_module(content).functions()
+
+def _split_params(params: str) -> List[str]:
+    """Split a parameter list on top-level commas, ignoring nested brackets and generics."""
+    parts, depth, current = [], 0, ''
+    for char in params:
+        if char in '([{<':
+            depth += 1
+        elif char in ')]}>':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+def _param_names(params: str) -> List[str]:
+    """Reduce each parameter to its first identifier, dropping types, defaults and modifiers."""
+    names = []
+    for part in _split_params(params):
+        part = re.sub(r'^(?:\.\.\.|&\s*(?:mut\s+)?|mut\s+|readonly\s+|public\s+|private\s+|protected\s+)', '', part)
+        match = re.match(r'[A-Za-z_$][\w$]*', part)
+        if match:
+            names.append(match.group(0))
+    return names
+
+def _preceding_comment(lines: List[str], index: int, prefixes) -> str:
+    """Collect the comment block directly above line `index` (line comments or a /** */ block)."""
+    collected = []
+    i = index - 1
+    if i >= 0 and lines[i].strip().endswith('*/'):
+        while i >= 0:
+            collected.append(lines[i].strip())
+            if lines[i].strip().startswith('/*'):
+                break
+            i -= 1
+        text = '\n'.join(reversed(collected))
+        text = re.sub(r'^/\*\*?|\*/$', '', text.strip())
+        return '\n'.join(line.strip().lstrip('*').strip() for line in text.splitlines()).strip()
+    while i >= 0 and lines[i].strip().startswith(prefixes):
+        collected.append(lines[i].strip())
+        i -= 1
+    return '\n'.join(re.sub(r'^(?:///?|#)\s?', '', line) for line in reversed(collected)).strip()
+
+def _extract_with_patterns(content: str, patterns, comment_prefixes) -> ModuleSymbols:
+    """
+    Scan source for symbol definitions with (kind, regex) patterns.
+
+    The patterns run over the whole content with re.MULTILINE, so signatures wrapped
+    across lines (as prettier, gofmt and rustfmt lay them out) are found. Where several
+    patterns match at the same line, the first one listed wins.
+    """
+    lines = content.split('\n')
+    line_starts = [0]
+    for line in lines:
+        line_starts.append(line_starts[-1] + len(line) + 1)
+
+    found = {}
+    for kind, pattern in patterns:
+        for match in pattern.finditer(content):
+            found.setdefault(match.start(), (kind, match))
+
+    symbols = []
+    for position in sorted(found):
+        kind, match = found[position]
+        groups = match.groupdict()
+        if groups['name'] in JS_KEYWORDS:
+            continue
+        if groups.get('receiver'):
+            kind = 'method'
+        return_type = ' '.join((groups.get('returns') or '').split()).rstrip('{').strip() or None
+        if 'async' in content[match.start():match.start('name')].split():
+            kind = 'async_' + kind
+        symbols.append(Symbol(
+            name=groups['name'],
+            kind=kind,
+            parameters=_param_names(groups.get('params') or ''),
+            return_type=return_type,
+            docstring=_preceding_comment(lines, bisect.bisect_right(line_starts, position) - 1, comment_prefixes)
+        ))
+    return ModuleSymbols(symbols=symbols)
+
+# Control-flow keywords that look like method definitions to the lexical patterns
+JS_KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'function', 'return', 'with', 'constructor'}
+
+# Type parameters, nested up to three levels, e.g. <T extends Map<string, Array<number>>>
+GENERICS = r'<(?:[^<>]|<(?:[^<>]|<[^<>]*>)*>)*>'
+
+JS_PATTERNS = [
+    # function declarations, optionally exported / async / generator
+    ('function', re.compile(r'^[ \t]*(?:export[ \t]+(?:default[ \t]+)?)?(?:async[ \t]+)?function\s*\*?\s*(?P<name>[\w$]+)\s*(?:' + GENERICS + r')?\s*\((?P<params>[^)]*)\)[ \t]*(?::[ \t]*(?P<returns>[^{=;\n]+))?', re.MULTILINE)),
+    # const name = (params) => / async function (params)
+    ('function', re.compile(r'^[ \t]*(?:export[ \t]+)?(?:const|let|var)[ \t]+(?P<name>[\w$]+)[ \t]*(?::[^=;\n]+)?=\s*(?:async\s+)?(?:function\s*\*?\s*)?\((?P<params>[^)]*)\)[ \t]*(?::[ \t]*(?P<returns>[^=>{;\n]+))?\s*(?:=>|\{)', re.MULTILINE)),
+    # class methods: name(params) {, with the body on the following lines
+    ('method', re.compile(r'^[ \t]+(?:(?:public|private|protected|static|async|readonly|override)[ \t]+)*(?P<name>[\w$]+)[ \t]*(?:' + GENERICS + r')?[ \t]*\((?P<params>[^()]*)\)[ \t]*(?::[ \t]*(?P<returns>[^{;\n]+))?[ \t]*\{[ \t]*$', re.MULTILINE)),
+]
+
+@register_extractor('.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx', '.mts', '.cts')
+def extract_javascript_module(content: str) -> ModuleSymbols:
+    """Extract functions, arrow functions and class methods from JavaScript/TypeScript."""
+    return _extract_with_patterns(content, JS_PATTERNS, ('//',))
+
+GO_PATTERNS = [
+    # Functions, and methods when a receiver is present
+    ('function', re.compile(r'^func[ \t]+(?P<receiver>\([^)]*\)[ \t]*)?(?P<name>\w+)[ \t]*(?:\[[^\]]*\])?[ \t]*\((?P<params>[^)]*)\)[ \t]*(?P<returns>[^{\n]*)', re.MULTILINE)),
+]
+
+@register_extractor('.go')
+def extract_go_module(content: str) -> ModuleSymbols:
+    """Extract functions and methods from Go source."""
+    return _extract_with_patterns(content, GO_PATTERNS, ('//',))
+
+RUST_PATTERNS = [
+    ('function', re.compile(r'^[ \t]*(?:pub(?:\([^)]*\))?[ \t]+)?(?:default[ \t]+)?(?:const[ \t]+)?(?:async[ \t]+)?(?:unsafe[ \t]+)?(?:extern[ \t]+"[^"]*"[ \t]+)?fn[ \t]+(?P<name>\w+)\s*(?:' + GENERICS + r')?\s*\((?P<params>[^)]*)\)\s*(?:->\s*(?P<returns>[^{;]+?))?\s*(?:\bwhere\b[^{;]*)?[{;]', re.MULTILINE)),
+]
+
+@register_extractor('.rs')
+def extract_rust_module(content: str) -> ModuleSymbols:
+    """Extract free functions and methods from Rust source."""
+    return _extract_with_patterns(content, RUST_PATTERNS, ('///', '//!'))
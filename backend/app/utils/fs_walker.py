@@ -0,0 +1,215 @@
+import os
+import re
+import time
+from typing import List, Optional, Iterator, Tuple
+
+# Directories that are never worth descending into, on top of ignore-file rules
+DEFAULT_SKIP_DIRS = {'venv', 'env', '__pycache__', 'node_modules'}
+
+DEFAULT_MAX_DEPTH = int(os.getenv("ANALYZER_MAX_DEPTH", "10"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("ANALYZER_MAX_ENTRIES", "20000"))
+DEFAULT_TIME_BUDGET = float(os.getenv("ANALYZER_TIME_BUDGET", "60"))
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob into a regex over '/'-separated relative paths."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            out.append('/.*')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif char == '*':
+            out.append('[^/]*')
+            i += 1
+        elif char == '?':
+            out.append('[^/]')
+            i += 1
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end + 1
+        elif char == '\\' and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(char))
+            i += 1
+    return ''.join(out)
+
+class IgnorePattern:
+    """A single compiled gitignore-style pattern."""
+
+    __slots__ = ('base', 'regex', 'negated', 'dir_only')
+
+    def __init__(self, line: str, base: str = '', anchored: bool = False):
+        self.base = base
+        self.negated = line.startswith('!')
+        if self.negated:
+            line = line[1:]
+        self.dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        # A slash anywhere but the end anchors the pattern to the ignore file's directory
+        if anchored or '/' in line:
+            regex = _glob_to_regex(line.lstrip('/'))
+        else:
+            regex = '(?:.*/)?' + _glob_to_regex(line)
+        self.regex = re.compile(regex + '$')
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+def parse_ignore_file(path: str, base: str = '', anchored: bool = False) -> List[IgnorePattern]:
+    """Read an ignore file into patterns; unreadable files contribute nothing."""
+    patterns = []
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.rstrip('\n').rstrip()
+                if not line or line.startswith('#'):
+                    continue
+                if line.startswith('\\#') or line.startswith('\\!'):
+                    line = line[1:]
+                patterns.append(IgnorePattern(line, base, anchored))
+    except OSError:
+        pass
+    return patterns
+
+class WalkEntry:
+    """A file or directory discovered by the walker."""
+
+    __slots__ = ('rel_path', 'path', 'is_dir', 'size')
+
+    def __init__(self, rel_path: str, path: str, is_dir: bool, size: int = 0):
+        self.rel_path = rel_path
+        self.path = path
+        self.is_dir = is_dir
+        self.size = size  # Bytes, for files
+
+class ProjectWalker:
+    """
+    Depth-first project walker built on os.scandir.
+
+    Entries are yielded in sorted, pre-order sequence as they are discovered. Hidden
+    entries, DEFAULT_SKIP_DIRS and anything matched by .gitignore (at any level) or the
+    root .dockerignore are pruned. When a depth, entry or time budget cuts the walk
+    short, `partial` is set and `partial_reason` names the budget that was hit.
+    """
+
+    def __init__(
+        self,
+        root_path: str,
+        max_depth: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        time_budget: Optional[float] = None
+    ):
+        self.root_path = os.path.abspath(root_path)
+        self.max_depth = DEFAULT_MAX_DEPTH if max_depth is None else max_depth
+        self.max_entries = DEFAULT_MAX_ENTRIES if max_entries is None else max_entries
+        self.time_budget = DEFAULT_TIME_BUDGET if time_budget is None else time_budget
+        self.partial = False
+        self.partial_reason: Optional[str] = None
+        self.entry_count = 0
+
+    def _mark_partial(self, reason: str):
+        if not self.partial:
+            self.partial = True
+            self.partial_reason = reason
+
+    def _is_ignored(self, rules: List[IgnorePattern], rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        # Later patterns override earlier ones, so the last match decides
+        for pattern in rules:
+            if pattern.matches(rel_path, is_dir):
+                ignored = not pattern.negated
+        return ignored
+
+    def _scan(self, path: str) -> List[os.DirEntry]:
+        try:
+            with os.scandir(path) as it:
+                return sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"Error processing directory {path}: {str(e)}")
+            return []
+
+    def _has_entries(self, path: str) -> bool:
+        try:
+            with os.scandir(path) as it:
+                return next(it, None) is not None
+        except OSError:
+            return False
+
+    def __iter__(self) -> Iterator[WalkEntry]:
+        deadline = time.monotonic() + self.time_budget
+        root_rules = parse_ignore_file(os.path.join(self.root_path, '.dockerignore'), anchored=True)
+        # Each stack frame is (directory entries, next index, rel dir path, depth, rules)
+        stack: List[Tuple[List[os.DirEntry], int, str, int, List[IgnorePattern]]] = []
+
+        def push(path: str, rel_dir: str, depth: int, rules: List[IgnorePattern]):
+            entries = self._scan(path)
+            if any(entry.name == '.gitignore' for entry in entries):
+                rules = rules + parse_ignore_file(os.path.join(path, '.gitignore'), rel_dir)
+            stack.append((entries, 0, rel_dir, depth, rules))
+
+        push(self.root_path, '', 0, root_rules)
+        while stack:
+            entries, index, rel_dir, depth, rules = stack[-1]
+            if index >= len(entries):
+                stack.pop()
+                continue
+            stack[-1] = (entries, index + 1, rel_dir, depth, rules)
+
+            entry = entries[index]
+            name = entry.name
+            if name.startswith('.') or name in DEFAULT_SKIP_DIRS:
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if self._is_ignored(rules, rel_path, is_dir):
+                continue
+
+            if self.entry_count >= self.max_entries:
+                self._mark_partial("max_entries")
+                return
+            if time.monotonic() > deadline:
+                self._mark_partial("time_budget")
+                return
+
+            size = 0
+            if not is_dir:
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    pass
+
+            self.entry_count += 1
+            yield WalkEntry(rel_path.replace('/', os.sep), entry.path, is_dir, size)
+
+            if is_dir:
+                if depth >= self.max_depth:
+                    if not self.partial and self._has_entries(entry.path):
+                        self._mark_partial("max_depth")
+                elif not entry.is_symlink():
+                    push(entry.path, rel_path, depth + 1, rules)
@@ -0,0 +1,378 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from app.utils.metrics import registry
+from app.utils.rate_limiter import priority_scope, PRIORITY_BATCH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_STORE_PATH = Path(__file__).parent.parent.parent / ".cache" / "jobs.sqlite3"
+
+QUEUED = "queued"
+RUNNING = "running"
+CANCELLING = "cancelling"  # Cancel requested while running; not persisted
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+JOBS = registry.counter("jobs_total", "Background jobs by kind and final status.")
+JOB_SECONDS = registry.histogram(
+    "job_duration_seconds",
+    "Time background jobs spent running, by kind.",
+    buckets=(0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+)
+
+class JobQueueFull(Exception):
+    """Raised by `JobManager.submit` when `max_queued` jobs are already waiting."""
+
+class Job:
+    """
+    A unit of background work and its observable state.
+
+    Handlers report progress with `report`; every update is also pushed to the
+    subscribers streaming the job's events.
+    """
+
+    __slots__ = (
+        'id', 'kind', 'params', 'status', 'progress', 'result', 'error',
+        'created_at', 'started_at', 'finished_at', '_subscribers', '_task'
+    )
+
+    def __init__(self, kind: str, params: Dict[str, Any], job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = QUEUED
+        self.progress: Dict[str, Any] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._subscribers: List[asyncio.Queue] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def report(self, **progress):
+        """Merge progress fields (e.g. `stage`, `entries`) and notify subscribers."""
+        self.progress.update(progress)
+        self._publish("progress", dict(self.progress))
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+    def _publish(self, event: str, data: Dict[str, Any]):
+        for queue in self._subscribers:
+            queue.put_nowait((event, data))
+
+class JobStore:
+    """
+    SQLite persistence for jobs, so results survive the request that submitted them
+    and unfinished jobs survive a restart.
+
+    Rows are written on every status change, not on progress updates.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or DEFAULT_JOB_STORE_PATH)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, params TEXT NOT NULL, "
+                "progress TEXT NOT NULL, result TEXT, error TEXT, created_at REAL NOT NULL, "
+                "started_at REAL, finished_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+            self._conn.commit()
+        return self._conn
+
+    def save(self, job: Job):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs "
+                "(id, kind, status, params, progress, result, error, created_at, started_at, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id, job.kind, job.status, json.dumps(job.params), json.dumps(job.progress),
+                    json.dumps(job.result) if job.result is not None else None, job.error,
+                    job.created_at, job.started_at, job.finished_at
+                )
+            )
+            conn.commit()
+
+    def _from_row(self, row) -> Job:
+        job = Job(row[1], json.loads(row[3]), job_id=row[0])
+        job.status = row[2]
+        job.progress = json.loads(row[4])
+        job.result = json.loads(row[5]) if row[5] is not None else None
+        job.error = row[6]
+        job.created_at, job.started_at, job.finished_at = row[7], row[8], row[9]
+        return job
+
+    def load(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT id, kind, status, params, progress, result, error, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def unfinished(self) -> List[Job]:
+        """Jobs that were queued or running when the previous process stopped, oldest first."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id, kind, status, params, progress, result, error, created_at, started_at, finished_at "
+                "FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def prune(self, ttl_seconds: float) -> int:
+        """Delete finished jobs older than `ttl_seconds`."""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - ttl_seconds,)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+JobHandler = Callable[[Dict[str, Any], Job], Awaitable[Any]]
+
+class JobManager:
+    """
+    Run submitted jobs on a bounded pool of worker tasks.
+
+    `submit` returns as soon as the job is persisted and queued; at most `workers`
+    jobs run at once, in submission order, with their LLM calls admitted at batch
+    priority so interactive requests go first. Unfinished jobs are picked up again
+    when the manager starts after a restart, and finished jobs are kept for
+    `ttl_seconds`. Cancelling a running job waits up to `cancel_wait` seconds for it
+    to stop.
+
+    Workers are started lazily on first use, on the running event loop.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 4,
+        max_queued: int = 1000,
+        ttl_seconds: float = 24 * 3600,
+        cancel_wait: float = 5.0
+    ):
+        self.store = store
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.ttl_seconds = ttl_seconds
+        self.cancel_wait = cancel_wait
+        self._handlers: Dict[str, JobHandler] = {}
+        self._jobs: Dict[str, Job] = {}  # Unfinished jobs; finished ones are read from the store
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+
+    @classmethod
+    def from_env(cls) -> "JobManager":
+        """Create a manager configured from JOB_* environment variables."""
+        return cls(
+            JobStore(os.getenv("JOB_STORE_PATH")),
+            workers=int(os.getenv("JOB_WORKERS", "4")),
+            max_queued=int(os.getenv("JOB_QUEUE_MAX", "1000")),
+            ttl_seconds=float(os.getenv("JOB_RESULT_TTL", str(24 * 3600))),
+            cancel_wait=float(os.getenv("JOB_CANCEL_WAIT", "5"))
+        )
+
+    def register(self, kind: str, handler: JobHandler):
+        """Register the coroutine that runs jobs of `kind`; it returns the JSON-serializable result."""
+        self._handlers[kind] = handler
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": sum(job.status == QUEUED for job in self._jobs.values()),
+            "running": sum(job.status in (RUNNING, CANCELLING) for job in self._jobs.values()),
+            "workers": self.workers
+        }
+
+    async def _ensure_started(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._queue is not None:
+                return
+            self._queue = asyncio.Queue()
+            try:
+                await asyncio.to_thread(self.store.prune, self.ttl_seconds)
+                unfinished = await asyncio.to_thread(self.store.unfinished)
+            except sqlite3.Error as e:
+                logger.warning(f"Job store read failed: {e}")
+                unfinished = []
+            for job in unfinished:
+                if job.kind not in self._handlers:
+                    continue
+                logger.info(f"Resuming {job.kind} job {job.id} after restart")
+                job.status = QUEUED
+                self._jobs[job.id] = job
+                self._queue.put_nowait(job)
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _save(self, job: Job):
+        try:
+            await asyncio.to_thread(self.store.save, job)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Job store write failed for {job.id}: {e}")
+
+    async def submit(self, kind: str, params: Dict[str, Any]) -> Job:
+        """Persist and queue a job, returning it without waiting for it to run."""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        await self._ensure_started()
+        if self.stats()["queued"] >= self.max_queued:
+            raise JobQueueFull(f"{self.max_queued} jobs are already queued")
+        job = Job(kind, params)
+        self._jobs[job.id] = job
+        await self._save(job)
+        self._queue.put_nowait(job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        await self._ensure_started()
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        try:
+            return await asyncio.to_thread(self.store.load, job_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Job store read failed: {e}")
+            return None
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job; finished jobs are returned unchanged.
+
+        A running job is given `cancel_wait` seconds to stop. One still stopping after
+        that (e.g. waiting on a thread) is returned as "cancelling".
+        """
+        job = await self.get(job_id)
+        if job is None or job.done:
+            return job
+        if job._task is not None:
+            job.status = CANCELLING
+            job._task.cancel()
+            await asyncio.wait([job._task], timeout=self.cancel_wait)
+        else:
+            # Still queued: the worker skips it when it comes up
+            await self._finish(job, CANCELLED)
+        return job
+
+    async def events(self, job_id: str) -> AsyncIterator[tuple]:
+        """
+        Yield `(event, data)` pairs for a job: its current state as `status`, then
+        `progress` updates as they are reported, and finally the finished job (with
+        its result) as `done`.
+        """
+        job = await self.get(job_id)
+        if job is None:
+            return
+        yield "status", job.to_dict(include_result=False)
+        if not job.done:
+            queue: asyncio.Queue = asyncio.Queue()
+            job._subscribers.append(queue)
+            try:
+                while True:
+                    event, data = await queue.get()
+                    if event == "done":
+                        break
+                    yield event, data
+            finally:
+                job._subscribers.remove(queue)
+        yield "done", job.to_dict()
+
+    async def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        JOBS.inc(kind=job.kind, status=status)
+        if job.started_at is not None:
+            JOB_SECONDS.observe(job.finished_at - job.started_at, kind=job.kind)
+        await self._save(job)
+        self._jobs.pop(job.id, None)
+        job._publish("done", {})
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            if job.done:  # Cancelled while queued
+                continue
+            job.status = RUNNING
+            job.started_at = time.time()
+            await self._save(job)
+            job._task = asyncio.create_task(self._run(job))
+            # Cancelling the worker on shutdown cancels the job with it
+            await job._task
+
+    async def _run(self, job: Job):
+        try:
+            with priority_scope(PRIORITY_BATCH):
+                result = await self._handlers[job.kind](job.params, job)
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Left as running in the store, so it resumes after restart
+                raise
+            await self._finish(job, CANCELLED)
+            return
+        except Exception as e:
+            # HTTPException carries its message in `detail`
+            error = str(getattr(e, "detail", None) or e)
+            logger.error(f"{job.kind} job {job.id} failed: {error}")
+            await self._finish(job, FAILED, error=error)
+            return
+        await self._finish(job, SUCCEEDED, result=result)
+
+    async def shutdown(self):
+        """Stop the workers; jobs still queued or running are resumed on the next start."""
+        self._stopping = True
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._jobs.clear()
+        self._queue = None
+        self._start_lock = None
+        self._stopping = False
+
+# Create a singleton instance
+job_manager = JobManager.from_env()
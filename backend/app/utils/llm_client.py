@@ -0,0 +1,173 @@
+import os
+import json
+import random
+import asyncio
+import logging
+import httpx
+from typing import Dict, Any, AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upstream statuses that are worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class LLMAPIError(Exception):
+    """Raised when the LLM backend returns an error response."""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"LLM API error: {status_code} - {message}")
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = retry_after  # Seconds, from the Retry-After header if any
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Return the Retry-After header in seconds, if present and numeric."""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+class LLMClient:
+    """
+    Async HTTP client for OpenAI-compatible chat completion APIs.
+
+    A single pooled httpx.AsyncClient is shared by all requests so connections are kept
+    alive between calls, a semaphore caps the number of in-flight upstream requests, and
+    429/5xx responses are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        max_concurrency: int = 10,
+        timeout: float = 120.0,
+        connect_timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        verify: bool = True
+    ):
+        self.api_url = api_url
+        self.headers = headers or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._verify = verify
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_env(cls, api_url: str, headers: Optional[Dict[str, str]] = None) -> "LLMClient":
+        """Create a client configured from LLM_* environment variables."""
+        return cls(
+            api_url,
+            headers=headers,
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "10")),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "10")),
+            timeout=float(os.getenv("LLM_TIMEOUT", "120")),
+            connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT", "10")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+            # Certificates are verified unless explicitly turned off, e.g. for a self-signed local server
+            verify=os.getenv("LLM_VERIFY_SSL", "true").lower() != "false"
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                limits=self._limits,
+                timeout=self._timeout,
+                verify=self._verify
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than a Retry-After hint."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        retry_after = parse_retry_after(response) if response is not None else None
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    async def chat(self, payload: Dict[str, Any], url: Optional[str] = None) -> Dict[str, Any]:
+        """Send a completion request (to `url`, default the chat endpoint) and return the decoded JSON response."""
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await self.client.post(url or self.api_url, json=payload)
+                except httpx.TransportError as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff_delay(attempt)
+                    logger.warning(f"LLM request failed ({e!r}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    raise LLMAPIError(response.status_code, response.text, parse_retry_after(response))
+
+                delay = self._backoff_delay(attempt, response)
+                logger.warning(f"LLM API returned {response.status_code}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def stream_chat(self, payload: Dict[str, Any], usage: Optional[Dict[str, int]] = None) -> AsyncIterator[str]:
+        """
+        Send a streaming chat completion request and yield content deltas.
+
+        Retries only happen before the first byte is consumed; once tokens have been
+        yielded a failure is raised to the caller. If `usage` is given it is updated
+        with the token usage reported in the stream (OpenAI's `usage` or Groq's
+        `x_groq.usage` on the final chunk).
+        """
+        started = False
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with self.client.stream("POST", self.api_url, json=payload) as response:
+                        if response.status_code != 200:
+                            body = (await response.aread()).decode(errors="replace")
+                            if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                                raise LLMAPIError(response.status_code, body, parse_retry_after(response))
+                            delay = self._backoff_delay(attempt, response)
+                            logger.warning(f"LLM API returned {response.status_code}, retrying in {delay:.2f}s")
+                        else:
+                            # OpenAI-style streams are server-sent events: "data: {json}" lines ending with "data: [DONE]"
+                            async for line in response.aiter_lines():
+                                if not line.startswith("data:"):
+                                    continue
+                                data = line[len("data:"):].strip()
+                                if data == "[DONE]":
+                                    break
+                                chunk = json.loads(data)
+                                chunk_usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+                                if usage is not None and chunk_usage:
+                                    usage.update(chunk_usage)
+                                if not chunk.get("choices"):
+                                    continue
+                                delta = chunk["choices"][0].get("delta", {}).get("content")
+                                if delta:
+                                    started = True
+                                    yield delta
+                            return
+                except httpx.TransportError as e:
+                    if started or attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff_delay(attempt)
+                    logger.warning(f"LLM stream failed ({e!r}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
@@ -0,0 +1,239 @@
+import os
+import asyncio
+import contextvars
+import logging
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from app.utils.llm_client import LLMClient, LLMAPIError
+from app.utils.metrics import record_token_usage
+
+logger = logging.getLogger(__name__)
+
+class LLMProvider:
+    """Base class for chat completion backends used by TextGenerator."""
+
+    name = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    async def complete(self, payload: Dict[str, Any]) -> str:
+        """Run a chat completion payload and return the generated text."""
+        raise NotImplementedError
+
+    def stream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """Run a streaming chat completion payload, yielding text deltas."""
+        raise NotImplementedError
+
+    async def aclose(self):
+        """Release any pooled resources."""
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Provider for servers implementing the OpenAI chat completions API, such as Groq."""
+
+    name = "openai"
+
+    def __init__(self, api_url: str, model: str, api_key: Optional[str] = None):
+        super().__init__(model)
+        self.api_url = api_url
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        self.client = LLMClient.from_env(api_url, headers=headers)
+
+    async def complete(self, payload: Dict[str, Any]) -> str:
+        text, usage = await self._chat(payload)
+        record_token_usage(self.name, usage)
+        return text
+
+    async def _chat(self, payload: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, int]]]:
+        """Run a chat completion payload and return the text and its usage, without recording it."""
+        response_data = await self.client.chat(payload)
+        if "choices" not in response_data or not response_data["choices"]:
+            raise Exception(f"Invalid response format from {self.name} API")
+        return response_data["choices"][0]["message"]["content"], response_data.get("usage")
+
+    async def stream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        usage: Dict[str, int] = {}
+        async for delta in self.client.stream_chat(payload, usage=usage):
+            yield delta
+        record_token_usage(self.name, usage)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+class GroqProvider(OpenAICompatibleProvider):
+    name = "groq"
+
+def messages_to_prompt(messages: List[Dict[str, str]]) -> str:
+    """
+    Flatten chat messages into a plain completion prompt.
+
+    Used for batched requests to the completions endpoint, which takes raw prompts
+    rather than messages, so the server's chat template is not applied.
+    """
+    parts = [f"{message['role'].capitalize()}: {message['content']}" for message in messages]
+    return "\n\n".join(parts) + "\n\nAssistant:"
+
+def split_usage(usage: Optional[Dict[str, int]], prompts: List[str], texts: List[str]) -> List[Optional[Dict[str, int]]]:
+    """
+    Share the usage of a batched request between its prompts.
+
+    The completions endpoint reports one total for the batch, so prompt tokens are
+    shared by prompt length and completion tokens by completion length. Rounding is
+    given to the last prompt, so the shares add up to the total.
+    """
+    if not usage:
+        return [None] * len(prompts)
+    shares: List[Dict[str, int]] = [{} for _ in prompts]
+    for kind, lengths in (("prompt", [len(p) for p in prompts]), ("completion", [len(t) for t in texts])):
+        total = usage.get(f"{kind}_tokens") or 0
+        weight = sum(lengths)
+        left = total
+        for index, length in enumerate(lengths):
+            if index == len(lengths) - 1:
+                tokens = left
+            else:
+                tokens = total * length // weight if weight else total // len(lengths)
+            shares[index][f"{kind}_tokens"] = tokens
+            left -= tokens
+    return shares
+
+class LocalProvider(OpenAICompatibleProvider):
+    """
+    Provider for a local inference server (Ollama or llama.cpp) on CPU or GPU.
+
+    Both servers expose OpenAI-compatible endpoints. When `batch_size` is above one,
+    concurrent non-streaming requests are queued for up to `batch_window` seconds and
+    sent as a single completions request with a list of prompts, which llama.cpp's
+    server decodes together in one batch. If the server rejects list prompts, the
+    provider falls back to one chat request per prompt.
+
+    Batches run in a task of their own, outside any caller's context. Each request's
+    share of the usage (see `split_usage`) comes back with its text and is recorded
+    by the caller, so it lands in the caller's `usage_scope`.
+    """
+
+    name = "local"
+
+    def __init__(self, base_url: str, model: str, batch_size: int = 1, batch_window: float = 0.02):
+        base_url = base_url.rstrip("/")
+        super().__init__(f"{base_url}/chat/completions", model)
+        self.completions_url = f"{base_url}/completions"
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._batches = set()
+
+    async def complete(self, payload: Dict[str, Any]) -> str:
+        if self.batch_size <= 1:
+            return await super().complete(payload)
+
+        if self._batcher is None or self._batcher.done():
+            self._queue = asyncio.Queue()
+            # A fresh context, so the batcher does not inherit the first caller's usage scope or priority
+            self._batcher = asyncio.create_task(self._run_batcher(), context=contextvars.Context())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, future))
+        text, usage = await future
+        record_token_usage(self.name, usage)
+        return text
+
+    async def _run_batcher(self):
+        """Collect queued requests into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Only requests with identical sampling parameters can share a forward pass
+            groups: Dict[Tuple, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+            for payload, future in batch:
+                key = tuple(sorted((k, v) for k, v in payload.items() if k not in ("messages", "stream")))
+                groups.setdefault(key, []).append((payload, future))
+            for group in groups.values():
+                task = asyncio.create_task(self._complete_batch(group))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+
+    async def _complete_batch(self, group: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        if len(group) == 1 or self.batch_size <= 1:
+            await asyncio.gather(*[self._complete_single(payload, future) for payload, future in group])
+            return
+
+        payload = {k: v for k, v in group[0][0].items() if k not in ("messages", "stream")}
+        prompts = [messages_to_prompt(p["messages"]) for p, _ in group]
+        payload["prompt"] = prompts
+        try:
+            response_data = await self.client.chat(payload, url=self.completions_url)
+            texts = {choice["index"]: choice["text"] for choice in response_data["choices"]}
+            if len(texts) != len(group):
+                raise LLMAPIError(400, f"expected {len(group)} choices, got {len(texts)}")
+        except LLMAPIError as e:
+            if e.status_code in (400, 404, 422):
+                logger.warning(f"Local server does not support batched prompts ({e}); disabling batching")
+                self.batch_size = 1
+                await asyncio.gather(*[self._complete_single(p, future) for p, future in group])
+                return
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except Exception as e:
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.info(f"Completed batch of {len(group)} prompts on local model {self.model}")
+        ordered = [texts[index] for index in range(len(group))]
+        usages = split_usage(response_data.get("usage"), prompts, ordered)
+        for (_, future), text, usage in zip(group, ordered, usages):
+            if not future.done():
+                future.set_result((text, usage))
+
+    async def _complete_single(self, payload: Dict[str, Any], future: asyncio.Future):
+        try:
+            result = await self._chat(payload)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def aclose(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+            self._batcher = None
+        await super().aclose()
+
+def create_provider() -> LLMProvider:
+    """Create the provider selected by LLM_PROVIDER ("groq" or "local")."""
+    provider = os.getenv("LLM_PROVIDER", "groq").lower()
+    if provider == "local":
+        return LocalProvider(
+            base_url=os.getenv("LOCAL_LLM_URL", "http://localhost:11434/v1"),
+            model=os.getenv("LOCAL_LLM_MODEL", "mistral"),
+            batch_size=int(os.getenv("LOCAL_LLM_BATCH_SIZE", "1")),
+            batch_window=float(os.getenv("LOCAL_LLM_BATCH_WINDOW_MS", "20")) / 1000
+        )
+    if provider == "groq":
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY environment variable is not set")
+        # GROQ_API_URL can point at any OpenAI-compatible server (e.g. a local stub)
+        return GroqProvider(
+            api_url=os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions"),
+            model=os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
+            api_key=api_key
+        )
+    raise ValueError(f"Unknown LLM_PROVIDER: {provider}")
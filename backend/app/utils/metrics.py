@@ -0,0 +1,218 @@
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from sub-millisecond parsing up to slow model calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Counter:
+    """A monotonically increasing count, per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in values]
+
+class Histogram:
+    """Observations counted into cumulative buckets, per label set."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: (count per bucket plus +Inf, sum)
+        self._values: Dict[LabelKey, Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+            cumulative += counts[-1]
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {repr(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Holds the process's metrics and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, documentation, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+# Create a singleton instance
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "readme_stage_duration_seconds",
+    "Time spent in each stage of analysis and README generation."
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to send the complete HTTP response, by route."
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total",
+    "Tokens used by upstream LLM calls, as reported by the provider."
+)
+
+class Span:
+    """A running timer for one stage; `elapsed` is final once the block exits."""
+
+    __slots__ = ('stage', 'start', 'elapsed')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+    def lap(self) -> float:
+        """Seconds since the span started."""
+        return time.perf_counter() - self.start
+
+@contextmanager
+def span(stage: str, **labels) -> Iterator[Span]:
+    """Time a block as a stage of the pipeline and record it in STAGE_SECONDS."""
+    current = Span(stage)
+    try:
+        yield current
+    finally:
+        current.elapsed = current.lap()
+        STAGE_SECONDS.observe(current.elapsed, stage=stage, **labels)
+        logger.debug(f"span stage={stage} duration_ms={current.elapsed * 1000:.1f}")
+
+def record_stage(stage: str, seconds: float, **labels):
+    """Record a stage duration measured elsewhere (e.g. accumulated over a walk)."""
+    STAGE_SECONDS.observe(seconds, stage=stage, **labels)
+    logger.debug(f"span stage={stage} duration_ms={seconds * 1000:.1f}")
+
+# Token usage of the calls made in the current context, see `usage_scope`
+_usage: ContextVar[Optional[Dict[str, int]]] = ContextVar("llm_usage", default=None)
+
+@contextmanager
+def usage_scope() -> Iterator[Dict[str, int]]:
+    """
+    Collect the token usage recorded by calls inside the block (and tasks it starts).
+
+    Usage collected by a nested scope is added to the enclosing one when it exits.
+    """
+    parent = _usage.get()
+    usage: Dict[str, int] = {}
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+        if parent is not None:
+            for kind, tokens in usage.items():
+                parent[kind] = parent.get(kind, 0) + tokens
+
+def record_token_usage(provider: str, usage: Optional[Dict[str, int]]):
+    """Count prompt and completion tokens from an OpenAI-style `usage` object."""
+    if not usage:
+        return
+    scope = _usage.get()
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens")
+        if tokens:
+            LLM_TOKENS.inc(tokens, provider=provider, type=kind)
+            if scope is not None:
+                scope[kind] = scope.get(kind, 0) + tokens
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording HTTP_REQUEST_SECONDS per route template.
+
+    Durations run until the last body chunk is sent, so streaming responses are timed
+    in full. Requests are labelled by route template rather than raw path to keep the
+    label set bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                route = scope.get("route")
+                HTTP_REQUEST_SECONDS.observe(
+                    time.perf_counter() - start,
+                    method=scope["method"],
+                    route=getattr(route, "path", "unmatched"),
+                    status=status["code"]
+                )
+
+        await self.app(scope, receive, send_and_record)
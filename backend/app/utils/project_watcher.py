@@ -0,0 +1,491 @@
+import os
+import time
+import errno
+import ctypes
+import ctypes.util
+import asyncio
+import struct
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.core.models import FileDetail
+from app.utils.code_analyzer import analyze_source_files, file_detail, sample_contents
+from app.utils.content_sampler import ContentBudget
+from app.utils.extractors import get_extractor
+from app.utils.fs_walker import ProjectWalker, WalkEntry
+from app.utils.tech_stack import TechStackDetector
+from app.utils.single_flight import SingleFlight
+from app.utils.metrics import registry
+
+# inotify(7) flags
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+# Ignore files change which entries the walker keeps, so they force a full rescan
+IGNORE_FILES = {'.gitignore', '.dockerignore'}
+
+WATCH_UPDATES = registry.counter(
+    "readme_live_analysis_updates_total",
+    "Live analysis model updates, by kind: a rescan of the tree or an update of changed files."
+)
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1  # Not every libc has inotify
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+_libc = _load_libc() if os.name == 'posix' else None
+
+class InotifyWatcher:
+    """
+    A non-blocking inotify instance with one watch per project directory.
+
+    inotify is not recursive, so every directory the walker keeps is watched; events
+    are returned as paths relative to the project root.
+    """
+
+    def __init__(self):
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self.fd = fd
+        self._dirs: Dict[int, str] = {}  # Watch descriptor to directory, relative to the root
+        self._watched: Set[str] = set()
+
+    @staticmethod
+    def available() -> bool:
+        return _libc is not None
+
+    def watch(self, path: str, rel_dir: str) -> bool:
+        """Watch a directory; returns False when the watch limit is reached."""
+        if rel_dir in self._watched:
+            return True
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code == errno.ENOSPC:
+                return False
+            # The directory went away in the meantime; the next rescan drops it
+            return True
+        self._dirs[wd] = rel_dir
+        self._watched.add(rel_dir)
+        return True
+
+    def read_events(self) -> List[Tuple[str, int]]:
+        """Drain the queued events as (path relative to the root, mask) pairs."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    events.append(('', IN_Q_OVERFLOW))
+                    continue
+                rel_dir = self._dirs.get(wd)
+                if mask & IN_IGNORED:
+                    # The directory was deleted or moved; the kernel dropped the watch
+                    self._watched.discard(self._dirs.pop(wd, None))
+                    continue
+                if rel_dir is None:
+                    continue
+                events.append((os.path.join(rel_dir, name) if name else rel_dir, mask))
+
+    def close(self):
+        os.close(self.fd)
+
+class LiveProject:
+    """
+    An in-memory analysis of one project, kept current from filesystem events.
+
+    The project is walked and parsed once. After that, inotify events (or, where
+    inotify is unavailable, a rescan every `poll_interval` seconds) update the model:
+    changed files are re-stat'ed and re-parsed, deleted ones dropped. New files and
+    directories, ignore-file edits and event queue overflows trigger a rescan, which
+    re-walks the tree but still re-parses only files whose size or mtime changed.
+    `snapshot` then answers from the model without walking the tree.
+    """
+
+    def __init__(self, root: str, backend: str = "auto", poll_interval: float = 2.0, debounce: float = 0.2):
+        self.root = root
+        self.backend = "inotify" if backend in ("auto", "inotify") and InotifyWatcher.available() else "poll"
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.partial = False  # Whether the last walk hit a budget (see ProjectWalker)
+        self.partial_reason: Optional[str] = None
+        self.updates = 0
+        self.files_parsed = 0  # Re-parsed since the last snapshot
+        self.updated_at = 0.0
+        self._entries: Dict[str, WalkEntry] = {}  # By relative path, in walk order
+        self._stamps: Dict[str, Tuple[int, int]] = {}  # mtime_ns and size of each file
+        self._details: Dict[str, FileDetail] = {}
+        self._samples: Dict[str, Tuple[int, Optional[str], bool]] = {}  # See sample_contents
+        self._excluded: Set[str] = set()  # New paths the last rescan did not keep (ignored files)
+        self._detector = TechStackDetector()
+        self._dirty: Set[str] = set()  # Known files to re-stat
+        self._created: Set[str] = set()  # Unknown paths that were created
+        self._rescan = False
+        self._lock = asyncio.Lock()
+        self._watcher: Optional[InotifyWatcher] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def start(self):
+        """Analyze the project and start following changes to it."""
+        async with self._lock:
+            await self._rescan_tree()
+        if self.partial:
+            return
+        loop = asyncio.get_running_loop()
+        if self.backend == "inotify":
+            try:
+                self._watcher = InotifyWatcher()
+                if self._watch_directories():
+                    loop.add_reader(self._watcher.fd, self._on_readable)
+                    return
+            except OSError as e:
+                print(f"inotify unavailable for {self.root}, polling instead: {str(e)}")
+            self._fall_back_to_polling()
+        else:
+            self._poll_task = asyncio.ensure_future(self._poll())
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "updates": self.updates,
+            "updated_at": self.updated_at,
+            "entries": len(self._entries)
+        }
+
+    async def snapshot(self, content_budget: Optional[ContentBudget] = None) -> Tuple[List[FileDetail], TechStackDetector, Dict[str, Any]]:
+        """
+        Return the current file structure, tech stack and analysis stats, applying any
+        pending changes first. The stats have the keys `iter_file_structure` fills.
+        """
+        start = time.perf_counter()
+        await self.refresh()
+        async with self._lock:
+            entries = list(self._entries.values())
+            details = list(self._details.values())
+            stats = {
+                "entries": len(entries),
+                "files_reused": sum(1 for entry in entries if not entry.is_dir and get_extractor(entry.path)),
+                "files_parsed": self.files_parsed,
+                "walk_ms": 0.0,
+                "parse_ms": 0.0,
+                "partial": self.partial,
+                "partial_reason": self.partial_reason
+            }
+            self.files_parsed = 0
+            if content_budget is not None:
+                contents = await asyncio.to_thread(sample_contents, entries, content_budget, self._samples)
+                details = [
+                    detail.model_copy(update={"content": contents[entry.path]}) if entry.path in contents else detail
+                    for entry, detail in zip(entries, details)
+                ]
+                stats["content_bytes"] = content_budget.bytes_sampled
+                stats["files_sampled"] = content_budget.files_sampled
+                stats["files_binary"] = content_budget.files_binary
+            stats["files_reused"] -= stats["files_parsed"]
+            stats["refresh_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            return details, self._detector, stats
+
+    async def refresh(self):
+        """Apply the changes seen so far."""
+        async with self._lock:
+            if self._watcher is not None:
+                self._collect(self._watcher.read_events())
+            if self._rescan:
+                await self._rescan_tree()
+            elif self._dirty:
+                await self._update_files()
+
+    def _on_readable(self):
+        self._collect(self._watcher.read_events())
+        # Coalesce a burst of events (a save, a checkout) into one update
+        if (self._dirty or self._rescan) and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.debounce, self._schedule_refresh)
+
+    def _schedule_refresh(self):
+        self._timer = None
+        self._refresh_task = asyncio.ensure_future(self._refresh_in_background())
+
+    async def _refresh_in_background(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            print(f"Error updating live analysis of {self.root}: {str(e)}")
+
+    def _collect(self, events: List[Tuple[str, int]]):
+        """Sort events into files to update and reasons to rescan."""
+        for rel_path, mask in events:
+            if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF):
+                self._rescan = True
+                continue
+            name = os.path.basename(rel_path)
+            if name in IGNORE_FILES:
+                self._excluded.clear()
+                self._rescan = True
+                continue
+            if name.startswith('.'):
+                # Hidden entries are never walked (editor swap files, .git)
+                continue
+            known = rel_path in self._entries
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) or known:
+                    self._rescan = True
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                # Editors often save by replacing the file; only unknown paths need a rescan
+                if known:
+                    self._dirty.add(rel_path)
+                elif rel_path not in self._excluded:
+                    self._created.add(rel_path)
+                    self._rescan = True
+            elif known:
+                self._dirty.add(rel_path)
+
+    def _watch_directories(self) -> bool:
+        """Watch the root and every walked directory; False if the watch limit was hit."""
+        if not self._watcher.watch(self.root, ''):
+            return False
+        return all(
+            self._watcher.watch(entry.path, rel_path)
+            for rel_path, entry in self._entries.items() if entry.is_dir
+        )
+
+    def _scan(self) -> Tuple[List[WalkEntry], Dict[str, Tuple[int, int]], ProjectWalker]:
+        walker = ProjectWalker(self.root)
+        entries = list(walker)
+        stamps = {}
+        for entry in entries:
+            if not entry.is_dir:
+                try:
+                    stat = os.stat(entry.path)
+                except OSError:
+                    continue
+                stamps[entry.rel_path] = (stat.st_mtime_ns, stat.st_size)
+        return entries, stamps, walker
+
+    async def _rescan_tree(self):
+        # Events that arrive during the walk are kept for the next refresh
+        created, self._created = self._created, set()
+        self._dirty = set()
+        self._rescan = False
+        entries, stamps, walker = await asyncio.to_thread(self._scan)
+        self.partial = walker.partial
+        self.partial_reason = walker.partial_reason
+        changed = [
+            entry for entry in entries
+            if entry.rel_path not in self._details or (not entry.is_dir and stamps.get(entry.rel_path) != self._stamps.get(entry.rel_path))
+        ]
+        kept = {entry.rel_path for entry in entries}
+        removed = [entry for rel_path, entry in self._entries.items() if rel_path not in kept]
+        # Created paths the walker skipped are ignored files: their events need no rescan
+        self._excluded.update(rel_path for rel_path in created if rel_path not in kept)
+        for entry in removed + changed:
+            self._samples.pop(entry.path, None)
+
+        details = await self._parse(changed)
+        self._details = {
+            entry.rel_path: details[entry.rel_path] if entry.rel_path in details else self._details[entry.rel_path]
+            for entry in entries
+        }
+        self._entries = {entry.rel_path: entry for entry in entries}
+        self._stamps = stamps
+        if self._watcher is not None and not self._watch_directories():
+            print(f"inotify watch limit reached for {self.root}, polling instead")
+            self._fall_back_to_polling()
+        if changed or removed:
+            await self._update_tech_stack()
+        WATCH_UPDATES.inc(kind="rescan")
+
+    async def _update_files(self):
+        """Re-stat and re-parse the files events reported, dropping deleted ones."""
+        # A rescan since the events were collected may have dropped some of the paths
+        paths = {rel_path: self._entries[rel_path].path for rel_path in self._dirty if rel_path in self._entries}
+        self._dirty = set()
+
+        def stat_all() -> Dict[str, Optional[Tuple[int, int]]]:
+            stamps = {}
+            for rel_path, path in paths.items():
+                try:
+                    stat = os.stat(path)
+                    stamps[rel_path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    stamps[rel_path] = None
+            return stamps
+
+        stamps = await asyncio.to_thread(stat_all)
+        changed = []
+        removed = False
+        for rel_path, stamp in stamps.items():
+            entry = self._entries[rel_path]
+            self._samples.pop(entry.path, None)
+            if stamp is None:
+                del self._entries[rel_path], self._details[rel_path]
+                self._stamps.pop(rel_path, None)
+                removed = True
+            elif stamp != self._stamps.get(rel_path):
+                self._stamps[rel_path] = stamp
+                entry.size = stamp[1]
+                changed.append(entry)
+        if not changed and not removed:
+            return
+        self._details.update(await self._parse(changed))
+        await self._update_tech_stack()
+        WATCH_UPDATES.inc(kind="files")
+
+    async def _parse(self, entries: List[WalkEntry]) -> Dict[str, FileDetail]:
+        """Build the details of new or changed entries, parsing their source files."""
+        if not entries:
+            return {}
+        stats = {"files_reused": 0, "files_parsed": 0}
+        source_files = [entry.path for entry in entries if not entry.is_dir and get_extractor(entry.path)]
+        symbols_by_path = await analyze_source_files(source_files, stats)
+        self.files_parsed += stats["files_parsed"]
+        self.updates += 1
+        self.updated_at = time.time()
+        return {entry.rel_path: file_detail(entry, symbols_by_path.get(entry.path)) for entry in entries}
+
+    async def _update_tech_stack(self):
+        def detect() -> TechStackDetector:
+            detector = TechStackDetector()
+            detector.observe_root(self.root)
+            detector.observe_entries(self._entries.values())
+            return detector
+        self._detector = await asyncio.to_thread(detect)
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                async with self._lock:
+                    await self._rescan_tree()
+            except Exception as e:
+                print(f"Error polling {self.root}: {str(e)}")
+
+    def _fall_back_to_polling(self):
+        self._close_watcher()
+        self.backend = "poll"
+        if self._poll_task is None:
+            self._poll_task = asyncio.ensure_future(self._poll())
+
+    def _close_watcher(self):
+        if self._watcher is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._watcher.fd)
+            except (RuntimeError, ValueError):
+                pass
+            self._watcher.close()
+            self._watcher = None
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        for task in (self._poll_task, self._refresh_task):
+            if task is not None:
+                task.cancel()
+        self._close_watcher()
+
+class LiveAnalysisManager:
+    """
+    The projects kept as live analyses, least recently used first.
+
+    Only used when ANALYZER_WATCH is enabled. Projects the walker cannot analyze
+    completely (it hit a depth, entry or time budget) are not watched, and are analyzed
+    per request as before until one of those analyses completes (see `rescanned`). A watched project that grows past a budget is still served
+    from its model, marked partial with the budget's name like a one-shot analysis.
+    """
+
+    def __init__(self, enabled: bool = False, max_projects: int = 4, backend: str = "auto",
+                 poll_interval: float = 2.0, debounce: float = 0.2):
+        self.enabled = enabled
+        self.max_projects = max_projects
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._projects: "OrderedDict[str, LiveProject]" = OrderedDict()
+        self._unwatchable: Set[str] = set()
+        self._starting = SingleFlight()
+
+    @classmethod
+    def from_env(cls) -> "LiveAnalysisManager":
+        """Create a manager configured from ANALYZER_WATCH* environment variables."""
+        return cls(
+            enabled=os.getenv("ANALYZER_WATCH", "false").lower() == "true",
+            max_projects=int(os.getenv("ANALYZER_WATCH_PROJECTS", "4")),
+            backend=os.getenv("ANALYZER_WATCH_BACKEND", "auto"),
+            poll_interval=float(os.getenv("ANALYZER_WATCH_POLL_INTERVAL", "2")),
+            debounce=float(os.getenv("ANALYZER_WATCH_DEBOUNCE", "0.2"))
+        )
+
+    async def get(self, project_path: str) -> Optional[LiveProject]:
+        """Return the live analysis of a project, starting it on first use."""
+        if not self.enabled:
+            return None
+        root = os.path.realpath(project_path)
+        if root in self._unwatchable:
+            return None
+        project = self._projects.get(root)
+        if project is not None:
+            self._projects.move_to_end(root)
+            return project
+        project, _ = await self._starting.do(root, lambda: self._start(root))
+        return project
+
+    def rescanned(self, project_path: str, partial: bool):
+        """
+        Note a one-shot analysis of a project. Once one completes within the budgets, a
+        project that was too large to watch is started again on its next use.
+        """
+        if not partial:
+            self._unwatchable.discard(os.path.realpath(project_path))
+
+    async def _start(self, root: str) -> Optional[LiveProject]:
+        project = LiveProject(root, self.backend, self.poll_interval, self.debounce)
+        await project.start()
+        if project.partial:
+            project.close()
+            self._unwatchable.add(root)
+            print(f"Not watching {root}: the analysis is partial")
+            return None
+        self._projects[root] = project
+        while len(self._projects) > self.max_projects:
+            _, evicted = self._projects.popitem(last=False)
+            evicted.close()
+        return project
+
+    def shutdown(self):
+        for project in self._projects.values():
+            project.close()
+        self._projects.clear()
+
+# Create a singleton instance
+live_analyses = LiveAnalysisManager.from_env()
@@ -0,0 +1,233 @@
+import os
+import re
+import math
+from typing import List, Dict, Any, Optional, Tuple
+from app.core.models import ProjectDetails, FunctionDetail
+
+# Default prompt budget; the model's context also has to fit the system prompt and output
+DEFAULT_PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+
+# Share of the remaining budget reserved for the function sample when the tree is large
+FUNCTION_BUDGET_SHARE = 0.25
+# Tokens of the note that ends a truncated tree
+TRUNCATION_NOTE_TOKENS = 12
+
+# Files that tell a reader how a project is built and started; always kept in the tree
+ENTRY_POINT_NAMES = {
+    'main.py', 'app.py', '__main__.py', 'manage.py', 'cli.py', 'wsgi.py', 'asgi.py',
+    'setup.py', 'pyproject.toml', 'requirements.txt', 'package.json', 'index.js', 'index.ts',
+    'server.js', 'app.js', 'extension.ts', 'main.go', 'go.mod', 'main.rs', 'lib.rs',
+    'Cargo.toml', 'pom.xml', 'build.gradle', 'Dockerfile', 'docker-compose.yml', 'Makefile'
+}
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in `text` without calling the API.
+
+    BPE vocabularies average roughly four characters per token for English and code, so
+    each word counts for ceil(len / 4) tokens and each punctuation character for one.
+    """
+    return sum(math.ceil(len(token) / 4) for token in TOKEN_PATTERN.findall(text))
+
+def _line_tokens(lines: List[str]) -> int:
+    # Each line also costs a newline token
+    return sum(count_tokens(line) + 1 for line in lines)
+
+def _normalize(path: str) -> str:
+    return path.replace('\\', '/').strip('/')
+
+def _is_entry_point(path: str) -> bool:
+    return path.count('/') <= 2 and path.rsplit('/', 1)[-1] in ENTRY_POINT_NAMES
+
+def _render_tree(project: ProjectDetails, depth_limit: Optional[int]) -> List[str]:
+    """
+    List the file structure, collapsing directories deeper than `depth_limit`.
+
+    A collapsed directory is shown as "dir/ (N files)"; entry points are listed even
+    when their directory is collapsed.
+    """
+    paths = [(_normalize(f.path), f.type) for f in project.file_structure]
+    if depth_limit is None:
+        return ['- ' + path for path, _ in paths]
+
+    collapsed_counts: Dict[str, int] = {}
+    for path, kind in paths:
+        parts = path.split('/')
+        if len(parts) > depth_limit + 1 and kind == 'file':
+            parent = '/'.join(parts[:depth_limit + 1])
+            collapsed_counts[parent] = collapsed_counts.get(parent, 0) + 1
+
+    lines = []
+    for path, kind in paths:
+        depth = path.count('/')
+        if depth < depth_limit or (depth == depth_limit and kind == 'file'):
+            lines.append('- ' + path)
+        elif depth == depth_limit:
+            count = collapsed_counts.get(path, 0)
+            lines.append(f'- {path}/ ({count} files)' if count else f'- {path}/')
+        elif kind == 'file' and _is_entry_point(path):
+            lines.append('- ' + path)
+    return lines
+
+def _truncate(lines: List[str], budget: int, keep=lambda line: False, note: bool = True) -> List[str]:
+    """Keep lines in order until `budget` tokens are used, always keeping `keep` lines."""
+    kept, used = [], 0
+    for line in lines:
+        cost = count_tokens(line) + 1
+        if used + cost <= budget or keep(line):
+            kept.append(line)
+            used += cost
+    if note and len(kept) < len(lines):
+        kept.append(f'- ... and {len(lines) - len(kept)} more entries')
+    return kept
+
+def _rank_functions(project: ProjectDetails) -> List[Tuple[FunctionDetail, str]]:
+    """
+    Order functions by how representative they are: documented, public, in entry points,
+    central in the call graph and spread across files.
+    """
+    seen = set()
+    candidates = []
+    for file in project.file_structure:
+        path = _normalize(file.path)
+        for function in (file.functions or []) + (file.classes or []):
+            candidates.append((function, path))
+    for function in project.functions:
+        candidates.append((function, ''))
+
+    # How many distinct functions call each name, matched on the unqualified name
+    callers: Dict[str, int] = {}
+    for function, _ in candidates:
+        for callee in set(function.calls or []):
+            callers[callee] = callers.get(callee, 0) + 1
+
+    ranked = []
+    for position, (function, path) in enumerate(candidates):
+        key = (function.name, path)
+        if key in seen:
+            continue
+        seen.add(key)
+        short_name = function.name.rsplit('.', 1)[-1]
+        score = 0
+        score += 2 if function.description else 0
+        score += 1 if not short_name.startswith('_') else -2
+        score += 2 if path and _is_entry_point(path) else 0
+        score -= path.count('/') * 0.1
+        if function.calls is not None:
+            called_by = callers.get(short_name, 0)
+            # Widely used helpers and uncalled functions that drive many others (entry points)
+            score += min(called_by, 4) * 0.5
+            score += 1 if not called_by and len(function.calls) >= 3 else 0
+        ranked.append((-score, position, function, path))
+    ranked.sort(key=lambda item: (item[0], item[1]))
+
+    # Interleave files round-robin so the sample covers the project, not one module
+    by_file: Dict[str, List[Tuple[FunctionDetail, str]]] = {}
+    for _, _, function, path in ranked:
+        by_file.setdefault(path, []).append((function, path))
+    queues = list(by_file.values())
+    interleaved = []
+    for index in range(max((len(queue) for queue in queues), default=0)):
+        interleaved.extend(queue[index] for queue in queues if index < len(queue))
+    return interleaved
+
+def _render_function(function: FunctionDetail, path: str) -> str:
+    signature = f"{function.name}({', '.join(function.parameters or [])})"
+    if function.kind == 'class':
+        signature = 'class ' + (signature if function.parameters else function.name)
+    elif function.kind and function.kind.startswith('async'):
+        signature = 'async ' + signature
+    if function.return_type:
+        signature += f" -> {function.return_type}"
+    summary = function.description.strip().splitlines()[0] if function.description.strip() else ''
+    location = f" [{path}]" if path else ''
+    return f"- {signature}{location}" + (f": {summary}" if summary else '')
+
+def build_project_summary(project: ProjectDetails, token_budget: Optional[int] = None, reserved_tokens: int = 0) -> Tuple[str, Dict[str, Any]]:
+    """
+    Describe the project details for the model within a token budget.
+
+    The full file tree and function list are used when they fit. Otherwise a ranked
+    sample of functions starts with FUNCTION_BUDGET_SHARE of the budget, the tree is
+    collapsed one directory level at a time (keeping entry points) until it fits the
+    rest, and whatever either section leaves unused goes to the other, so the summary
+    fills the budget when the project has the content. `reserved_tokens` accounts for
+    the rest of the prompt.
+    Returns the summary and token statistics (`before`, `after`, `budget`, `compressed`).
+    """
+    budget = token_budget or DEFAULT_PROMPT_TOKEN_BUDGET
+
+    def render(tree_lines: List[str], function_lines: List[str]) -> str:
+        summary = f"""Project Name: {project.project_name}
+Description: {project.description}
+Tech Stack: {', '.join(project.tech_stack)}
+Deployment URL: {project.deployment_url if project.deployment_url else 'Not provided'}
+File Structure:
+{chr(10).join(tree_lines)}
+"""
+        if function_lines:
+            summary += f"""Key Functions:
+{chr(10).join(function_lines)}
+"""
+        return summary + f"""Author: {project.author_name if project.author_name else 'Not provided'}
+
+Contact details: Include the author email ({project.author_email if project.author_email else 'Not provided'}) and GitHub username ({project.github_username if project.github_username else 'Not provided'}) if provided in a 'Contact' or 'Author' section."""
+
+    ranked_functions = _rank_functions(project)
+    all_functions = [_render_function(function, path) for function, path in ranked_functions]
+    full_tree = _render_tree(project, None)
+    base_tokens = count_tokens(render([], [])) + reserved_tokens + 4
+    before = base_tokens + _line_tokens(full_tree) + _line_tokens(all_functions)
+
+    if before <= budget:
+        summary = render(full_tree, all_functions)
+        return summary, {"before": before, "after": before, "budget": budget, "compressed": False}
+
+    available = max(budget - base_tokens, 0)
+    max_depth = max((_normalize(f.path).count('/') for f in project.file_structure), default=0)
+    # Each tree that could be used, largest first, with its size
+    trees = [(lines, _line_tokens(lines)) for lines in
+             (_render_tree(project, depth_limit) for depth_limit in [None, *range(max_depth - 1, -1, -1)])]
+
+    def fit_tree(tree_budget: int) -> List[str]:
+        for lines, tokens in trees:
+            if tokens <= tree_budget:
+                return lines
+        # Room for the "... and N more entries" note
+        return _truncate(trees[-1][0], tree_budget - TRUNCATION_NOTE_TOKENS, keep=lambda line: _is_entry_point(line[2:]))
+
+    # Size the function sample, fit the tree in the rest, then give each the other's
+    # leftover. The tree can only grow in the second pass, so this settles in two.
+    function_budget = min(_line_tokens(all_functions), int(available * FUNCTION_BUDGET_SHARE))
+    for _ in range(2):
+        function_lines = _truncate(all_functions, function_budget, note=False)
+        tree_lines = fit_tree(available - _line_tokens(function_lines))
+        function_budget = available - _line_tokens(tree_lines)
+    function_lines = _truncate(all_functions, function_budget, note=False)
+
+    summary = render(tree_lines, function_lines)
+    after = count_tokens(summary) + reserved_tokens
+    return summary, {"before": before, "after": after, "budget": budget, "compressed": True}
+
+README_INSTRUCTIONS = """Generate 3 different versions:
+1. Professional and formal
+2. Modern and developer-friendly
+3. Minimal and clean
+
+Each version should be complete and use proper markdown formatting. Return them clearly separated as 'Option 1:', 'Option 2:', and 'Option 3:'.
+"""
+
+README_PREAMBLE = "Generate 3 different README.md files for a project with the following details:"
+
+def build_readme_prompt(project: ProjectDetails, token_budget: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+    """Build the combined README generation prompt for a project within a token budget."""
+    reserved = count_tokens(README_PREAMBLE) + count_tokens(README_INSTRUCTIONS) + 4
+    summary, token_stats = build_project_summary(project, token_budget, reserved)
+    prompt = f"""{README_PREAMBLE}
+
+{summary}
+
+{README_INSTRUCTIONS}"""
+    return prompt, token_stats
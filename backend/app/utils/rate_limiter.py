@@ -0,0 +1,210 @@
+import os
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Lower values are admitted first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# Admission priority of LLM calls made in the current context, see `priority_scope`
+_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+@contextmanager
+def priority_scope(priority: int) -> Iterator[None]:
+    """Admit the LLM calls made inside the block (and tasks it starts) at `priority`."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def current_priority() -> int:
+    return _priority.get()
+
+ADMISSIONS = registry.counter(
+    "llm_admission_total",
+    "Upstream LLM calls by admission outcome (admitted, queue_full, deadline, upstream_429)."
+)
+ADMISSION_WAIT_SECONDS = registry.histogram(
+    "llm_admission_wait_seconds",
+    "Time LLM calls waited in the admission queue before being sent upstream."
+)
+
+class RateLimitExceeded(Exception):
+    """Raised when a call is shed instead of being sent upstream; `retry_after` is in seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at `rate_per_minute`, holding at most a minute's worth.
+
+    A rate of zero or less means unlimited. Consumption may drive the bucket negative
+    (a request bigger than the remaining budget), which later requests pay back.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        # A request larger than the whole bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def consume(self, amount: float, now: float):
+        if not self.unlimited:
+            self._refill(now)
+            self.tokens -= amount
+
+    def refund(self, amount: float):
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+class Ticket:
+    """An admitted call; `settle` corrects the token reservation with the actual usage."""
+
+    __slots__ = ('controller', 'reserved')
+
+    def __init__(self, controller: "AdmissionController", reserved: int):
+        self.controller = controller
+        self.reserved = reserved
+
+    def settle(self, used_tokens: Optional[int]):
+        if used_tokens is None:
+            return
+        difference = self.reserved - used_tokens
+        self.reserved = used_tokens
+        if difference > 0:
+            self.controller.tpm.refund(difference)
+        elif difference < 0:
+            self.controller.tpm.consume(-difference, time.monotonic())
+
+class AdmissionController:
+    """
+    Admission control in front of an LLM provider.
+
+    Calls reserve one request from a requests-per-minute bucket and their estimated
+    tokens from a tokens-per-minute bucket. When either is empty, calls wait in a
+    priority queue (lowest priority value first, then arrival order) instead of
+    hitting the provider and getting 429s. Calls are shed with RateLimitExceeded when
+    the queue is full or their deadline passes while waiting, and an upstream 429
+    pauses admissions for its Retry-After, so throughput stays at the provider's limit.
+    """
+
+    def __init__(self, rpm: float = 0, tpm: float = 0, max_queue: int = 256, timeout: float = 120.0):
+        self.rpm = TokenBucket(rpm)
+        self.tpm = TokenBucket(tpm)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._queue: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """Create a controller configured from LLM_RATE_LIMIT_* and LLM_QUEUE_* environment variables."""
+        return cls(
+            rpm=float(os.getenv("LLM_RATE_LIMIT_RPM", "0")),
+            tpm=float(os.getenv("LLM_RATE_LIMIT_TPM", "0")),
+            max_queue=int(os.getenv("LLM_QUEUE_MAX", "256")),
+            timeout=float(os.getenv("LLM_QUEUE_TIMEOUT", "120"))
+        )
+
+    def queued(self) -> int:
+        return sum(1 for _, _, _, future in self._queue if not future.done())
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        return max(self._paused_until - now, self.rpm.wait_time(1, now), self.tpm.wait_time(tokens, now))
+
+    def _dispatch(self):
+        """Admit queued calls in priority order while the buckets allow, then sleep until the next fits."""
+        self._timer = None
+        loop = asyncio.get_running_loop()
+        while self._queue:
+            _, _, tokens, future = self._queue[0]
+            if future.done():  # Timed out or cancelled while waiting
+                heapq.heappop(self._queue)
+                continue
+            now = time.monotonic()
+            wait = self._wait_time(tokens, now)
+            if wait > 0:
+                self._timer = loop.call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            self.rpm.consume(1, now)
+            self.tpm.consume(tokens, now)
+            future.set_result(None)
+
+    async def acquire(self, tokens: int, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None) -> Ticket:
+        """Wait until a call estimated at `tokens` tokens may be sent upstream."""
+        now = time.monotonic()
+        timeout = self.timeout if timeout is None else timeout
+        if not self._queue and self._wait_time(tokens, now) <= 0:
+            self.rpm.consume(1, now)
+            self.tpm.consume(tokens, now)
+            return self._admitted(tokens, now)
+
+        if self.queued() >= self.max_queue:
+            ADMISSIONS.inc(outcome="queue_full")
+            raise RateLimitExceeded("LLM request queue is full", self._wait_time(tokens, now) or 1.0)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._counter), tokens, future))
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if not future.cancel():
+                # Admitted in the same tick as the deadline
+                return self._admitted(tokens, now)
+            ADMISSIONS.inc(outcome="deadline")
+            raise RateLimitExceeded(
+                f"LLM request waited {timeout:.0f}s without capacity",
+                self._wait_time(tokens, time.monotonic()) or 1.0
+            )
+        except asyncio.CancelledError:
+            if not future.cancel():
+                # The admission was granted but nobody will use it
+                self.rpm.refund(1)
+                self.tpm.refund(tokens)
+            raise
+        return self._admitted(tokens, now)
+
+    def _admitted(self, tokens: int, queued_at: float) -> Ticket:
+        ADMISSIONS.inc(outcome="admitted")
+        ADMISSION_WAIT_SECONDS.observe(time.monotonic() - queued_at)
+        return Ticket(self, tokens)
+
+    def penalize(self, retry_after: float):
+        """Pause admissions after an upstream 429, honouring its Retry-After."""
+        ADMISSIONS.inc(outcome="upstream_429")
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        logger.warning(f"Upstream rate limit hit; pausing LLM admissions for {retry_after:.1f}s")
@@ -0,0 +1,223 @@
+import re
+from typing import List, Optional
+from app.core.models import ReadmeVariant
+
+README_STYLES = ["Professional", "Modern", "Minimal"]
+
+# An "Option N" header line: optional heading/emphasis/quote markers, the number, an
+# optional separator (":", ".", ")", "-") and the rest of the line
+OPTION_HEADER = re.compile(
+    r"^\s*(?P<marks>[#*_>\s]*)Option\s+(?P<number>\d+)\b\s*[:.)\-–—]?\s*(?P<rest>.*?)\s*[*_]*\s*$",
+    re.IGNORECASE
+)
+
+# A style label such as "[Professional]", "(Modern)" or "Minimal README" after the number,
+# possibly followed by a description ("Professional and formal")
+STYLE_LABEL = re.compile(
+    r"\[(?P<bracket>[^\]]*)\]|\((?P<paren>[^)]*)\)|(?P<name>%s)(?:\s+(?:version|readme|style))?" % "|".join(README_STYLES),
+    re.IGNORECASE
+)
+
+FENCE = re.compile(r"^\s*(`{3,}|~{3,})\s*(?P<info>[\w+-]*)")
+WRAPPER_INFO = {"markdown", "md"}
+SEPARATOR = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$")
+
+def style_for_index(index: int) -> str:
+    """Return the style label for the variant at the given position."""
+    return README_STYLES[index] if index < len(README_STYLES) else f"Style {index + 1}"
+
+def style_from_label(label: str) -> Optional[str]:
+    """Return the known style a header label names, if any."""
+    for style in README_STYLES:
+        if style.lower() in label.lower():
+            return style
+    return None
+
+def leading_style(rest: str) -> Optional[str]:
+    """
+    Return the known style named by the label a header's rest starts with, if any.
+
+    The label may be followed by a description, as in "Modern and developer-friendly"
+    or "[Minimal] - clean", but not run into another word ("Modernize").
+    """
+    label = STYLE_LABEL.match(rest)
+    if not label or (label.end() < len(rest) and (rest[label.end()].isalnum() or rest[label.end()] == "_")):
+        return None
+    return style_from_label(label.group())
+
+class OptionSplitter:
+    """
+    Incrementally split a streamed response into README variants on "Option N" headers.
+
+    A line-by-line state machine: text before the first header is a preamble and is
+    dropped, and each header closes the current variant and opens the next. To tell
+    headers from README content that happens to start with "Option":
+
+    - the number must be the next one expected (1, then 2, ...);
+    - the rest of the line must be empty ("**Option 2:**") or start with a known
+      style label ("Option 2: [Modern]", "Option 2: Modern and developer-friendly"),
+      so README headings such as "### Option 2: Run with Docker" stay in the variant;
+    - nothing inside a fenced code block is a header. The one exception is a bare
+      fence closing a ```markdown wrapper, which looks like a code fence opening:
+      a header right after it (with no content in between) is accepted.
+
+    The style comes from the label when it names one, otherwise from the position.
+    Variants wrapped in a ```markdown fence are unwrapped, trailing "---" separators
+    are dropped and a fence left open is closed.
+    """
+
+    def __init__(self):
+        self._pending: List[str] = []  # Fragments of the current, incomplete line
+        self._lines: Optional[List[str]] = None  # Lines of the open variant
+        self._style: Optional[str] = None
+        self._count = 0
+        self._number = 0  # Number of the last header
+        self._fence: Optional[str] = None  # Marker of the open code fence
+        self._fence_lines = 0  # Non-blank lines inside it so far
+        self._wrapper: Optional[str] = None  # Marker of the ```markdown fence wrapping the variant
+        self._may_close_wrapper = False  # Whether the open fence could be the wrapper's close
+
+    def feed(self, text: str) -> List[ReadmeVariant]:
+        """Consume a chunk of text and return any variants that were closed by it."""
+        if "\n" not in text:
+            # Only whole lines can be classified; without a newline there is nothing to do
+            self._pending.append(text)
+            return []
+        self._pending.append(text)
+        *lines, rest = "".join(self._pending).split("\n")
+        self._pending = [rest] if rest else []
+        completed = []
+        for line in lines:
+            variant = self._consume_line(line)
+            if variant:
+                completed.append(variant)
+        return completed
+
+    def close(self) -> List[ReadmeVariant]:
+        """Flush the remaining buffer and return the final variant, if any."""
+        completed = []
+        if self._pending:
+            variant = self._consume_line("".join(self._pending))
+            self._pending = []
+            if variant:
+                completed.append(variant)
+        variant = self._finish_current()
+        if variant:
+            completed.append(variant)
+        return completed
+
+    def _header(self, line: str) -> Optional[re.Match]:
+        # Cheap test first: almost no line is a header
+        if "ption" not in line:
+            return None
+        match = OPTION_HEADER.match(line)
+        if not match or int(match.group("number")) != self._number + 1:
+            return None
+        if self._fence is not None and (self._fence_lines or not self._may_close_wrapper):
+            return None
+        rest = match.group("rest").strip("*_ ")
+        if not rest or leading_style(rest):
+            return match
+        return None
+
+    def _consume_line(self, line: str) -> Optional[ReadmeVariant]:
+        line = line.rstrip("\r")
+        match = self._header(line)
+        if not match:
+            if self._lines is not None:
+                self._track_fence(line)
+                self._lines.append(line)
+            return None
+
+        finished = self._finish_current()
+        self._number += 1
+        self._lines = []
+        self._style = leading_style(match.group("rest").strip("*_ "))
+        return finished
+
+    def _track_fence(self, line: str):
+        stripped = line.lstrip()
+        fence = FENCE.match(stripped) if stripped[:3] in ("```", "~~~") else None
+        if not fence:
+            if stripped and not (stripped[0] in "-*_" and SEPARATOR.match(stripped)):
+                self._fence_lines += 1
+            return
+        marker, info = fence.group(1), fence.group("info").lower()
+        if self._fence is None and info in WRAPPER_INFO and not any(previous.strip() for previous in self._lines):
+            # A ```markdown fence wrapping the variant is not a code block: the README's
+            # own fences inside it are tracked as usual
+            self._wrapper = marker
+            return
+        if self._fence is None:
+            # A bare fence may close the wrapper rather than open a code block
+            self._may_close_wrapper = (
+                self._wrapper is not None and not info
+                and marker[0] == self._wrapper[0] and len(marker) >= len(self._wrapper)
+            )
+        else:
+            self._may_close_wrapper = False
+        self._fence = _next_fence_state(self._fence, line)
+        self._fence_lines = 0
+
+    def _finish_current(self) -> Optional[ReadmeVariant]:
+        if self._lines is None:
+            return None
+        lines = self._lines
+        while lines and (not lines[-1].strip() or SEPARATOR.match(lines[-1])):
+            lines.pop()
+        while lines and not lines[0].strip():
+            lines.pop(0)
+        lines = _unwrap(lines)
+        # Close a fence the model left open (e.g. a truncated response)
+        fence = None
+        for line in lines:
+            if FENCE.match(line):
+                fence = _next_fence_state(fence, line)
+        if fence is not None:
+            lines.append(fence)
+        variant = ReadmeVariant(
+            content="\n".join(lines).strip(),
+            style=self._style or style_for_index(self._count)
+        )
+        self._count += 1
+        self._lines = None
+        self._style = None
+        self._fence = None
+        self._fence_lines = 0
+        self._wrapper = None
+        self._may_close_wrapper = False
+        return variant
+
+def _next_fence_state(fence: Optional[str], line: str) -> Optional[str]:
+    """Return the open fence marker after a fence line, given the one open before it."""
+    match = FENCE.match(line)
+    marker = match.group(1)
+    if fence is None:
+        return marker
+    # Only a bare fence of the same kind, at least as long, closes one
+    if marker[0] == fence[0] and len(marker) >= len(fence) and not match.group("info"):
+        return None
+    return fence
+
+def _unwrap(lines: List[str]) -> List[str]:
+    """Remove a ```markdown fence wrapping the whole variant (or opening a truncated one)."""
+    opening = FENCE.match(lines[0]) if lines else None
+    if not opening or opening.group("info").lower() not in WRAPPER_INFO:
+        return lines
+    if len(lines) > 1 and lines[-1].strip() == opening.group(1):
+        return lines[1:-1]
+    return lines[1:]
+
+def parse_variants(text: str, minimum: int = len(README_STYLES)) -> List[ReadmeVariant]:
+    """
+    Split a complete response into README variants, padded with empty ones to `minimum`.
+
+    A response without any "Option" header is returned as a single variant.
+    """
+    splitter = OptionSplitter()
+    variants = splitter.feed(text) + splitter.close()
+    if not variants and text.strip():
+        variants = [ReadmeVariant(content=text.strip(), style=style_for_index(0))]
+    while len(variants) < minimum:
+        variants.append(ReadmeVariant(content="", style=style_for_index(len(variants))))
+    return variants
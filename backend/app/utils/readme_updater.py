@@ -0,0 +1,307 @@
+import os
+import re
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.models import FileDetail, FunctionDetail
+from app.utils.prompt_builder import count_tokens
+from app.utils.tech_stack import MANIFEST_PARSERS
+
+# Token budget for the change description; the affected sections are always sent in full
+UPDATE_DIFF_TOKEN_BUDGET = int(os.getenv("README_UPDATE_DIFF_TOKEN_BUDGET", "1500"))
+
+# Output tokens allowed per token of affected sections, plus a fixed allowance for new ones
+UPDATE_OUTPUT_RATIO = 1.5
+UPDATE_OUTPUT_BASE = 512
+UPDATE_MAX_TOKENS = 8192
+
+# Files whose changes affect how the project is installed and run
+SETUP_FILES = set(MANIFEST_PARSERS) | {
+    'setup.py', 'setup.cfg', 'Pipfile', 'Dockerfile', 'docker-compose.yml', 'docker-compose.yaml',
+    'Makefile', '.env.example', 'tsconfig.json'
+}
+
+# Kinds of change, and words in a section heading that show the section covers them
+SECTION_TOPICS = {
+    "structure": ("structure", "layout", "directory", "directories", "files", "organization", "architecture"),
+    "stack": ("tech", "stack", "built with", "technolog", "dependenc", "requirement"),
+    "setup": ("install", "setup", "set up", "getting started", "prerequisite", "quick start", "configur", "running", "deploy"),
+    "api": ("usage", "api", "feature", "function", "endpoint", "module", "command", "example", "reference")
+}
+
+# Names shorter than this are too common to look for in README text
+MIN_MENTION_LENGTH = 4
+
+HEADING = re.compile(r"^(#{1,2})\s+(.*?)\s*#*\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+REVISION_MARKER = re.compile(r"^\s*===\s*(?:Section\s+(\d+)|(New))\s*===\s*$", re.IGNORECASE)
+
+def _signature(function: FunctionDetail) -> Tuple:
+    return (tuple(function.parameters or []), function.return_type, function.kind, function.description.strip())
+
+def _symbols(detail: FileDetail) -> List[FunctionDetail]:
+    """Functions, methods and classes of a file, which are diffed alike."""
+    return (detail.functions or []) + (detail.classes or [])
+
+class FileChange:
+    """Function-level changes to a file present in both snapshots."""
+
+    __slots__ = ('path', 'added', 'removed', 'changed')
+
+    def __init__(self, path: str, added: List[str], removed: List[str], changed: List[str]):
+        self.path = path
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+class StructureDiff:
+    """The difference between two analyses of a project."""
+
+    __slots__ = ('added_files', 'removed_files', 'changed_files', 'added_stack', 'removed_stack', 'functions')
+
+    def __init__(self):
+        self.added_files: List[str] = []
+        self.removed_files: List[str] = []
+        self.changed_files: List[FileChange] = []
+        self.added_stack: List[str] = []
+        self.removed_stack: List[str] = []
+        # Functions of added files and changed functions, by name, for rendering signatures
+        self.functions: Dict[str, Tuple[FunctionDetail, str]] = {}
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added_files or self.removed_files or self.changed_files or self.added_stack or self.removed_stack)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "files_added": len(self.added_files),
+            "files_removed": len(self.removed_files),
+            "files_changed": len(self.changed_files),
+            "functions_added": sum(len(change.added) for change in self.changed_files),
+            "functions_removed": sum(len(change.removed) for change in self.changed_files),
+            "functions_changed": sum(len(change.changed) for change in self.changed_files),
+            "stack_added": len(self.added_stack),
+            "stack_removed": len(self.removed_stack)
+        }
+
+    def topics(self) -> Set[str]:
+        """The SECTION_TOPICS affected by this change."""
+        topics = set()
+        if self.added_files or self.removed_files:
+            topics.add("structure")
+        if self.added_stack or self.removed_stack:
+            topics.add("stack")
+        touched = self.added_files + self.removed_files + [change.path for change in self.changed_files]
+        if any(path.rsplit('/', 1)[-1] in SETUP_FILES for path in touched):
+            topics.update(("setup", "stack"))
+        if self.changed_files or self.functions:
+            topics.add("api")
+        return topics
+
+    def mentioned_names(self) -> Set[str]:
+        """File and function names whose mention in a section makes it affected."""
+        names = {path.rsplit('/', 1)[-1] for path in self.removed_files}
+        for change in self.changed_files:
+            # Methods are mentioned by their own name, not "Class.method"
+            names.update(name.rsplit('.', 1)[-1] for name in change.removed + change.changed)
+        return {name for name in names if len(name) >= MIN_MENTION_LENGTH}
+
+def diff_structures(
+    old_files: List[FileDetail], new_files: List[FileDetail],
+    old_stack: Optional[List[str]] = None, new_stack: Optional[List[str]] = None
+) -> StructureDiff:
+    """Compare two file structures (and tech stacks) file by file and function by function."""
+    diff = StructureDiff()
+    old_by_path = {f.path: f for f in old_files if f.type == 'file'}
+    new_by_path = {f.path: f for f in new_files if f.type == 'file'}
+
+    for path, detail in new_by_path.items():
+        previous = old_by_path.get(path)
+        if previous is None:
+            diff.added_files.append(path)
+            for function in _symbols(detail):
+                diff.functions.setdefault(function.name, (function, path))
+            continue
+        old_functions = {function.name: function for function in _symbols(previous)}
+        new_functions = {function.name: function for function in _symbols(detail)}
+        added = [name for name in new_functions if name not in old_functions]
+        removed = [name for name in old_functions if name not in new_functions]
+        changed = [
+            name for name in new_functions
+            if name in old_functions and _signature(new_functions[name]) != _signature(old_functions[name])
+        ]
+        if added or removed or changed:
+            diff.changed_files.append(FileChange(path, added, removed, changed))
+            for name in added + changed:
+                diff.functions.setdefault(name, (new_functions[name], path))
+    diff.removed_files = [path for path in old_by_path if path not in new_by_path]
+
+    old_stack, new_stack = old_stack or [], new_stack or []
+    diff.added_stack = [tech for tech in new_stack if tech not in old_stack]
+    diff.removed_stack = [tech for tech in old_stack if tech not in new_stack]
+    return diff
+
+class Section:
+    """A README section: an H1/H2 heading (empty for the preamble) and the text under it."""
+
+    __slots__ = ('index', 'title', 'text')
+
+    def __init__(self, index: int, title: str, text: str):
+        self.index = index
+        self.title = title
+        self.text = text
+
+def split_sections(markdown: str) -> List[Section]:
+    """
+    Split a README on H1/H2 headings, ignoring "#" lines inside fenced code blocks.
+
+    Text before the first heading forms a section with an empty title. Joining the
+    sections' text gives back the README.
+    """
+    sections: List[Section] = []
+    current: List[str] = []
+    title = ""
+    in_fence = False
+    for line in markdown.splitlines(keepends=True):
+        if FENCE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING.match(line.rstrip("\n"))
+        if match and (current or sections):
+            sections.append(Section(len(sections), title, "".join(current)))
+            current = []
+        if match:
+            title = match.group(2)
+        current.append(line)
+    if current:
+        sections.append(Section(len(sections), title, "".join(current)))
+    return sections
+
+def affected_sections(sections: List[Section], diff: StructureDiff) -> List[Section]:
+    """
+    Pick the sections the change makes stale: those whose heading covers a kind of
+    change in the diff (see SECTION_TOPICS), and those that mention a removed file or
+    a removed or changed function by name.
+    """
+    if diff.empty:
+        return []
+    topics = diff.topics()
+    keywords = [word for topic in topics for word in SECTION_TOPICS[topic]]
+    mentions = [re.compile(r"\b%s\b" % re.escape(name)) for name in diff.mentioned_names()]
+    affected = []
+    for section in sections:
+        heading = section.title.lower()
+        if (heading and any(word in heading for word in keywords)) or any(pattern.search(section.text) for pattern in mentions):
+            affected.append(section)
+    return affected
+
+def _render_function(function: FunctionDetail, path: str) -> str:
+    signature = f"{function.name}({', '.join(function.parameters or [])})"
+    if function.return_type:
+        signature += f" -> {function.return_type}"
+    summary = function.description.strip().splitlines()[0] if function.description.strip() else ''
+    return f"  - {signature} [{path}]" + (f": {summary}" if summary else '')
+
+def render_diff(diff: StructureDiff, token_budget: int = UPDATE_DIFF_TOKEN_BUDGET) -> str:
+    """Describe the change for the model, listing as many entries as fit the budget."""
+    groups = [
+        ("Tech stack added", diff.added_stack),
+        ("Tech stack removed", diff.removed_stack),
+        ("Files added", diff.added_files),
+        ("Files removed", diff.removed_files)
+    ]
+    lines = [f"{label}: {', '.join(items)}" for label, items in groups[:2] if items]
+    for label, items in groups[2:]:
+        if items:
+            lines.append(f"{label}:")
+            lines.extend(f"- {path}" for path in items)
+    if diff.changed_files:
+        lines.append("Files with changed functions:")
+        for change in diff.changed_files:
+            parts = [f"{kind} {', '.join(names)}" for kind, names in
+                     (("added", change.added), ("removed", change.removed), ("changed", change.changed)) if names]
+            lines.append(f"- {change.path}: {'; '.join(parts)}")
+    if diff.functions:
+        lines.append("New or changed signatures:")
+        lines.extend(_render_function(function, path) for function, path in diff.functions.values())
+
+    kept, used = [], 0
+    for line in lines:
+        used += count_tokens(line) + 1
+        if used > token_budget:
+            kept.append(f"- ... and {len(lines) - len(kept)} more lines")
+            break
+        kept.append(line)
+    return "\n".join(kept)
+
+def build_update_prompt(project_name: str, sections: List[Section], affected: List[Section], diff: StructureDiff) -> Tuple[str, int]:
+    """
+    Build the prompt asking the model to revise only the affected sections.
+
+    The model sees the outline of the whole README, the change and the text of the
+    affected sections, so prompt and output size follow the change rather than the
+    project. Returns the prompt and the output token limit for the completion.
+    """
+    outline = "\n".join(f"{section.index}. {section.title or '(introduction)'}" for section in sections)
+    affected_text = "\n".join(f"=== Section {section.index} ===\n{section.text.strip()}\n" for section in affected)
+    prompt = f"""The project "{project_name}" has changed since its README was written.
+
+README outline:
+{outline}
+
+Changes:
+{render_diff(diff)}
+
+Sections that may be out of date:
+{affected_text or '(none)'}"""
+    affected_tokens = sum(count_tokens(section.text) for section in affected)
+    max_tokens = min(UPDATE_MAX_TOKENS, int(affected_tokens * UPDATE_OUTPUT_RATIO) + UPDATE_OUTPUT_BASE)
+    return prompt, max_tokens
+
+def parse_revisions(text: str) -> Tuple[Dict[int, str], List[str]]:
+    """Split the model output into revised sections by index and new sections."""
+    revised: Dict[int, str] = {}
+    added: List[str] = []
+    current: Optional[List[str]] = None
+    target = None
+    for line in text.splitlines():
+        match = REVISION_MARKER.match(line)
+        if match:
+            if current is not None:
+                _store_revision(target, current, revised, added)
+            target = int(match.group(1)) if match.group(1) else None
+            current = []
+        elif current is not None:
+            current.append(line)
+    if current is not None:
+        _store_revision(target, current, revised, added)
+    return revised, added
+
+def _store_revision(target: Optional[int], lines: List[str], revised: Dict[int, str], added: List[str]):
+    content = "\n".join(lines).strip()
+    if target is None:
+        if content:
+            added.append(content)
+    else:
+        revised[target] = content
+
+def apply_revisions(sections: List[Section], affected: List[Section], revised: Dict[int, str], added: List[str]) -> str:
+    """
+    Splice revised sections into the README, keeping every other section verbatim.
+
+    Only affected sections can be replaced; an empty revision deletes the section. New
+    sections go after the last affected one, or at the end.
+    """
+    allowed = {section.index for section in affected}
+    insert_after = max(allowed) if allowed else len(sections) - 1
+    parts = []
+    for section in sections:
+        if section.index in revised and section.index in allowed:
+            if revised[section.index]:
+                parts.append(revised[section.index].rstrip("\n") + "\n\n")
+        else:
+            parts.append(section.text)
+        if section.index == insert_after:
+            if parts and not parts[-1].endswith("\n\n"):
+                parts[-1] = parts[-1].rstrip("\n") + "\n\n"
+            parts.extend(content.rstrip("\n") + "\n\n" for content in added)
+    if not sections:
+        parts.extend(content + "\n\n" for content in added)
+    return "".join(parts).rstrip("\n") + "\n"
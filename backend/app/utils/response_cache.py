@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / ".cache" / "readme_cache.sqlite3"
+
+class ResponseCache:
+    """
+    Two-tier cache for generated README text.
+
+    Entries are keyed on a content hash of the full upstream request (prompt, model and
+    sampling parameters). Reads go to an in-memory LRU first and fall back to a SQLite
+    store on disk; both tiers expire entries after `ttl_seconds` and are size bounded.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_memory_entries: int = 128,
+        max_disk_entries: int = 5000,
+        ttl_seconds: float = 7 * 24 * 3600,
+        enabled: bool = True
+    ):
+        self.db_path = str(db_path or DEFAULT_CACHE_PATH)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Create a cache configured from README_CACHE_* environment variables."""
+        return cls(
+            db_path=os.getenv("README_CACHE_PATH"),
+            max_memory_entries=int(os.getenv("README_CACHE_MEMORY_ENTRIES", "128")),
+            max_disk_entries=int(os.getenv("README_CACHE_DISK_ENTRIES", "5000")),
+            ttl_seconds=float(os.getenv("README_CACHE_TTL", str(7 * 24 * 3600))),
+            enabled=os.getenv("README_CACHE_ENABLED", "true").lower() == "true"
+        )
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Return a canonical SHA-256 hash of an upstream request body."""
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS readme_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed_at ON readme_cache (accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, created_at: float, value: str):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT created_at, value FROM readme_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[0] > self.ttl_seconds:
+                conn.execute("DELETE FROM readme_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE readme_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            return row[0], row[1]
+
+    def _disk_set(self, key: str, created_at: float, value: str):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO readme_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, created_at, created_at)
+            )
+            # Drop expired rows, then the least recently used ones beyond the size bound
+            conn.execute("DELETE FROM readme_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM readme_cache WHERE key IN ("
+                "SELECT key FROM readme_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
+            conn.commit()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a cached response, counting the hit or miss."""
+        if not self.enabled:
+            return None
+
+        entry = self._memory.get(key)
+        if entry is not None and time.time() - entry[0] > self.ttl_seconds:
+            del self._memory[key]
+            entry = None
+        if entry is not None:
+            self._memory.move_to_end(key)
+        else:
+            try:
+                entry = await asyncio.to_thread(self._disk_get, key)
+            except sqlite3.Error as e:
+                logger.warning(f"README cache read failed: {e}")
+                entry = None
+            if entry is not None:
+                self._remember(key, *entry)
+
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, key: str, value: str):
+        """Store a response in both tiers."""
+        if not self.enabled:
+            return
+        created_at = time.time()
+        self._remember(key, created_at, value)
+        try:
+            await asyncio.to_thread(self._disk_set, key, created_at, value)
+        except sqlite3.Error as e:
+            logger.warning(f"README cache write failed: {e}")
+
+# Create a singleton instance
+response_cache = ResponseCache.from_env()
@@ -0,0 +1,219 @@
+import os
+import re
+import json
+import asyncio
+from typing import List, Dict, Iterable, Optional, Set, Callable
+from app.utils.fs_walker import ProjectWalker
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+# Manifests larger than this are not parsed
+MAX_MANIFEST_BYTES = 256 * 1024
+
+# Languages below this share of the project's source bytes are left out of the stack
+LANGUAGE_MIN_SHARE = float(os.getenv("TECH_STACK_MIN_LANGUAGE_SHARE", "0.02"))
+
+EXTENSION_LANGUAGES = {
+    '.py': 'Python', '.pyw': 'Python', '.ipynb': 'Python',
+    '.js': 'JavaScript', '.jsx': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript', '.mts': 'TypeScript', '.cts': 'TypeScript',
+    '.java': 'Java', '.kt': 'Kotlin', '.kts': 'Kotlin', '.scala': 'Scala',
+    '.go': 'Go', '.rs': 'Rust', '.rb': 'Ruby', '.php': 'PHP',
+    '.c': 'C', '.h': 'C', '.cc': 'C++', '.cpp': 'C++', '.cxx': 'C++', '.hpp': 'C++',
+    '.cs': 'C#', '.swift': 'Swift', '.dart': 'Dart', '.lua': 'Lua', '.r': 'R',
+    '.ex': 'Elixir', '.exs': 'Elixir', '.sh': 'Shell', '.vue': 'Vue', '.svelte': 'Svelte'
+}
+
+# Files whose presence alone identifies a technology
+FILENAME_TECH = {
+    'requirements.txt': 'Python',
+    'pyproject.toml': 'Python',
+    'setup.py': 'Python',
+    'package.json': 'Node.js',
+    'pom.xml': 'Java',
+    'build.gradle': 'Java',
+    'build.gradle.kts': 'Kotlin',
+    'Cargo.toml': 'Rust',
+    'go.mod': 'Go',
+    'Gemfile': 'Ruby',
+    'composer.json': 'PHP',
+    'Dockerfile': 'Docker',
+    'docker-compose.yml': 'Docker',
+    'docker-compose.yaml': 'Docker',
+    'compose.yaml': 'Docker',
+    'terraform.tf': 'Terraform',
+    'main.tf': 'Terraform'
+}
+
+# Dependency names (normalized to lower case) that identify a framework or notable library
+PYTHON_FRAMEWORKS = {
+    'fastapi': 'FastAPI', 'django': 'Django', 'flask': 'Flask', 'starlette': 'Starlette',
+    'tornado': 'Tornado', 'aiohttp': 'aiohttp', 'sqlalchemy': 'SQLAlchemy', 'pydantic': 'Pydantic',
+    'celery': 'Celery', 'pandas': 'pandas', 'numpy': 'NumPy', 'torch': 'PyTorch',
+    'tensorflow': 'TensorFlow', 'scikit-learn': 'scikit-learn', 'streamlit': 'Streamlit',
+    'langchain': 'LangChain', 'pytest': 'pytest', 'uvicorn': 'Uvicorn'
+}
+NODE_FRAMEWORKS = {
+    'react': 'React', 'next': 'Next.js', 'vue': 'Vue', 'nuxt': 'Nuxt', '@angular/core': 'Angular',
+    'svelte': 'Svelte', 'express': 'Express', 'fastify': 'Fastify', '@nestjs/core': 'NestJS',
+    'koa': 'Koa', 'electron': 'Electron', 'typescript': 'TypeScript', 'vite': 'Vite',
+    'webpack': 'webpack', 'jest': 'Jest', 'mocha': 'Mocha', 'tailwindcss': 'Tailwind CSS',
+    'prisma': 'Prisma', 'mongoose': 'Mongoose'
+}
+RUST_FRAMEWORKS = {
+    'tokio': 'Tokio', 'actix-web': 'Actix Web', 'axum': 'Axum', 'rocket': 'Rocket',
+    'warp': 'Warp', 'serde': 'Serde', 'clap': 'clap', 'diesel': 'Diesel', 'sqlx': 'SQLx',
+    'bevy': 'Bevy', 'tauri': 'Tauri'
+}
+GO_FRAMEWORKS = {
+    'github.com/gin-gonic/gin': 'Gin', 'github.com/labstack/echo': 'Echo',
+    'github.com/gofiber/fiber': 'Fiber', 'github.com/gorilla/mux': 'Gorilla Mux',
+    'github.com/spf13/cobra': 'Cobra', 'gorm.io/gorm': 'GORM', 'google.golang.org/grpc': 'gRPC'
+}
+
+REQUIREMENT_NAME = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+
+def _requirement_name(spec: str) -> Optional[str]:
+    """Return the normalized package name of a PEP 508 requirement string."""
+    match = REQUIREMENT_NAME.match(spec)
+    return match.group(1).lower().replace('_', '-') if match else None
+
+def parse_requirements(text: str) -> Set[str]:
+    names = set()
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line and not line.startswith('-'):
+            name = _requirement_name(line)
+            if name:
+                names.add(name)
+    return {PYTHON_FRAMEWORKS[name] for name in names if name in PYTHON_FRAMEWORKS}
+
+def parse_pyproject(text: str) -> Set[str]:
+    if tomllib is None:
+        return parse_requirements('\n'.join(re.findall(r'["\']([A-Za-z0-9][^"\']*)["\']', text)))
+    data = tomllib.loads(text)
+    project = data.get('project', {})
+    specs = list(project.get('dependencies', []))
+    for extra in project.get('optional-dependencies', {}).values():
+        specs.extend(extra)
+    poetry = data.get('tool', {}).get('poetry', {})
+    specs.extend(poetry.get('dependencies', {}).keys())
+    specs.extend(poetry.get('dev-dependencies', {}).keys())
+    return parse_requirements('\n'.join(specs))
+
+def parse_package_json(text: str) -> Set[str]:
+    data = json.loads(text)
+    names = set()
+    for key in ('dependencies', 'devDependencies', 'peerDependencies'):
+        names.update((data.get(key) or {}).keys())
+    found = {NODE_FRAMEWORKS[name] for name in names if name in NODE_FRAMEWORKS}
+    if 'vscode' in (data.get('engines') or {}):
+        found.add('VS Code Extension')
+    return found
+
+def parse_cargo_toml(text: str) -> Set[str]:
+    if tomllib is None:
+        names = set(re.findall(r'^\s*([A-Za-z0-9_-]+)\s*=', text, re.MULTILINE))
+    else:
+        data = tomllib.loads(text)
+        names = set()
+        for key in ('dependencies', 'dev-dependencies', 'build-dependencies'):
+            names.update(data.get(key, {}).keys())
+        names.update(data.get('workspace', {}).get('dependencies', {}).keys())
+    return {RUST_FRAMEWORKS[name] for name in names if name in RUST_FRAMEWORKS}
+
+def parse_go_mod(text: str) -> Set[str]:
+    found = set()
+    for module, framework in GO_FRAMEWORKS.items():
+        if re.search(rf'^\s*(?:require\s+)?{re.escape(module)}(?:/v\d+)?\s', text, re.MULTILINE):
+            found.add(framework)
+    return found
+
+MANIFEST_PARSERS: Dict[str, Callable[[str], Set[str]]] = {
+    'requirements.txt': parse_requirements,
+    'pyproject.toml': parse_pyproject,
+    'package.json': parse_package_json,
+    'Cargo.toml': parse_cargo_toml,
+    'go.mod': parse_go_mod
+}
+
+class TechStackDetector:
+    """
+    Accumulate the technology stack of a project from the entries of a directory walk.
+
+    Feed it every walked file with `observe`; languages are weighted by the bytes of
+    source written in them and manifests at any depth (so every package of a monorepo)
+    are parsed for frameworks. Call `result` once the walk is done.
+    """
+
+    def __init__(self):
+        self.language_bytes: Dict[str, int] = {}
+        self.technologies: Dict[str, None] = {}  # Insertion-ordered set
+        self.frameworks: Dict[str, None] = {}
+
+    def observe(self, name: str, path: str, size: int):
+        """Record one walked file by its name, absolute path and size in bytes."""
+        language = EXTENSION_LANGUAGES.get(os.path.splitext(name)[1].lower())
+        if language:
+            self.language_bytes[language] = self.language_bytes.get(language, 0) + size
+        tech = FILENAME_TECH.get(name)
+        if tech:
+            self.technologies[tech] = None
+        parser = MANIFEST_PARSERS.get(name)
+        if parser and size <= MAX_MANIFEST_BYTES:
+            try:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    found = parser(f.read())
+            except Exception as e:
+                print(f"Error parsing manifest {path}: {str(e)}")
+                return
+            self.frameworks.update(dict.fromkeys(sorted(found)))
+
+    def observe_entries(self, entries: Iterable):
+        """Record the files among a batch of WalkEntry objects."""
+        for entry in entries:
+            if not entry.is_dir:
+                self.observe(os.path.basename(entry.path), entry.path, entry.size)
+
+    def observe_root(self, root_path: str):
+        """Check the root for hidden marker files that the walker skips."""
+        if os.path.exists(os.path.join(root_path, '.env')):
+            self.technologies['Environment Variables'] = None
+
+    def language_shares(self) -> Dict[str, float]:
+        """Return each language's share of the source bytes, largest first."""
+        total = sum(self.language_bytes.values())
+        if not total:
+            return {}
+        ranked = sorted(self.language_bytes.items(), key=lambda item: -item[1])
+        return {language: round(size / total, 4) for language, size in ranked}
+
+    def result(self) -> List[str]:
+        """Return languages by weight, then manifest and marker technologies, then frameworks."""
+        shares = self.language_shares()
+        languages = [language for language, share in shares.items() if share >= LANGUAGE_MIN_SHARE]
+        stack = dict.fromkeys(languages)
+        stack.update(self.technologies)
+        stack.update(self.frameworks)
+        return list(stack)
+
+async def detect_tech_stack(root_path: str) -> List[str]:
+    """
+    Detect the technology stack used in the project with a walk of its own.
+
+    `iter_file_structure` can fill a TechStackDetector during its walk instead.
+    """
+    def detect() -> List[str]:
+        detector = TechStackDetector()
+        detector.observe_root(root_path)
+        detector.observe_entries(ProjectWalker(root_path))
+        return detector.result()
+
+    try:
+        return await asyncio.to_thread(detect)
+    except Exception as e:
+        print(f"Error in detect_tech_stack: {str(e)}")
+        return []
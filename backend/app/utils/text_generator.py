@@ -1,45 +1,17 @@
 import os
 import logging
-import requests
-from typing import Dict, Any
-from dotenv import load_dotenv
-from pathlib import Path
+import threading
+from typing import Dict, Any, AsyncIterator, List, Optional
+from app.core.config import load_environment
+from app.utils.metrics import span, record_stage, usage_scope
+from app.utils.prompt_builder import count_tokens
+from app.utils.rate_limiter import AdmissionController, RateLimitExceeded, current_priority
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class TextGenerator:
-    def __init__(self):
-        # Load environment variables from the root directory
-        root_dir = Path(__file__).parent.parent.parent.parent
-        env_path = root_dir / '.env'
-        logger.info(f"Loading .env from: {env_path}")
-        
-        if not env_path.exists():
-            raise ValueError(f".env file not found at {env_path}")
-            
-        load_dotenv(env_path, override=True)  # Use override=True to ensure we use this .env file
-        self.api_key = os.getenv("GROQ_API_KEY")
-        
-        if not self.api_key:
-            raise ValueError("GROQ_API_KEY environment variable is not set")
-            
-        logger.info(f"GROQ_API_KEY loaded: {'Yes' if self.api_key else 'No'}")
-        logger.info(f"GROQ_API_KEY length: {len(self.api_key) if self.api_key else 0}")
-        logger.info(f"GROQ_API_KEY starts with 'gsk_': {self.api_key.startswith('gsk_') if self.api_key else False}")
-        
-        self.api_url = "https://api.groq.com/openai/v1/chat/completions"
-        self.model = "llama-3.3-70b-versatile"
-
-    def generate_readme(self, prompt: str) -> str:
-        """Generate README content using Groq API."""
-        try:
-            # Format the messages for the chat completion
-            messages = [
-                {
-                    "role": "system",
-                    "content": """You are a professional README generator. Create comprehensive, well-structured README files in markdown format. Follow these guidelines:
+SYSTEM_PROMPT = """You are a professional README generator. Create comprehensive, well-structured README files in markdown format. Follow these guidelines:
 1. Use emojis for section headers
 2. Include badges for technologies, version, and status
 3. Write clear, concise descriptions
@@ -50,19 +22,9 @@ class TextGenerator:
 8. Include contact information and social links
 9. Add a license section
 10. Make it visually appealing with proper spacing and organization"""
-                },
-                {
-                    "role": "user",
-                    "content": f"""Write a professional README.md file for the following project:
-
-{prompt}
-
-Write three versions:
-1. Professional (formal, detailed with badges, emojis, and comprehensive sections)
-2. Modern (developer-friendly with a focus on quick setup and usage)
-3. Minimal (concise but complete with essential information)
 
-Each version should include:
+# Sections and formatting every README variant should follow
+README_GUIDELINES = """Each version should include:
 - Title with badges (build status, version, etc.)
 - Description with emojis
 - Features list
@@ -81,7 +43,56 @@ Use proper markdown formatting:
 - - for lists
 - ** for bold text
 - _ for italics
-- [text](url) for links
+- [text](url) for links"""
+
+# Output budget for a single variant, versus 8192 tokens for all three at once
+VARIANT_MAX_TOKENS = int(os.getenv("LLM_VARIANT_MAX_TOKENS", "3072"))
+
+# Style descriptions for the three README variants, in "Option N" order
+VARIANT_STYLES = {
+    "Professional": "formal, detailed with badges, emojis, and comprehensive sections",
+    "Modern": "developer-friendly with a focus on quick setup and usage",
+    "Minimal": "concise but complete with essential information"
+}
+
+# Completion tokens reserved against the TPM limit before the actual usage is known
+EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "2048"))
+
+# Admission pause after an upstream 429 without a Retry-After header
+DEFAULT_RATE_LIMIT_PAUSE = 5.0
+
+class ProviderNotConfigured(Exception):
+    """Raised when the configured LLM provider cannot be created (e.g. a missing API key)."""
+
+class TextGenerator:
+    def __init__(self):
+        # The provider module pulls in the HTTP client stack, so import it on first use
+        from app.utils.llm_providers import create_provider
+
+        try:
+            self.provider = create_provider()
+        except ValueError as e:
+            raise ProviderNotConfigured(str(e)) from e
+        self.model = self.provider.model
+        self.admission = AdmissionController.from_env()
+        logger.info(f"Using {self.provider.name} LLM provider with model: {self.model}")
+
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages sent for a README generation prompt."""
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": f"""Write a professional README.md file for the following project:
+
+{prompt}
+
+Write three versions:
+1. Professional (formal, detailed with badges, emojis, and comprehensive sections)
+2. Modern (developer-friendly with a focus on quick setup and usage)
+3. Minimal (concise but complete with essential information)
+
+{README_GUIDELINES}
 
 Format as:
 Option 1: [Professional]
@@ -92,47 +103,164 @@ Option 2: [Modern]
 
 Option 3: [Minimal]
 [content]"""
-                }
-            ]
-
-            # Make the API request
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
             }
-            
-            data = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 8192,  # Increased for longer responses
-                "top_p": 0.95,
-                "stream": False
+        ]
+
+    def _build_variant_messages(self, prompt: str, style: str) -> List[Dict[str, str]]:
+        """Build the chat messages for generating a single README variant."""
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": f"""Write a professional README.md file for the following project:
+
+{prompt}
+
+Write the {style} version ({VARIANT_STYLES[style]}).
+
+{README_GUIDELINES.replace('Each version', 'The README')}
+
+Return only the README markdown, without any "Option" heading or preamble."""
             }
+        ]
 
-            logger.info(f"Sending request to Groq API with model: {self.model}")
-            logger.info(f"Request URL: {self.api_url}")
-            logger.info(f"Request headers: {headers}")
-            
-            response = requests.post(self.api_url, headers=headers, json=data, verify=False)
-            
-            if response.status_code != 200:
-                logger.error(f"Groq API error: {response.status_code} - {response.text}")
-                raise Exception(f"Groq API error: {response.status_code} - {response.text}")
-            
-            # Extract the generated text from the response
-            response_data = response.json()
-            if "choices" not in response_data or not response_data["choices"]:
-                raise Exception("Invalid response format from Groq API")
-                
-            generated_text = response_data["choices"][0]["message"]["content"]
-            logger.info("Successfully generated README using Groq API")
-            
-            return generated_text
+    def build_payload(self, prompt: str, stream: bool = False) -> Dict[str, Any]:
+        """Build the JSON body for a chat completion request."""
+        return {
+            "model": self.model,
+            "messages": self._build_messages(prompt),
+            "temperature": 0.7,
+            "max_tokens": 8192,  # Increased for longer responses
+            "top_p": 0.95,
+            "stream": stream
+        }
+
+    def build_variant_payload(self, prompt: str, style: str) -> Dict[str, Any]:
+        """Build the JSON body for generating one README variant."""
+        return {
+            "model": self.model,
+            "messages": self._build_variant_messages(prompt, style),
+            "temperature": 0.7,
+            "max_tokens": VARIANT_MAX_TOKENS,
+            "top_p": 0.95,
+            "stream": False
+        }
+
+    def build_update_payload(self, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        """Build the JSON body for revising the sections of an existing README a change affects."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"""{prompt}
+
+Revise the sections above so they match the changes, keeping their style, tone and formatting.
+Return each revised section, heading included, after its "=== Section N ===" marker. Leave out
+sections that need no change, and return a marker with no content to delete a section. If the
+changes need a section the README lacks, add it after a "=== New ===" marker. Return nothing else."""
+                }
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens,
+            "top_p": 0.95,
+            "stream": False
+        }
 
+    async def generate_readme(self, prompt: str) -> str:
+        """Generate README content using Groq API."""
+        return await self.complete(self.build_payload(prompt))
+
+    async def generate_variant(self, prompt: str, style: str) -> str:
+        """Generate a single README variant in the given style."""
+        return await self.complete(self.build_variant_payload(prompt, style))
+
+    def estimate_tokens(self, payload: Dict[str, Any]) -> int:
+        """Estimate the tokens a payload will use, for the TPM admission budget."""
+        prompt_tokens = sum(count_tokens(message["content"]) for message in payload["messages"])
+        return prompt_tokens + min(payload.get("max_tokens", EXPECTED_COMPLETION_TOKENS), EXPECTED_COMPLETION_TOKENS)
+
+    def _rate_limited(self, error: Exception) -> RateLimitExceeded:
+        """Pause admissions after an upstream 429 and turn it into RateLimitExceeded."""
+        retry_after = getattr(error, "retry_after", None) or DEFAULT_RATE_LIMIT_PAUSE
+        self.admission.penalize(retry_after)
+        return RateLimitExceeded(f"{self.provider.name} rate limit reached", retry_after)
+
+    async def complete(self, payload: Dict[str, Any], priority: Optional[int] = None, timeout: Optional[float] = None) -> str:
+        """
+        Send a chat completion payload and return the generated text.
+
+        The call first waits for admission (see AdmissionController) at `priority`
+        (defaulting to the one set by `priority_scope`), for at most `timeout` seconds. Raises RateLimitExceeded if it is shed or the
+        provider still answers 429 after retries.
+        """
+        priority = current_priority() if priority is None else priority
+        ticket = await self.admission.acquire(self.estimate_tokens(payload), priority, timeout)
+        try:
+            logger.info(f"Sending request to {self.provider.name} provider with model: {self.model}")
+            with usage_scope() as usage, span("llm_total", provider=self.provider.name) as timer:
+                generated_text = await self.provider.complete(payload)
+            ticket.settle(sum(usage.values()) or None)
+            logger.info(f"Successfully generated README using {self.provider.name} provider in {timer.elapsed:.2f}s")
+            return generated_text
         except Exception as e:
+            if getattr(e, "status_code", None) == 429:
+                raise self._rate_limited(e) from e
             logger.error(f"Error generating README: {str(e)}")
             raise Exception(f"Failed to generate README: {str(e)}")
 
-# Create a singleton instance
-text_generator = TextGenerator() 
\ No newline at end of file
+    async def stream_readme(self, prompt: str, priority: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Stream README content from the provider, yielding text deltas as they arrive.
+
+        Waits for admission like `complete`. Records the time to the first token
+        (`llm_ttft`) and to the end of the stream (`llm_total`).
+        """
+        payload = self.build_payload(prompt, stream=True)
+        priority = current_priority() if priority is None else priority
+        ticket = await self.admission.acquire(self.estimate_tokens(payload), priority)
+        logger.info(f"Sending streaming request to {self.provider.name} provider with model: {self.model}")
+        try:
+            with usage_scope() as usage, span("llm_total", provider=self.provider.name) as timer:
+                first = True
+                async for delta in self.provider.stream(payload):
+                    if first:
+                        first = False
+                        record_stage("llm_ttft", timer.lap(), provider=self.provider.name)
+                    yield delta
+        except Exception as e:
+            if getattr(e, "status_code", None) == 429:
+                raise self._rate_limited(e) from e
+            raise
+        ticket.settle(sum(usage.values()) or None)
+        logger.info(f"Finished streaming README from {self.provider.name} provider in {timer.elapsed:.2f}s")
+
+    async def aclose(self):
+        """Release pooled upstream connections."""
+        await self.provider.aclose()
+
+_text_generator: Optional[TextGenerator] = None
+_text_generator_lock = threading.Lock()
+
+def get_text_generator() -> TextGenerator:
+    """
+    Return the shared TextGenerator, creating it on first use.
+
+    Raises ProviderNotConfigured if the provider settings are incomplete; the app still
+    starts and serves analysis endpoints in that case.
+    """
+    global _text_generator
+    if _text_generator is None:
+        with _text_generator_lock:
+            if _text_generator is None:
+                load_environment()
+                _text_generator = TextGenerator()
+    return _text_generator
+
+async def close_text_generator():
+    """Release the shared generator's connections, if it was ever created."""
+    global _text_generator
+    if _text_generator is not None:
+        await _text_generator.aclose()
+        _text_generator = None
@@ -0,0 +1,111 @@
+"""
+Analyzer throughput and memory benchmark.
+
+Generates a synthetic repository (see benchmarks/synthetic_repo.py) in a temporary
+directory and measures, over several runs:
+
+- get_file_structure with a cold analysis index and with a warm one
+- detect_tech_stack
+- analyze_python_file on every generated Python file
+
+Each measurement reports wall time, throughput (entries or files per second) and peak
+traced memory (tracemalloc), plus the process's peak RSS. Results are printed as JSON, and written to --output
+for regression tracking.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_analyzer --files 2000 --depth 4 --runs 3
+    python -m benchmarks.bench_analyzer --files 20000 --output results/analyzer.json
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict
+
+from benchmarks.common import environment_info, summarize, peak_rss_mb, write_results
+from benchmarks.synthetic_repo import generate_repo
+
+def measure(fn: Callable[[], object], runs: int, units: int) -> Dict[str, object]:
+    """
+    Run `fn` `runs` times, reporting seconds and units per second, then once more
+    under tracemalloc for its peak allocation in this process (worker processes of the
+    parser pool are not traced).
+    """
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "seconds": summarize(seconds),
+        "per_second": round(units / min(seconds), 1) if min(seconds) > 0 else None,
+        "peak_traced_mb": round(peak / (1024 * 1024), 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--functions-per-file", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        repo = os.path.join(workdir, "repo")
+        index_path = os.path.join(workdir, "index.sqlite3")
+        # The analyzer reads its settings at import, so configure it first
+        os.environ["ANALYSIS_INDEX_PATH"] = index_path
+        os.environ.setdefault("ANALYZER_MAX_ENTRIES", str(args.files * 4))
+
+        from app.utils.analysis_index import analysis_index
+        from app.utils.code_analyzer import get_file_structure, analyze_python_file, shutdown_executors
+        from app.utils.tech_stack import detect_tech_stack
+
+        shape = generate_repo(repo, args.files, args.depth, args.fanout, args.functions_per_file, seed=args.seed)
+        python_files = [str(path) for path in Path(repo).rglob("*.py") if "build" not in path.parts]
+        entries = shape["files"] + shape["directories"]
+
+        def cold_structure():
+            analysis_index.clear()
+            asyncio.run(get_file_structure(repo))
+
+        def warm_structure():
+            asyncio.run(get_file_structure(repo))
+
+        def parse_python():
+            for path in python_files:
+                analyze_python_file(path)
+
+        results = {
+            "benchmark": "analyzer",
+            "environment": environment_info(),
+            "repo": shape,
+            "runs": args.runs,
+            "get_file_structure_cold": measure(cold_structure, args.runs, entries),
+            "get_file_structure_warm": measure(warm_structure, args.runs, entries),
+            "detect_tech_stack": measure(lambda: asyncio.run(detect_tech_stack(repo)), args.runs, entries),
+            "analyze_python_file": {
+                "files": len(python_files),
+                **measure(parse_python, args.runs, len(python_files))
+            },
+            "peak_rss_mb": peak_rss_mb()
+        }
+        shutdown_executors()
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
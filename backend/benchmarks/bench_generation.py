@@ -0,0 +1,129 @@
+"""
+README generation load benchmark against the fake LLM server.
+
+Starts fake_llm_server.py in-process with a configurable upstream latency, points the
+Groq provider at it and calls generate_readme_endpoint directly at each concurrency
+level. Every request uses a distinct project so the response cache and single-flight
+coalescing do not hide upstream calls (pass --same-project to measure them instead).
+
+Reports throughput and latency percentiles per level as JSON, and writes them to
+--output for regression tracking.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_generation --latency 0.5 --concurrency 1 8 32 --requests 64
+    python -m benchmarks.bench_generation --mode per_variant --output results/generation.json
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import threading
+from typing import Dict, List
+
+from benchmarks.common import environment_info, percentiles, write_results
+from fake_llm_server import make_server
+
+def project_payload(index: int, mode: str, files: int) -> Dict[str, object]:
+    file_structure = [
+        {"path": f"src/module_{n}.py", "type": "file", "functions": [
+            {"name": f"handler_{n}", "description": "Handle a request.", "parameters": ["request"]}
+        ]}
+        for n in range(files)
+    ]
+    return {
+        "project_name": f"bench-project-{index}",
+        "description": "A synthetic project for load testing.",
+        "tech_stack": ["Python", "FastAPI"],
+        "file_structure": file_structure,
+        "functions": [],
+        "generation_mode": mode
+    }
+
+async def run_level(endpoint, ProjectDetails, concurrency: int, requests: int, mode: str, files: int, same_project: bool) -> Dict[str, object]:
+    """Issue `requests` calls with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    # Unique per level, so levels do not hit each other's cache entries
+    offset = int(time.time() * 1000) * 1000
+
+    async def one(index: int):
+        project = ProjectDetails(**project_payload(0 if same_project else offset + index, mode, files))
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await endpoint(project)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                name = type(e).__name__
+                errors[name] = errors.get(name, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(index) for index in range(requests)])
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "latency_s": percentiles(latencies) if latencies else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake upstream seconds per request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level")
+    parser.add_argument("--mode", choices=["combined", "per_variant"], default="combined")
+    parser.add_argument("--files", type=int, default=50, help="Files in each synthetic project")
+    parser.add_argument("--same-project", action="store_true", help="Send identical requests (cache and coalescing)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    server = make_server(port=args.port, latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Settings are read at import, so configure the backend before importing it
+    os.environ["LLM_PROVIDER"] = "groq"
+    os.environ["GROQ_API_KEY"] = "benchmark"
+    os.environ["GROQ_API_URL"] = f"http://127.0.0.1:{args.port}/v1/chat/completions"
+    os.environ["LLM_MAX_CONCURRENCY"] = os.getenv("LLM_MAX_CONCURRENCY", str(max(args.concurrency) * 3))
+    os.environ["LLM_MAX_CONNECTIONS"] = os.getenv("LLM_MAX_CONNECTIONS", str(max(args.concurrency) * 3))
+    if not args.same_project:
+        os.environ["README_CACHE_ENABLED"] = "false"
+
+    from app.api.routes import generate_readme_endpoint
+    from app.core.models import ProjectDetails
+    from app.utils.text_generator import close_text_generator
+
+    async def run_all() -> List[Dict[str, object]]:
+        try:
+            return [
+                await run_level(generate_readme_endpoint, ProjectDetails, level, args.requests, args.mode, args.files, args.same_project)
+                for level in args.concurrency
+            ]
+        finally:
+            await close_text_generator()
+
+    levels = asyncio.run(run_all())
+    server.shutdown()
+
+    results = {
+        "benchmark": "generation",
+        "environment": environment_info(),
+        "upstream_latency_s": args.latency,
+        "mode": args.mode,
+        "files_per_project": args.files,
+        "same_project": args.same_project,
+        "levels": levels
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Startup-time benchmark for the FastAPI app.
+
+Each run starts a fresh interpreter, imports app.main, runs the lifespan startup and
+serves one /api/analyze-project request, so the numbers reflect what a new uvicorn
+worker pays before it can take traffic. Results are printed as JSON.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --runs 10 --without-api-key
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+PROBE = r"""
+import json, time
+from fastapi.testclient import TestClient
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+with TestClient(app.main.app) as client:
+    started = time.perf_counter()
+    response = client.post("/api/analyze-project", json={"project_path": ".", "max_depth": 0})
+    served = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - start,
+    "lifespan_s": started - imported,
+    "first_request_s": served - started,
+    "status": response.status_code
+}))
+"""
+
+def run_once(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def summarize(values: list) -> dict:
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "max": max(values)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--without-api-key", action="store_true", help="Start with GROQ_API_KEY unset")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.without_api_key:
+        # An empty value is not overridden by .env files, so this simulates a missing key
+        env["GROQ_API_KEY"] = ""
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    print(json.dumps({
+        "benchmark": "startup",
+        "runs": args.runs,
+        "without_api_key": args.without_api_key,
+        "statuses": sorted({run["status"] for run in runs}),
+        "import_s": summarize([run["import_s"] for run in runs]),
+        "lifespan_s": summarize([run["lifespan_s"] for run in runs]),
+        "first_request_s": summarize([run["first_request_s"] for run in runs])
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
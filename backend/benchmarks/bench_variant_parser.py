@@ -0,0 +1,96 @@
+"""
+README variant parser throughput benchmark over large synthetic responses.
+
+For each variant size, generates a three-variant response (see
+benchmarks/synthetic_response.py) and measures:
+
+- `parse_variants` on the complete text
+- `OptionSplitter` fed the text in streamed chunks (tokens of up to --max-chunk
+  characters), including the time until the first variant is emitted
+- the previous `split("Option ")` post-processing, for reference
+
+Chunking is done up front so only parsing is timed. Reports MB/s and peak traced
+memory (tracemalloc) as JSON, and writes them to --output for regression tracking.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_variant_parser --variant-bytes 10000 100000 1000000
+    python -m benchmarks.bench_variant_parser --runs 5 --output results/variant_parser.json
+"""
+import json
+import time
+import argparse
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.common import environment_info, summarize, write_results
+from benchmarks.synthetic_response import generate_response, chunk_stream
+from benchmarks.fuzz_variant_parser import legacy_split
+from app.utils.readme_parser import OptionSplitter, parse_variants
+
+def measure(fn: Callable[[], object], runs: int, size_bytes: int) -> Dict[str, object]:
+    """Run `fn` `runs` times for MB/s, then once more under tracemalloc for peak memory."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "seconds": summarize(seconds),
+        "mb_per_second": round(size_bytes / (1024 * 1024) / min(seconds), 1) if min(seconds) > 0 else None,
+        "peak_traced_mb": round(peak / (1024 * 1024), 2)
+    }
+
+def stream(chunks: List[str]) -> Dict[str, float]:
+    """Feed chunks through a splitter, returning when the first variant came out."""
+    splitter = OptionSplitter()
+    start = time.perf_counter()
+    first = None
+    for chunk in chunks:
+        if splitter.feed(chunk) and first is None:
+            first = time.perf_counter() - start
+    splitter.close()
+    return {"first_variant_s": first}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variant-bytes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--max-chunk", type=int, default=8, help="Largest streamed chunk, in characters")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    sizes = []
+    for variant_bytes in args.variant_bytes:
+        text, _ = generate_response(args.seed, variants=3, variant_bytes=variant_bytes)
+        chunks = list(chunk_stream(text, args.seed, args.max_chunk))
+        size = len(text.encode("utf-8"))
+        sizes.append({
+            "variant_bytes": variant_bytes,
+            "response_bytes": size,
+            "chunks": len(chunks),
+            "parse_variants": measure(lambda: parse_variants(text), args.runs, size),
+            "streamed": {
+                **measure(lambda: stream(chunks), args.runs, size),
+                **stream(chunks)
+            },
+            "legacy_split": measure(lambda: legacy_split(text), args.runs, size)
+        })
+
+    results = {
+        "benchmark": "variant_parser",
+        "environment": environment_info(),
+        "max_chunk": args.max_chunk,
+        "runs": args.runs,
+        "sizes": sizes
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Shared helpers for the benchmark scripts."""
+import os
+import sys
+import json
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Min, median and max of a list of measurements, rounded for readability."""
+    return {
+        "min": round(min(values), 6),
+        "median": round(statistics.median(values), 6),
+        "max": round(max(values), 6)
+    }
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """p50/p90/p99 and max of latency samples."""
+    ordered = sorted(values)
+
+    def at(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 6)
+
+    return {"p50": at(0.5), "p90": at(0.9), "p99": at(0.99), "max": round(ordered[-1], 6)}
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, in MiB (0 where unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def environment_info() -> Dict[str, object]:
+    """Describe where the benchmark ran, so results from different machines are not compared blindly."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+def write_results(path: str, results: Dict[str, object]):
+    """Write benchmark results as JSON, creating parent directories."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,153 @@
+"""
+Fuzz the README variant parser against synthetic model responses.
+
+For each seed, generates a response (see benchmarks/synthetic_response.py) and checks
+that parsing it whole with `parse_variants` and streaming it in random chunks through
+`OptionSplitter` both give exactly the expected variants (content and style). The
+hand-written REGRESSIONS are checked first. The previous `split("Option ")`
+post-processing is scored on the same inputs for comparison: it counts as correct
+when it splits in the right places, since it always kept header labels, separators
+and wrappers in the content.
+
+Prints a JSON summary and exits non-zero on the first mismatch, printing the seed so
+it can be reproduced with `python -m benchmarks.synthetic_response --seed N`.
+
+Usage (from the backend directory):
+    python -m benchmarks.fuzz_variant_parser --iterations 2000
+    python -m benchmarks.fuzz_variant_parser --seed 1234 --iterations 1 --max-chunk 1
+    python -m benchmarks.fuzz_variant_parser --plain     # without adversarial "Option" lines
+"""
+import sys
+import json
+import argparse
+from typing import List, Tuple
+
+from benchmarks.synthetic_response import generate_response, chunk_stream
+from app.utils.readme_parser import OptionSplitter, parse_variants
+
+# Hand-written responses that once split in the wrong place: (response, expected variants)
+REGRESSIONS = [
+    (
+        "Option 1: [Professional]\n# Tool\n\n## Installation\n\n### Option 1: Install with pip\n\npip install tool\n\n"
+        "### Option 2: Run with Docker\n\ndocker run tool\n\nOption 2: [Modern]\n# Tool\n\nFast.\n\n"
+        "Option 3: [Minimal]\n# Tool\n",
+        [
+            ("Professional", "# Tool\n\n## Installation\n\n### Option 1: Install with pip\n\npip install tool\n\n"
+                             "### Option 2: Run with Docker\n\ndocker run tool"),
+            ("Modern", "# Tool\n\nFast."),
+            ("Minimal", "# Tool")
+        ]
+    ),
+    (
+        "Option 1:\n# Tool\n\n```\nOption 2\nmore\n```\n\nOption 2:\n# Two\n\nOption 3:\n# Three\n",
+        [
+            ("Professional", "# Tool\n\n```\nOption 2\nmore\n```"),
+            ("Modern", "# Two"),
+            ("Minimal", "# Three")
+        ]
+    ),
+    (
+        "Option 1: [Modern]\n```markdown\n# Tool\n\n```\ncode\n```\n```\n\nOption 2: [Minimal]\n# Two\n\nOption 3:\n# Three\n",
+        [
+            ("Modern", "# Tool\n\n```\ncode\n```"),
+            ("Minimal", "# Two"),
+            ("Minimal", "# Three")
+        ]
+    ),
+    (
+        "Here are the three versions:\n\nOption 1: Professional and formal\n# Tool\n\nA tool.\n\n"
+        "Option 2: Modern and developer-friendly\n# Tool 🚀\n\nFast.\n\n"
+        "Option 3: Minimal and clean\n# Tool\n",
+        [
+            ("Professional", "# Tool\n\nA tool."),
+            ("Modern", "# Tool 🚀\n\nFast."),
+            ("Minimal", "# Tool")
+        ]
+    )
+]
+
+def legacy_split(text: str) -> List[Tuple[str, str]]:
+    """The post-processing /generate-readme used before the incremental parser."""
+    styles = ["Professional", "Modern", "Minimal"]
+    variants = []
+    for i, option in enumerate(text.split("Option ")[1:]):
+        content = option[2:].strip() if len(option) > 2 else option.strip()
+        variants.append((styles[i] if i < len(styles) else f"Style {i+1}", content))
+    return variants
+
+def legacy_split_correct(text: str, expected: List[Tuple[str, str]]) -> bool:
+    """Whether the legacy split found the expected variants, each within one of its parts."""
+    variants = legacy_split(text.replace("\r\n", "\n"))
+    return len(variants) == len(expected) and all(
+        wanted in content for (_, content), (_, wanted) in zip(variants, expected)
+    )
+
+def check(seed: int, max_chunk: int, variant_bytes: int, adversarial: bool = True) -> Tuple[List[str], bool]:
+    """Return the parser's mismatches for one seed, and whether the legacy split got it right."""
+    text, expected = generate_response(seed, variants=3, variant_bytes=variant_bytes, adversarial=adversarial)
+    return check_response(text, expected, seed, max_chunk)
+
+def check_response(text: str, expected: List[Tuple[str, str]], seed: int, max_chunk: int) -> Tuple[List[str], bool]:
+    """Parse one response whole and streamed (chunked by `seed`) and compare with `expected`."""
+    errors = []
+
+    whole = [(variant.style, variant.content) for variant in parse_variants(text)]
+    if whole != expected:
+        errors.append(_describe("whole", whole, expected))
+
+    splitter = OptionSplitter()
+    streamed = []
+    for chunk in chunk_stream(text, seed, max_chunk):
+        streamed.extend(splitter.feed(chunk))
+    streamed.extend(splitter.close())
+    streamed = [(variant.style, variant.content) for variant in streamed]
+    if streamed != expected:
+        errors.append(_describe("streamed", streamed, expected))
+
+    return errors, legacy_split_correct(text, expected)
+
+def _describe(mode: str, got: List[Tuple[str, str]], expected: List[Tuple[str, str]]) -> str:
+    if len(got) != len(expected):
+        return f"{mode}: {len(got)} variants, expected {len(expected)}"
+    for index, (actual, wanted) in enumerate(zip(got, expected)):
+        if actual != wanted:
+            if actual[0] != wanted[0]:
+                return f"{mode}: variant {index + 1} style {actual[0]!r}, expected {wanted[0]!r}"
+            return f"{mode}: variant {index + 1} content differs ({len(actual[1])} vs {len(wanted[1])} chars)"
+    return f"{mode}: mismatch"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="First seed")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--max-chunk", type=int, default=12, help="Largest streamed chunk, in characters")
+    parser.add_argument("--variant-bytes", type=int, default=1500)
+    parser.add_argument("--plain", action="store_true", help="Leave out the adversarial \"Option\" lines")
+    args = parser.parse_args()
+
+    for index, (text, expected) in enumerate(REGRESSIONS):
+        errors, _ = check_response(text, expected, args.seed, args.max_chunk)
+        if errors:
+            print(json.dumps({"regression": index, "errors": errors}, indent=2))
+            sys.exit(1)
+
+    legacy_correct = 0
+    for seed in range(args.seed, args.seed + args.iterations):
+        errors, legacy_ok = check(seed, args.max_chunk, args.variant_bytes, not args.plain)
+        legacy_correct += legacy_ok
+        if errors:
+            print(json.dumps({"seed": seed, "errors": errors}, indent=2))
+            sys.exit(1)
+
+    print(json.dumps({
+        "benchmark": "fuzz_variant_parser",
+        "iterations": args.iterations,
+        "first_seed": args.seed,
+        "adversarial": not args.plain,
+        "regressions": len(REGRESSIONS),
+        "parser_failures": 0,
+        "legacy_split_correct": legacy_correct
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Synthetic repository generator for the analyzer benchmarks.
+
+Builds a deterministic (seeded) project tree of a given size and shape: `files` source
+files spread over directories `depth` levels deep with `fanout` subdirectories each,
+in a mix of languages, plus manifests, a .gitignore and an ignored build directory so
+the walker's pruning is exercised too.
+
+Usage (from the backend directory):
+    python -m benchmarks.synthetic_repo /tmp/synth --files 5000 --depth 4 --fanout 4
+"""
+import os
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+# Share of generated files per extension
+DEFAULT_MIX = {'.py': 0.6, '.ts': 0.2, '.go': 0.1, '.md': 0.1}
+
+PYTHON_TEMPLATE = '''"""Module {name}."""
+import os
+from typing import List
+
+
+class {cls}:
+    """Handles {name} records."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+{methods}
+
+{functions}
+'''
+
+PYTHON_METHOD = '''    def {name}(self, value: int, *args, flag: bool = False) -> List[int]:
+        """Compute {name} for a value."""
+        result = [value] * {n}
+        return helper_{n}(result)
+'''
+
+PYTHON_FUNCTION = '''def helper_{n}(items: List[int]) -> List[int]:
+    """Return the items, doubled."""
+    return [item * 2 for item in items if os.path.sep]
+
+
+async def fetch_{n}(url: str, retries: int = 3) -> str:
+    for _ in range(retries):
+        pass
+    return url
+'''
+
+TS_FUNCTION = '''/**
+ * Handle request {n}.
+ */
+export async function handle{n}(req: Request, limit = 10): Promise<Response> {{
+  return new Response(String(limit));
+}}
+
+export const format{n} = (value: number, unit: string): string => `${{value}}${{unit}}`;
+'''
+
+GO_FUNCTION = '''// Process{n} processes a batch.
+func (s *Service) Process{n}(ctx context.Context, items []string) (int, error) {{
+	return len(items), nil
+}}
+'''
+
+def _python_source(name: str, size: int) -> str:
+    methods = '\n'.join(PYTHON_METHOD.format(name=f"method_{i}", n=i) for i in range(size))
+    functions = '\n\n'.join(PYTHON_FUNCTION.format(n=i) for i in range(size))
+    return PYTHON_TEMPLATE.format(name=name, cls=name.title().replace('_', ''), methods=methods, functions=functions)
+
+def _source(extension: str, name: str, size: int) -> str:
+    if extension == '.py':
+        return _python_source(name, size)
+    if extension == '.ts':
+        return '\n'.join(TS_FUNCTION.format(n=i) for i in range(size))
+    if extension == '.go':
+        return 'package main\n\n' + '\n'.join(GO_FUNCTION.format(n=i) for i in range(size))
+    return f"# {name}\n\n" + "Some documentation.\n" * size
+
+def _directories(depth: int, fanout: int) -> List[str]:
+    dirs = ['']
+    level = ['']
+    for _ in range(depth):
+        level = [os.path.join(parent, f"pkg{i}") for parent in level for i in range(fanout)]
+        dirs.extend(level)
+    return dirs
+
+def generate_repo(
+    root: str,
+    files: int = 1000,
+    depth: int = 3,
+    fanout: int = 4,
+    functions_per_file: int = 5,
+    mix: Dict[str, float] = None,
+    seed: int = 0
+) -> Dict[str, int]:
+    """Write a synthetic project under `root` and return counts of what was written."""
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    extensions, weights = zip(*mix.items())
+    root_path = Path(root)
+    dirs = _directories(depth, fanout)
+    for directory in dirs:
+        (root_path / directory).mkdir(parents=True, exist_ok=True)
+
+    total_bytes = 0
+    counts: Dict[str, int] = {}
+    for index in range(files):
+        extension = rng.choices(extensions, weights)[0]
+        directory = rng.choice(dirs)
+        name = f"module_{index}"
+        content = _source(extension, name, max(1, int(rng.gauss(functions_per_file, functions_per_file / 3))))
+        (root_path / directory / f"{name}{extension}").write_text(content)
+        total_bytes += len(content)
+        counts[extension] = counts.get(extension, 0) + 1
+
+    (root_path / 'requirements.txt').write_text("fastapi>=0.100\nuvicorn\npydantic\n")
+    (root_path / 'package.json').write_text(json.dumps({"dependencies": {"react": "^18.0.0"}}))
+    (root_path / '.gitignore').write_text("build/\n*.log\n")
+    # Ignored output that the walker should never enter
+    build = root_path / 'build'
+    build.mkdir(exist_ok=True)
+    for index in range(min(files, 200)):
+        (build / f"artifact_{index}.py").write_text("x = 1\n")
+
+    return {"files": files, "directories": len(dirs), "bytes": total_bytes, "by_extension": counts}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--functions-per-file", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(json.dumps(generate_repo(
+        args.root, args.files, args.depth, args.fanout, args.functions_per_file, seed=args.seed
+    ), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Synthetic model responses for the variant parser fuzz and benchmark scripts.
+
+Builds a deterministic (seeded) response with "Option N" variants in the many shapes
+models produce: bold, heading or plain headers with bracketed, parenthesised or bare
+style labels (alone or followed by a description such as "Professional and formal"),
+an optional preamble, "---" separators, ```markdown wrappers and CRLF
+line endings. Variant bodies are markdown with headings, lists and code fences, and
+(when `adversarial`) lines that mention "Option" without being headers: "### Option N:
+Install with ..." subheadings numbered like the next variant, and header-shaped lines
+(bare, bold or labelled) inside code blocks. Returns the response and the variants a
+correct parser must produce.
+
+Usage (from the backend directory):
+    python -m benchmarks.synthetic_response --seed 3 --variant-bytes 2000
+"""
+import random
+import argparse
+from typing import Iterator, List, Tuple
+
+STYLES = ["Professional", "Modern", "Minimal"]
+# The descriptions README_INSTRUCTIONS asks for, which models echo after the style
+DESCRIPTIONS = {
+    "Professional": "and formal",
+    "Modern": "and developer-friendly",
+    "Minimal": "and clean"
+}
+
+# Header shapes: (template, whether the label names the style). A header either starts
+# with a known style, possibly followed by its description, or has nothing after the number.
+HEADERS = [
+    ("Option {n}: [{style}]", True),
+    ("**Option {n}: {style}**", True),
+    ("## Option {n}: {style} README", True),
+    ("Option {n} - ({style})", True),
+    ("Option {n}: {style} {description}", True),
+    ("**Option {n}: {style} {description}**", True),
+    ("### Option {n}: [{style}] - {description}", True),
+    ("### Option {n}", False),
+    ("**Option {n}:**", False),
+    ("Option {n}:", False)
+]
+
+PREAMBLES = [
+    "",
+    "Here are three README versions for your project:\n\n",
+    "Sure! Below are the READMEs.\n\n---\n\n"
+]
+
+WORDS = (
+    "project install run configure deploy server client module api cache token stream "
+    "build test release docker python node option version feature support quick setup"
+).split()
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(5, 14))]
+    return " ".join(words).capitalize() + "."
+
+def _body(rng: random.Random, number: int, target_bytes: int, adversarial: bool) -> List[str]:
+    """Markdown lines for one variant, about `target_bytes` long."""
+    lines = [f"# Project {number}", "", _sentence(rng)]
+    size = sum(len(line) + 1 for line in lines)
+    while size < target_bytes:
+        kind = rng.random()
+        if kind < 0.3:
+            block = ["", f"## {rng.choice(WORDS).capitalize()} {rng.choice(WORDS)}", "", _sentence(rng)]
+        elif kind < 0.55:
+            block = [""] + [f"- {_sentence(rng)}" for _ in range(rng.randint(2, 5))]
+        elif kind < 0.75:
+            fence = rng.choice(["```", "~~~", "````"])
+            code = [f"{rng.choice(WORDS)} --{rng.choice(WORDS)} {rng.randint(0, 99)}" for _ in range(rng.randint(1, 4))]
+            if adversarial:
+                # Header forms inside a code block are content
+                code.append(f"Option {number + 1}: --{rng.choice(WORDS)} enables {rng.choice(WORDS)}")
+                code.append("# Option 2: a comment")
+                code.append(rng.choice([
+                    f"Option {number + 1}",
+                    f"**Option {number + 1}:**",
+                    f"Option {number + 1}: [{rng.choice(STYLES)}]"
+                ]))
+            block = ["", fence + rng.choice(["bash", "python", ""])] + code + [fence]
+        elif adversarial and kind < 0.85:
+            # README headings for alternative install methods, numbered like variant headers
+            block = ["", f"### Option {number}: Install with {rng.choice(WORDS)}", "", _sentence(rng),
+                     "", f"### Option {number + 1}: Run with {rng.choice(WORDS)}", "", _sentence(rng)]
+        elif adversarial:
+            block = ["", rng.choice([
+                f"Option {number + 1}: use {rng.choice(WORDS)} instead of {rng.choice(WORDS)}.",
+                f"Option {number}: {_sentence(rng)}",
+                "Option 1 is the default; see Option 3 for details.",
+                "**Option A:** run it locally.",
+                f"Set the Option {rng.randint(1, 9)} flag to enable caching."
+            ])]
+        else:
+            block = ["", _sentence(rng)]
+        lines.extend(block)
+        size += sum(len(line) + 1 for line in block)
+    return lines
+
+def generate_response(
+    seed: int,
+    variants: int = 3,
+    variant_bytes: int = 1500,
+    adversarial: bool = True
+) -> Tuple[str, List[Tuple[str, str]]]:
+    """Return a response and its expected `(style, content)` variants."""
+    rng = random.Random(seed)
+    crlf = rng.random() < 0.2
+    separator = rng.random() < 0.4
+    parts = [rng.choice(PREAMBLES)]
+    expected = []
+    for index in range(variants):
+        template, labelled = rng.choice(HEADERS)
+        style = rng.choice(STYLES) if labelled else (STYLES[index] if index < len(STYLES) else f"Style {index + 1}")
+        body = _body(rng, index + 1, variant_bytes, adversarial)
+        wrapped = rng.random() < 0.2
+        content_lines = (["```markdown"] + body + ["```"]) if wrapped else body
+        parts.append(template.format(n=index + 1, style=style, description=DESCRIPTIONS.get(style, "")) + "\n")
+        parts.append("\n".join(content_lines) + "\n\n")
+        if separator and index + 1 < variants:
+            parts.append("---\n\n")
+        expected.append((style, "\n".join(body).strip()))
+    text = "".join(parts)
+    if crlf:
+        text = text.replace("\n", "\r\n")
+    return text, expected
+
+def chunk_stream(text: str, seed: int, max_chunk: int = 12) -> Iterator[str]:
+    """Split text into random chunks of 1 to `max_chunk` characters, like streamed tokens."""
+    rng = random.Random(seed)
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, max_chunk)
+        yield text[position:position + size]
+        position += size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--variants", type=int, default=3)
+    parser.add_argument("--variant-bytes", type=int, default=1500)
+    parser.add_argument("--plain", action="store_true", help="Leave out the adversarial \"Option\" lines")
+    args = parser.parse_args()
+    text, _ = generate_response(args.seed, args.variants, args.variant_bytes, not args.plain)
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Local stub of an OpenAI-compatible chat completions server.
+
+Point the backend at it with:
+    GROQ_API_URL=http://127.0.0.1:8001/v1/chat/completions
+or, for the local provider (batched prompts go to /v1/completions):
+    LLM_PROVIDER=local LOCAL_LLM_URL=http://127.0.0.1:8001/v1 LOCAL_LLM_BATCH_SIZE=8
+
+Usage:
+    python fake_llm_server.py --port 8001 --latency 0.5 --token-delay 0.01
+"""
+import argparse
+import re
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_RESPONSE = """Option 1: [Professional]
+# Sample Project
+
+A professional README.
+
+## Installation
+```bash
+pip install sample
+```
+
+Option 2: [Modern]
+# Sample Project 🚀
+
+Get started in seconds.
+
+Option 3: [Minimal]
+# Sample Project
+
+Minimal README.
+"""
+
+# Section markers in /generate-readme/update prompts
+SECTION_MARKER = re.compile(r"^=== Section \d+ ===$", re.MULTILINE)
+
+def update_response(prompt: str) -> str:
+    """Answer a README update prompt by returning each section it sent with a note appended."""
+    sections = prompt.split("Sections that may be out of date:", 1)[-1]
+    starts = [match.start() for match in SECTION_MARKER.finditer(sections)] + [len(sections)]
+    revised = []
+    for start, end in zip(starts, starts[1:]):
+        marker, _, text = sections[start:end].partition("\n")
+        text = text.split("\n\nRevise the sections above", 1)[0].rstrip()
+        revised.append(f"{marker}\n{text}\n\n_Updated for the latest changes._\n")
+    return "\n".join(revised)
+
+def tokenize(text: str):
+    """Split text into small word-sized chunks, like a model would stream them."""
+    chunk = ""
+    for char in text:
+        chunk += char
+        if char in " \n":
+            yield chunk
+            chunk = ""
+    if chunk:
+        yield chunk
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    token_delay = 0.0
+    response_text = SAMPLE_RESPONSE
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.latency)
+
+        if not self.path.endswith("/chat/completions"):
+            self._send_text_completion(body)
+        elif body.get("stream"):
+            self._stream_completion(body)
+        else:
+            self._send_completion(body)
+
+    def _response_for(self, body) -> str:
+        prompt = body.get("messages", [{}])[-1].get("content", "")
+        return update_response(prompt) if SECTION_MARKER.search(prompt) else self.response_text
+
+    def _send_completion(self, body):
+        self._send_json({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self._response_for(body)},
+                "finish_reason": "stop"
+            }],
+            "usage": self._usage(body)
+        })
+
+    def _usage(self, body):
+        # Rough counts so token accounting has something to record
+        prompt = " ".join(message.get("content", "") for message in body.get("messages", []))
+        prompt_tokens = len(prompt.split())
+        completion_tokens = sum(1 for _ in tokenize(self._response_for(body)))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+    def _send_json(self, data):
+        payload = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_text_completion(self, body):
+        # The completions API accepts a list of prompts and returns one choice per prompt
+        prompts = body.get("prompt", "")
+        prompts = prompts if isinstance(prompts, list) else [prompts]
+        self.server.batch_sizes.append(len(prompts))
+        self._send_json({
+            "id": "cmpl-fake",
+            "object": "text_completion",
+            "model": body.get("model", "fake"),
+            "choices": [
+                {"index": index, "text": self.response_text, "finish_reason": "stop"}
+                for index in range(len(prompts))
+            ],
+            # One total for the whole batch, as llama.cpp's server reports it
+            "usage": self._batch_usage(prompts)
+        })
+
+    def _batch_usage(self, prompts):
+        prompt_tokens = sum(len(prompt.split()) for prompt in prompts)
+        completion_tokens = len(prompts) * sum(1 for _ in tokenize(self.response_text))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+    def _stream_completion(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in tokenize(self.response_text):
+            self._write_event({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+            })
+            time.sleep(self.token_delay)
+        # Groq reports usage on the last chunk under x_groq
+        self._write_event({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "x_groq": {"usage": self._usage(body)}
+        })
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_event(self, data):
+        self._write_chunk(f"data: {json.dumps(data)}\n\n".encode())
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # The socketserver default of 5 serializes concurrent benchmarks
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_sizes = []  # Prompts per /v1/completions request, for batching checks
+
+def make_server(host: str = "127.0.0.1", port: int = 8001, latency: float = 0.0, token_delay: float = 0.0):
+    """Create a stub server; call serve_forever() on the result (e.g. in a thread)."""
+    handler = type("ConfiguredFakeLLMHandler", (FakeLLMHandler,), {
+        "latency": latency,
+        "token_delay": token_delay
+    })
+    return FakeLLMServer((host, port), handler)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first byte")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed tokens")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency, args.token_delay)
+    print(f"Fake LLM server listening on http://{args.host}:{args.port}/v1/chat/completions")
+    server.serve_forever()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Tests import the backend as `app`, as the server does when run from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep analyses and responses made by tests out of the on-disk index and cache
+os.environ.setdefault("ANALYSIS_INDEX_ENABLED", "false")
+os.environ.setdefault("README_CACHE_ENABLED", "false")
@@ -0,0 +1,48 @@
+import re
+import asyncio
+from app.api.routes import bound_client_content
+from app.core.models import FileDetail
+from app.utils.code_analyzer import file_detail, get_file_structure
+from app.utils.content_sampler import CONTENT_SAMPLE_FILE_BYTES, sample_file, sample_text
+from app.utils.fs_walker import WalkEntry
+
+def _large_source(tmp_path, functions: int = 5000):
+    path = tmp_path / "big.py"
+    path.write_text("".join(f"def fn_{i}(x):\n    return x * {i}\n\n" for i in range(functions)))
+    return path
+
+def test_sample_fits_the_file_budget(tmp_path):
+    path = _large_source(tmp_path)
+    for max_bytes in (CONTENT_SAMPLE_FILE_BYTES, 1000, 200):
+        content, binary = sample_file(str(path), max_bytes)
+        assert not binary
+        assert len(content.encode("utf-8")) <= max_bytes
+
+def test_sample_reports_the_omitted_bytes(tmp_path):
+    path = _large_source(tmp_path)
+    content, _ = sample_file(str(path))
+    omitted = int(re.search(r"from (\d+) omitted bytes", content).group(1))
+    head, _, rest = content.partition("\n[... key lines")
+    tail = rest.rsplit("[...]\n", 1)[1]
+    assert omitted == path.stat().st_size - len(head.encode()) - 1 - len(tail.encode())
+
+def test_analyzer_sample_passes_through_file_detail_unchanged(tmp_path):
+    path = _large_source(tmp_path)
+    content, _ = sample_file(str(path))
+    entry = WalkEntry("big.py", str(path), False, path.stat().st_size)
+    assert file_detail(entry, None, content).content == content
+    assert sample_text(content) == content
+
+def test_client_content_is_bounded():
+    files = bound_client_content([FileDetail(path="big.py", type="file", content="x = 1\n" * 100000)])
+    assert len(files[0].content.encode("utf-8")) <= CONTENT_SAMPLE_FILE_BYTES
+
+def test_analyses_sample_no_content_by_default(tmp_path):
+    _large_source(tmp_path)
+    files = asyncio.run(get_file_structure(str(tmp_path)))
+    assert [detail.content for detail in files] == [None]
+
+def test_binary_files_are_skipped(tmp_path):
+    path = tmp_path / "logo.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 40)
+    assert sample_file(str(path)) == (None, True)
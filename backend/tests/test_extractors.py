@@ -0,0 +1,118 @@
+from app.utils.code_analyzer import file_detail
+from app.utils.extractors import extract_module, extract_python_functions
+from app.utils.fs_walker import WalkEntry
+
+def _symbols(path: str, content: str):
+    return {symbol.name: symbol for symbol in extract_module(path, content).symbols}
+
+def test_python_functions_methods_and_classes():
+    symbols = _symbols("app.py", '''
+class Client(Base):
+    """Talks to the API."""
+
+    async def send(self, request, *args, timeout=None, **kwargs) -> Response:
+        return self.post(request)
+
+def main():
+    Client().send(None)
+''')
+    assert symbols["Client"].kind == "class"
+    assert symbols["Client"].parameters == ["Base"]
+    assert symbols["Client.send"].kind == "async_method"
+    assert symbols["Client.send"].parameters == ["self", "request", "*args", "timeout", "**kwargs"]
+    assert symbols["Client.send"].return_type == "Response"
+    assert symbols["main"].calls == ["send", "Client"]
+
+def test_typescript_wrapped_signatures():
+    symbols = _symbols("api.ts", '''
+/** Fetch a user by id. */
+export async function fetchUser(
+  id: string,
+  options: RequestOptions = {},
+): Promise<Map<string, User>> {
+  return request(id);
+}
+
+export const formatName = (
+  first: string,
+  last: string,
+) => `${first} ${last}`;
+
+class Store {
+  private get<T>(key: string): T {
+    if (this.cache.has(key)) {
+      return this.cache.get(key);
+    }
+  }
+}
+
+describe("store", function () {
+  it("works", () => {});
+});
+''')
+    assert symbols["fetchUser"].kind == "async_function"
+    assert symbols["fetchUser"].parameters == ["id", "options"]
+    assert symbols["fetchUser"].return_type == "Promise<Map<string, User>>"
+    assert symbols["fetchUser"].docstring == "Fetch a user by id."
+    assert symbols["formatName"].parameters == ["first", "last"]
+    assert symbols["get"].kind == "method"
+    assert symbols["get"].return_type == "T"
+    assert not {"if", "describe", "it"} & symbols.keys()
+
+def test_go_functions_and_receiver_methods():
+    symbols = _symbols("server.go", '''
+// New builds a server.
+func New(
+\taddr string,
+\ttimeout time.Duration,
+) (*Server, error) {
+\treturn &Server{}, nil
+}
+
+func (s *Server) Close() error {
+\treturn nil
+}
+''')
+    assert symbols["New"].kind == "function"
+    assert symbols["New"].parameters == ["addr", "timeout"]
+    assert symbols["New"].return_type == "(*Server, error)"
+    assert symbols["New"].docstring == "New builds a server."
+    assert symbols["Close"].kind == "method"
+    assert symbols["Close"].return_type == "error"
+
+def test_rust_generics_one_line_bodies_and_wrapped_signatures():
+    symbols = _symbols("lib.rs", '''
+/// Run the task.
+pub async fn run<T: Into<String>>(name: T) -> Result<(), Box<dyn Error>> {
+    Ok(())
+}
+
+impl Counter {
+    fn add(&self, x: i32) -> i32 { self.count + x }
+
+    pub fn long(
+        &mut self,
+        values: Vec<u8>,
+    ) -> Option<i32>
+    where
+        T: Clone,
+    {
+        None
+    }
+}
+''')
+    assert symbols["run"].kind == "async_function"
+    assert symbols["run"].parameters == ["name"]
+    assert symbols["run"].return_type == "Result<(), Box<dyn Error>>"
+    assert symbols["run"].docstring == "Run the task."
+    assert symbols["add"].parameters == ["self", "x"]
+    assert symbols["add"].return_type == "i32"
+    assert symbols["long"].parameters == ["self", "values"]
+    assert symbols["long"].return_type == "Option<i32>"
+
+def test_file_detail_keeps_classes_out_of_functions():
+    content = "class Client:\n    def send(self):\n        pass\n\ndef main():\n    pass\n"
+    detail = file_detail(WalkEntry("app.py", "/src/app.py", False, len(content)), extract_module("app.py", content).to_dict())
+    assert [function.name for function in detail.functions] == [function.name for function in extract_python_functions(content)]
+    assert [function.name for function in detail.functions] == ["Client.send", "main"]
+    assert [cls.name for cls in detail.classes] == ["Client"]
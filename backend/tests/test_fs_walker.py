@@ -0,0 +1,93 @@
+import os
+
+from app.utils.fs_walker import IgnorePattern, ProjectWalker
+
+def _tree(root, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+def _walk(root, **budgets):
+    return [entry.rel_path.replace(os.sep, '/') for entry in ProjectWalker(str(root), **budgets)]
+
+def test_unanchored_pattern_matches_at_any_depth():
+    pattern = IgnorePattern("*.log")
+    assert pattern.matches("app.log", False)
+    assert pattern.matches("logs/deep/app.log", False)
+    assert not pattern.matches("app.log.txt", False)
+
+def test_slash_anchors_pattern_to_its_directory():
+    pattern = IgnorePattern("/build")
+    assert pattern.matches("build", True)
+    assert not pattern.matches("src/build", True)
+    nested = IgnorePattern("docs/*.md", base="pkg")
+    assert nested.matches("pkg/docs/a.md", False)
+    assert not nested.matches("docs/a.md", False)
+    assert not nested.matches("pkg/docs/sub/a.md", False)
+
+def test_directory_pattern_skips_files():
+    pattern = IgnorePattern("cache/")
+    assert pattern.matches("cache", True)
+    assert pattern.matches("src/cache", True)
+    assert not pattern.matches("cache", False)
+
+def test_double_star_patterns():
+    assert IgnorePattern("**/generated").matches("a/b/generated", True)
+    assert IgnorePattern("out/**").matches("out/a/b.js", False)
+    assert IgnorePattern("a/**/z.txt").matches("a/z.txt", False)
+    assert IgnorePattern("a/**/z.txt").matches("a/b/c/z.txt", False)
+
+def test_gitignore_negation_and_nested_rules(tmp_path):
+    _tree(tmp_path, {
+        ".gitignore": "*.log\n!keep.log\nbuild/\n/secret.txt\n",
+        "app.log": "",
+        "keep.log": "",
+        "secret.txt": "",
+        "build/out.js": "",
+        "src/secret.txt": "",
+        "src/build": "not a directory",
+        "src/.gitignore": "*.tmp\n!important.tmp\n",
+        "src/a.tmp": "",
+        "src/important.tmp": "",
+        "src/main.py": "",
+        "other/a.tmp": ""
+    })
+    assert _walk(tmp_path) == [
+        "keep.log",
+        "other",
+        "other/a.tmp",
+        "src",
+        "src/build",
+        "src/important.tmp",
+        "src/main.py",
+        "src/secret.txt"
+    ]
+
+def test_dockerignore_patterns_are_anchored_to_the_root(tmp_path):
+    _tree(tmp_path, {
+        ".dockerignore": "dist\ndocs/*.md\n",
+        "dist/app.js": "",
+        "src/dist/app.js": "",
+        "docs/a.md": "",
+        "docs/a.txt": "",
+        "src/docs/a.md": ""
+    })
+    assert _walk(tmp_path) == [
+        "docs",
+        "docs/a.txt",
+        "src",
+        "src/dist",
+        "src/dist/app.js",
+        "src/docs",
+        "src/docs/a.md"
+    ]
+
+def test_budgets_mark_the_walk_partial(tmp_path):
+    _tree(tmp_path, {f"pkg/sub/file_{n}.py": "" for n in range(5)})
+    walker = ProjectWalker(str(tmp_path), max_depth=1)
+    assert [entry.rel_path.replace(os.sep, '/') for entry in walker] == ["pkg", "pkg/sub"]
+    assert (walker.partial, walker.partial_reason) == (True, "max_depth")
+    walker = ProjectWalker(str(tmp_path), max_entries=3)
+    assert len(list(walker)) == 3
+    assert (walker.partial, walker.partial_reason) == (True, "max_entries")
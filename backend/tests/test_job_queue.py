@@ -0,0 +1,116 @@
+import asyncio
+
+from app.utils.job_queue import JobManager, JobStore, CANCELLED, CANCELLING, RUNNING
+
+async def _wait_for(job, status: str, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while job.status != status:
+        assert asyncio.get_running_loop().time() < deadline, f"job stayed {job.status}"
+        await asyncio.sleep(0.01)
+
+def test_cancelled_running_job_is_reported_cancelled(tmp_path):
+    async def run():
+        manager = JobManager(JobStore(tmp_path / "jobs.sqlite3"), workers=1)
+
+        async def handler(params, job):
+            await asyncio.sleep(60)
+
+        manager.register("slow", handler)
+        job = await manager.submit("slow", {})
+        await _wait_for(job, RUNNING)
+        cancelled = await manager.cancel(job.id)
+        stored = manager.store.load(job.id)
+        await manager.shutdown()
+        return cancelled.status, stored.status
+
+    assert asyncio.run(run()) == (CANCELLED, CANCELLED)
+
+def test_job_slow_to_stop_is_reported_cancelling(tmp_path):
+    async def run():
+        manager = JobManager(JobStore(tmp_path / "jobs.sqlite3"), workers=1, cancel_wait=0.05)
+
+        async def handler(params, job):
+            try:
+                await asyncio.sleep(60)
+            finally:
+                # Cleanup that outlasts the cancel wait
+                await asyncio.sleep(0.3)
+
+        manager.register("slow", handler)
+        job = await manager.submit("slow", {})
+        await _wait_for(job, RUNNING)
+        status = (await manager.cancel(job.id)).status
+        await _wait_for(job, CANCELLED)
+        await manager.shutdown()
+        return status
+
+    assert asyncio.run(run()) == CANCELLING
+
+def test_queued_job_is_cancelled_before_it_runs(tmp_path):
+    async def run():
+        manager = JobManager(JobStore(tmp_path / "jobs.sqlite3"), workers=1)
+        started = []
+
+        async def handler(params, job):
+            started.append(params["n"])
+            await asyncio.sleep(0.2)
+
+        manager.register("work", handler)
+        first = await manager.submit("work", {"n": 1})
+        second = await manager.submit("work", {"n": 2})
+        cancelled = await manager.cancel(second.id)
+        await _wait_for(first, "succeeded")
+        await asyncio.sleep(0.05)
+        await manager.shutdown()
+        return cancelled.status, started
+
+    assert asyncio.run(run()) == (CANCELLED, [1])
+
+def test_results_survive_a_restart(tmp_path):
+    async def run():
+        manager = JobManager(JobStore(tmp_path / "jobs.sqlite3"))
+
+        async def handler(params, job):
+            return {"answer": params["n"] * 2}
+
+        manager.register("double", handler)
+        job = await manager.submit("double", {"n": 21})
+        await _wait_for(job, "succeeded")
+        await manager.shutdown()
+
+        restarted = JobManager(JobStore(tmp_path / "jobs.sqlite3"))
+        restarted.register("double", handler)
+        stored = await restarted.get(job.id)
+        await restarted.shutdown()
+        return stored.status, stored.result
+
+    assert asyncio.run(run()) == ("succeeded", {"answer": 42})
+
+def test_unfinished_jobs_resume_after_a_restart(tmp_path):
+    async def run():
+        manager = JobManager(JobStore(tmp_path / "jobs.sqlite3"), workers=1)
+
+        async def stuck(params, job):
+            await asyncio.sleep(60)
+
+        manager.register("work", stuck)
+        running = await manager.submit("work", {"n": 1})
+        queued = await manager.submit("work", {"n": 2})
+        await _wait_for(running, RUNNING)
+        await manager.shutdown()
+
+        restarted = JobManager(JobStore(tmp_path / "jobs.sqlite3"), workers=1)
+        finished = []
+
+        async def work(params, job):
+            finished.append(params["n"])
+            return params["n"]
+
+        restarted.register("work", work)
+        resumed = [await restarted.get(running.id), await restarted.get(queued.id)]
+        for job in resumed:
+            await _wait_for(job, "succeeded")
+        await restarted.shutdown()
+        return finished, [restarted.store.load(job.id).result for job in resumed]
+
+    assert asyncio.run(run()) == ([1, 2], [1, 2])
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+from app.utils.llm_providers import LocalProvider, split_usage
+from app.utils.metrics import usage_scope
+from fake_llm_server import make_server
+
+def test_split_usage_adds_up_to_the_total():
+    shares = split_usage({"prompt_tokens": 100, "completion_tokens": 7}, ["a" * 10, "b" * 30], ["x", "yy"])
+    assert sum(share["prompt_tokens"] for share in shares) == 100
+    assert sum(share["completion_tokens"] for share in shares) == 7
+    assert shares[0]["prompt_tokens"] < shares[1]["prompt_tokens"]
+    assert split_usage(None, ["a", "b"], ["x", "y"]) == [None, None]
+
+def test_batched_usage_is_recorded_in_each_callers_scope():
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    async def run():
+        provider = LocalProvider(url, "fake", batch_size=8, batch_window=0.05)
+
+        async def call(words: int):
+            with usage_scope() as usage:
+                await provider.complete({"model": "fake", "messages": [{"role": "user", "content": "word " * words}]})
+            return usage
+
+        try:
+            with usage_scope() as total:
+                usages = await asyncio.gather(*[call(10 * (n + 1)) for n in range(4)])
+                # A lone request falls back to a chat request, still recorded by its caller
+                single = await call(5)
+        finally:
+            await provider.aclose()
+        return usages, single, total
+
+    try:
+        usages, single, total = asyncio.run(run())
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert server.batch_sizes[0] == 4
+    assert all(usage.get("prompt") and usage.get("completion") for usage in usages)
+    assert usages[0]["prompt"] < usages[-1]["prompt"]
+    assert single.get("prompt")
+    assert sum(usage["prompt"] for usage in usages) + single["prompt"] == total["prompt"]
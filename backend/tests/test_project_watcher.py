@@ -0,0 +1,95 @@
+import asyncio
+import functools
+
+import pytest
+
+from app.utils import project_watcher
+from app.utils.project_watcher import InotifyWatcher, LiveAnalysisManager, LiveProject
+
+def _functions(details, path: str):
+    detail = next(detail for detail in details if detail.path.replace('\\', '/').endswith(path))
+    return [function.name for function in detail.functions or []]
+
+async def _wait_for_update(project: LiveProject, updates: int, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while project.updates == updates:
+        assert asyncio.get_running_loop().time() < deadline, "the change was not picked up"
+        await asyncio.sleep(0.01)
+
+def test_polling_picks_up_changes(tmp_path):
+    (tmp_path / "app.py").write_text("def first():\n    pass\n")
+
+    async def run():
+        project = LiveProject(str(tmp_path), backend="poll", poll_interval=0.05)
+        await project.start()
+        try:
+            before, _, _ = await project.snapshot()
+            updates = project.updates
+            (tmp_path / "app.py").write_text("def second(value):\n    return value\n")
+            (tmp_path / "new.py").write_text("def added():\n    pass\n")
+            # A rescan running while the files are written may only see the first one
+            parsed = 0
+            while True:
+                await _wait_for_update(project, updates)
+                updates = project.updates
+                after, _, stats = await project.snapshot()
+                parsed += stats["files_parsed"]
+                if any(detail.path.endswith("new.py") for detail in after):
+                    return project.backend, before, after, parsed
+        finally:
+            project.close()
+
+    backend, before, after, parsed = asyncio.run(run())
+    assert backend == "poll"
+    assert _functions(before, "app.py") == ["first"]
+    assert _functions(after, "app.py") == ["second"]
+    assert _functions(after, "new.py") == ["added"]
+    assert parsed >= 2
+
+@pytest.mark.skipif(not InotifyWatcher.available(), reason="inotify is Linux only")
+def test_inotify_events_update_the_changed_file(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("def first():\n    pass\n")
+    (tmp_path / "src" / "other.py").write_text("def other():\n    pass\n")
+    (tmp_path / "old.py").write_text("def old():\n    pass\n")
+
+    async def run():
+        project = LiveProject(str(tmp_path), backend="inotify", debounce=0.01)
+        await project.start()
+        try:
+            await project.snapshot()
+            updates = project.updates
+            (tmp_path / "src" / "app.py").write_text("def second():\n    pass\n")
+            (tmp_path / "old.py").unlink()
+            await _wait_for_update(project, updates)
+            details, _, stats = await project.snapshot()
+            return project.backend, details, stats
+        finally:
+            project.close()
+
+    backend, details, stats = asyncio.run(run())
+    assert backend == "inotify"
+    assert _functions(details, "src/app.py") == ["second"]
+    # Only the edited file is parsed again
+    assert stats["files_parsed"] == 1
+    assert not any(detail.path.endswith("old.py") for detail in details)
+
+def test_project_is_watched_again_after_a_complete_rescan(tmp_path, monkeypatch):
+    for n in range(3):
+        (tmp_path / f"file_{n}.py").write_text("")
+    manager = LiveAnalysisManager(enabled=True, backend="poll", poll_interval=60)
+
+    async def run():
+        monkeypatch.setattr(project_watcher, "ProjectWalker", functools.partial(project_watcher.ProjectWalker, max_entries=2))
+        partial = await manager.get(str(tmp_path))
+        monkeypatch.undo()
+        manager.rescanned(str(tmp_path), partial=True)
+        still_unwatched = await manager.get(str(tmp_path))
+        manager.rescanned(str(tmp_path), partial=False)
+        watched = await manager.get(str(tmp_path))
+        manager.shutdown()
+        return partial, still_unwatched, watched
+
+    partial, still_unwatched, watched = asyncio.run(run())
+    assert partial is None and still_unwatched is None
+    assert watched is not None and not watched.partial
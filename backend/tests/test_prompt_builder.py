@@ -0,0 +1,31 @@
+from app.core.models import FileDetail, FunctionDetail, ProjectDetails
+from app.utils.prompt_builder import build_project_summary
+
+def _project(directories: int, files: int, functions: int) -> ProjectDetails:
+    structure = []
+    for d in range(directories):
+        structure.append(FileDetail(path=f"pkg/module_{d}", type="directory"))
+        for f in range(files):
+            structure.append(FileDetail(
+                path=f"pkg/module_{d}/file_{f}.py",
+                type="file",
+                functions=[
+                    FunctionDetail(name=f"handler_{d}_{f}_{n}", description=f"Handle request kind {n}.", parameters=["request"])
+                    for n in range(functions)
+                ]
+            ))
+    return ProjectDetails(project_name="demo", description="A demo project.", file_structure=structure)
+
+def test_compressed_summary_uses_most_of_the_budget():
+    project = _project(directories=40, files=20, functions=5)
+    for budget in (1500, 6000):
+        _, stats = build_project_summary(project, budget)
+        assert stats["compressed"]
+        assert 0.9 * budget <= stats["after"] <= budget
+
+def test_full_tree_is_kept_when_only_functions_overflow():
+    project = _project(directories=2, files=3, functions=400)
+    summary, stats = build_project_summary(project, 3000)
+    assert stats["compressed"]
+    assert all(f"- {detail.path}" in summary.splitlines() for detail in project.file_structure)
+    assert stats["after"] >= 0.9 * 3000
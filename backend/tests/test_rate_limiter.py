@@ -0,0 +1,97 @@
+import time
+import asyncio
+
+import pytest
+
+from app.utils.rate_limiter import (
+    AdmissionController, RateLimitExceeded, TokenBucket, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+)
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(60)  # One token a second, holding 60
+    now = time.monotonic()
+    assert bucket.wait_time(60, now) == 0
+    bucket.consume(60, now)
+    assert bucket.wait_time(2, now) == pytest.approx(2)
+    # A request bigger than the bucket only waits for a full one
+    assert bucket.wait_time(600, now) == pytest.approx(60)
+    assert TokenBucket(0).wait_time(10 ** 9, now) == 0
+
+def _drained(rpm: float = 6000, **kwargs) -> AdmissionController:
+    """A controller with no request budget left, admitting one call every 60/rpm seconds."""
+    controller = AdmissionController(rpm=rpm, **kwargs)
+    controller.rpm.tokens = 0
+    return controller
+
+def test_waiting_calls_are_admitted_by_priority_then_arrival():
+    async def run():
+        controller = _drained()
+        admitted = []
+
+        async def call(name: str, priority: int):
+            await controller.acquire(1, priority)
+            admitted.append(name)
+
+        tasks = [
+            asyncio.create_task(call("batch 1", PRIORITY_BATCH)),
+            asyncio.create_task(call("batch 2", PRIORITY_BATCH)),
+            asyncio.create_task(call("interactive 1", PRIORITY_INTERACTIVE)),
+            asyncio.create_task(call("interactive 2", PRIORITY_INTERACTIVE))
+        ]
+        await asyncio.gather(*tasks)
+        return admitted
+
+    assert asyncio.run(run()) == ["interactive 1", "interactive 2", "batch 1", "batch 2"]
+
+def test_calls_are_paced_to_the_request_rate():
+    async def run():
+        controller = _drained(rpm=1200)  # One call every 50 ms
+        start = time.monotonic()
+        await asyncio.gather(*[controller.acquire(1) for _ in range(4)])
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.19
+
+def test_full_queue_sheds_calls():
+    async def run():
+        controller = _drained(rpm=60, max_queue=1)
+        waiting = asyncio.create_task(controller.acquire(1))
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(RateLimitExceeded) as shed:
+                await controller.acquire(1)
+        finally:
+            waiting.cancel()
+        return shed.value.retry_after
+
+    assert asyncio.run(run()) > 0
+
+def test_call_is_shed_when_its_deadline_passes():
+    async def run():
+        controller = _drained(rpm=60)
+        with pytest.raises(RateLimitExceeded):
+            await controller.acquire(1, timeout=0.05)
+        return controller.queued()
+
+    assert asyncio.run(run()) == 0
+
+def test_settle_refunds_unused_tokens():
+    controller = AdmissionController(tpm=1000)
+
+    async def run():
+        ticket = await controller.acquire(800)
+        assert controller.tpm.tokens == pytest.approx(200, abs=1)
+        ticket.settle(100)
+
+    asyncio.run(run())
+    assert controller.tpm.tokens == pytest.approx(900, abs=1)
+
+def test_upstream_429_pauses_admissions():
+    async def run():
+        controller = AdmissionController(rpm=6000)
+        controller.penalize(0.1)
+        start = time.monotonic()
+        await controller.acquire(1)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
@@ -0,0 +1,98 @@
+from app.core.models import FileDetail, FunctionDetail
+from app.utils.readme_updater import (
+    affected_sections, apply_revisions, build_update_prompt, diff_structures, parse_revisions, split_sections
+)
+
+README = """# Tool
+
+A command line tool.
+
+## Installation
+
+pip install tool
+
+## Usage
+
+Call `parse_config(path)` to load settings.
+
+```python
+# Not a heading
+parse_config("tool.toml")
+```
+
+## License
+
+MIT
+"""
+
+def _file(path: str, *functions: FunctionDetail) -> FileDetail:
+    return FileDetail(path=path, type='file', functions=list(functions))
+
+def _function(name: str, *parameters: str) -> FunctionDetail:
+    return FunctionDetail(name=name, description='', parameters=list(parameters), kind='function')
+
+def test_sections_split_on_headings_outside_code_blocks():
+    sections = split_sections(README)
+    assert [section.title for section in sections] == ["Tool", "Installation", "Usage", "License"]
+    assert "# Not a heading" in sections[2].text
+    assert "".join(section.text for section in sections) == README
+
+def test_changed_function_only_affects_the_section_using_it():
+    old = [_file("tool/config.py", _function("parse_config", "path"))]
+    new = [_file("tool/config.py", _function("parse_config", "path", "strict"))]
+    diff = diff_structures(old, new)
+    assert [change.changed for change in diff.changed_files] == [["parse_config"]]
+
+    sections = split_sections(README)
+    affected = affected_sections(sections, diff)
+    assert [section.title for section in affected] == ["Usage"]
+    prompt, _ = build_update_prompt("tool", sections, affected, diff)
+    assert "=== Section 2 ===" in prompt
+    assert "pip install tool" not in prompt
+
+def test_update_replaces_only_the_affected_section():
+    old = [_file("tool/config.py", _function("parse_config", "path"))]
+    new = [_file("tool/config.py", _function("parse_config", "path", "strict"))]
+    sections = split_sections(README)
+    affected = affected_sections(sections, diff_structures(old, new))
+    output = """=== Section 2 ===
+## Usage
+
+Call `parse_config(path, strict)` to load settings.
+=== Section 3 ===
+## License
+
+Apache-2.0
+=== New ===
+## Configuration
+
+Set `strict` to reject unknown keys.
+"""
+    revised, added = parse_revisions(output)
+    updated = apply_revisions(sections, affected, revised, added)
+    # Section 3 was not affected, so its revision is ignored
+    assert updated == README.split("## Usage")[0] + """## Usage
+
+Call `parse_config(path, strict)` to load settings.
+
+## Configuration
+
+Set `strict` to reject unknown keys.
+
+## License
+
+MIT
+"""
+
+def test_empty_revision_removes_the_section():
+    sections = split_sections(README)
+    revised, added = parse_revisions("=== Section 1 ===\n")
+    updated = apply_revisions(sections, [sections[1]], revised, added)
+    assert "## Installation" not in updated
+    assert updated.startswith("# Tool\n\nA command line tool.\n\n## Usage")
+
+def test_unchanged_structure_affects_nothing():
+    files = [_file("tool/config.py", _function("parse_config", "path"))]
+    diff = diff_structures(files, files, ["Python"], ["Python"])
+    assert diff.empty
+    assert affected_sections(split_sections(README), diff) == []
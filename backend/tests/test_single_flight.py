@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.api import routes
+from app.utils.single_flight import SingleFlight
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    async def run():
+        flight = SingleFlight()
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "readme"
+
+        results = await asyncio.gather(*[flight.do("same", upstream) for _ in range(5)])
+        other = await flight.do("other", upstream)
+        again = await flight.do("same", upstream)
+        return results, other, again, len(calls), flight.stats()
+
+    results, other, again, calls, stats = asyncio.run(run())
+    assert results == [("readme", False)] + [("readme", True)] * 4
+    assert other == again == ("readme", False)
+    assert calls == 3
+    assert stats == {"calls": 3, "shared": 4, "in_flight": 0}
+
+def test_errors_reach_every_waiter():
+    async def run():
+        flight = SingleFlight()
+
+        async def upstream():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        return await asyncio.gather(*[flight.do("key", upstream) for _ in range(3)], return_exceptions=True)
+
+    assert [str(result) for result in asyncio.run(run())] == ["upstream failed"] * 3
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    async def run():
+        flight = SingleFlight()
+
+        async def upstream():
+            await asyncio.sleep(0.05)
+            return "readme"
+
+        first = asyncio.create_task(flight.do("key", upstream))
+        second = asyncio.create_task(flight.do("key", upstream))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == ("readme", True)
+
+def test_identical_generations_make_one_model_call(monkeypatch):
+    class CountingGenerator:
+        calls = 0
+
+        async def complete(self, payload):
+            CountingGenerator.calls += 1
+            await asyncio.sleep(0.05)
+            return "Option 1:\n# Tool"
+
+    monkeypatch.setattr(routes, "get_text_generator", CountingGenerator)
+    payload = {"messages": [{"role": "user", "content": uuid.uuid4().hex}]}
+
+    async def run():
+        return await asyncio.gather(*[routes.generate_cached(payload) for _ in range(4)])
+
+    results = asyncio.run(run())
+    assert CountingGenerator.calls == 1
+    assert sorted(source for _, source in results) == ["model", "shared", "shared", "shared"]
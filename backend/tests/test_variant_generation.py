@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from app.api import routes
+
+class FakeGenerator:
+    def build_variant_payload(self, prompt: str, style: str):
+        return {"prompt": prompt, "style": style}
+
+def _generate(monkeypatch, responses):
+    calls = []
+
+    async def generate_cached(payload, bypass_cache=False):
+        calls.append(bypass_cache)
+        response = responses[len(calls) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response, "model"
+
+    monkeypatch.setattr(routes, "get_text_generator", FakeGenerator)
+    monkeypatch.setattr(routes, "generate_cached", generate_cached)
+    return calls, routes.generate_variant_text("prompt", "Modern")
+
+def test_empty_variant_is_retried_without_the_cache(monkeypatch):
+    calls, generation = _generate(monkeypatch, ["", " ", "# Tool"])
+    assert asyncio.run(generation) == ("# Tool", "model")
+    assert calls == [False, True, True]
+
+def test_errors_are_left_to_the_client_retries(monkeypatch):
+    calls, generation = _generate(monkeypatch, [Exception("Failed to generate README: 503"), "# Tool"])
+    with pytest.raises(Exception, match="503"):
+        asyncio.run(generation)
+    assert len(calls) == 1
@@ -38,7 +38,8 @@ interface ReadmeOption {
 }
 
 interface ProjectAnalysis {
-  file_structure: any[];
+  analysis_id: string;
+  file_structure?: any[];  // Left out of polled job results, see analyzeProject
   tech_stack: string[];
 }
 
@@ -55,19 +56,63 @@ function runCommand(command: string, cwd: string): Promise<string> {
     });
 }
 
-async function analyzeProject(workspacePath: string): Promise<ProjectAnalysis> {
+// How often an analysis job is polled, and how long to wait for it before giving up
+const ANALYSIS_POLL_INTERVAL_MS = 500;
+const ANALYSIS_MAX_WAIT_MS = 10 * 60 * 1000;
+
+// Raised when polling stops before the job finishes, so its message is shown as is
+class AnalysisStoppedError extends Error {}
+
+async function cancelAnalysisJob(jobId: string): Promise<void> {
+  try {
+    await axios.delete(`http://localhost:8000/api/jobs/${jobId}`, { timeout: 30000 });
+  } catch (error) {
+    console.error('Error cancelling analysis job:', error);
+  }
+}
+
+async function analyzeProject(workspacePath: string, token?: vscode.CancellationToken): Promise<ProjectAnalysis> {
   try {
-    const response = await axios.post('http://localhost:8000/api/analyze-project', {
+    // Large repositories can take longer than any request timeout, so the analysis
+    // runs as a background job that is polled until it finishes, is cancelled or
+    // runs past ANALYSIS_MAX_WAIT_MS
+    const submitted = await axios.post('http://localhost:8000/api/jobs/analyze', {
       project_path: workspacePath
-    }, { 
-      timeout: 30000,  // Reduced to 30 seconds
+    }, {
+      timeout: 30000,
       headers: {
         'Content-Type': 'application/json'
       }
     });
-    return response.data;
+    const jobId = submitted.data.job_id;
+    const deadline = Date.now() + ANALYSIS_MAX_WAIT_MS;
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, ANALYSIS_POLL_INTERVAL_MS));
+      if (token?.isCancellationRequested) {
+        await cancelAnalysisJob(jobId);
+        throw new AnalysisStoppedError('Project analysis was cancelled.');
+      }
+      if (Date.now() > deadline) {
+        await cancelAnalysisJob(jobId);
+        throw new AnalysisStoppedError(`Project analysis did not finish within ${ANALYSIS_MAX_WAIT_MS / 60000} minutes.`);
+      }
+      // Only the analysis id and tech stack are used; the backend keeps the file structure
+      const job = (await axios.get(`http://localhost:8000/api/jobs/${jobId}`, {
+        params: { result_fields: 'analysis_id,tech_stack' },
+        timeout: 30000
+      })).data;
+      if (job.status === 'succeeded') {
+        return job.result;
+      }
+      if (job.status === 'failed' || job.status === 'cancelled') {
+        throw new Error(job.error || `Analysis ${job.status}`);
+      }
+    }
   } catch (error) {
     console.error('Error analyzing project:', error);
+    if (error instanceof AnalysisStoppedError) {
+      throw error;
+    }
     throw new Error('Failed to analyze project. Make sure the backend server is running.');
   }
 }
@@ -129,7 +174,6 @@ export function activate(context: vscode.ExtensionContext) {
           case 'submitForm':
             try {
               console.log('Starting README generation with form data:', message.data);
-              vscode.window.showInformationMessage('Analyzing project...');
               
               // Get workspace path
               const workspaceFolders = vscode.workspace.workspaceFolders;
@@ -138,15 +182,21 @@ export function activate(context: vscode.ExtensionContext) {
               }
               const workspacePath = workspaceFolders[0].uri.fsPath;
               
-              // Analyze project
-              const analysis = await analyzeProject(workspacePath);
+              // Analyze project, with a progress notification that can cancel it
+              const analysis = await vscode.window.withProgress({
+                location: vscode.ProgressLocation.Notification,
+                title: 'Analyzing project...',
+                cancellable: true
+              }, (progress, token) => analyzeProject(workspacePath, token));
               console.log('Project analysis:', analysis);
               
-              // Combine user input with analysis
+              // Combine user input with analysis; the backend keeps the analysis, so it
+              // is referenced by id rather than sent back
               const projectData = {
                 ...message.data,
                 tech_stack: analysis.tech_stack,
-                file_structure: analysis.file_structure
+                analysis_id: analysis.analysis_id,
+                project_path: workspacePath
               };
               
               console.log('Generating README with combined data...');
@@ -450,12 +500,12 @@ async function generateReadme(formData: any): Promise<ReadmeOption[]> {
         project_name: formData.projectName,
         description: formData.description,
         tech_stack: formData.tech_stack || [],
-        file_structure: formData.file_structure || [],
+        analysis_id: formData.analysis_id,
+        project_path: formData.project_path,
         deployment_url: formData.deploymentLink,
         author_name: formData.authorName,
         author_email: formData.authorEmail,
-        github_username: formData.githubUsername,
-        functions: []
+        github_username: formData.githubUsername
       },
       {
         timeout: 30000, // Reduced to 30 seconds